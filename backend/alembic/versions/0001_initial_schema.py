@@ -0,0 +1,90 @@
+"""Initial schema: projects, poles, conductors and equipments.
+
+Databases created from the models before migrations were added already have
+these tables: mark them with ``alembic stamp 0001_initial_schema`` and then run
+``alembic upgrade head``.
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from geoalchemy2 import Geometry
+
+revision = "0001_initial_schema"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "projects",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("concessionaire", sa.String(50), nullable=False),
+        sa.Column("area_wkt", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_projects_id", "projects", ["id"])
+    op.create_index("ix_projects_name", "projects", ["name"])
+
+    op.create_table(
+        "poles",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id"), nullable=True),
+        sa.Column("code", sa.String(50), nullable=False),
+        sa.Column("location", Geometry("POINT", srid=31983, spatial_index=False), nullable=True),
+        sa.Column("latitude", sa.Float(), nullable=True),
+        sa.Column("longitude", sa.Float(), nullable=True),
+        sa.Column("elevation", sa.Float(), nullable=True),
+        sa.Column("pole_type", sa.String(30), nullable=False),
+        sa.Column("pole_height", sa.Float(), nullable=True),
+        sa.Column("pole_class", sa.String(10), nullable=True),
+        sa.Column("owner", sa.String(50), nullable=True),
+        sa.Column("observations", sa.Text(), nullable=True),
+        sa.Column("installed_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_poles_id", "poles", ["id"])
+    op.create_index("ix_poles_code", "poles", ["code"])
+    # Name GeoAlchemy2 gives the spatial index when it creates the table itself
+    op.create_index("idx_poles_location", "poles", ["location"], postgresql_using="gist")
+
+    op.create_table(
+        "conductors",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id"), nullable=True),
+        sa.Column("pole_from_id", sa.Integer(), sa.ForeignKey("poles.id"), nullable=True),
+        sa.Column("pole_to_id", sa.Integer(), sa.ForeignKey("poles.id"), nullable=True),
+        sa.Column("conductor_type", sa.String(20), nullable=False),
+        sa.Column("cross_section", sa.Float(), nullable=False),
+        sa.Column("voltage_level", sa.String(10), nullable=False),
+        sa.Column("phases", sa.Integer(), nullable=False),
+        sa.Column("length", sa.Float(), nullable=True),
+        sa.Column("observations", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_conductors_id", "conductors", ["id"])
+
+    op.create_table(
+        "equipments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("pole_id", sa.Integer(), sa.ForeignKey("poles.id"), nullable=False),
+        sa.Column("equipment_type", sa.String(50), nullable=False),
+        sa.Column("manufacturer", sa.String(100), nullable=True),
+        sa.Column("model", sa.String(100), nullable=True),
+        sa.Column("observations", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_equipments_id", "equipments", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("equipments")
+    op.drop_table("conductors")
+    op.drop_table("poles")
+    op.drop_table("projects")
@@ -0,0 +1,89 @@
+"""OSM identity columns, keyset and spatial indexes, and the project_stats table.
+
+- ``poles.osm_id``, ``conductors.osm_id``/``osm_segment`` and the unique
+  constraints the OSM import upserts (``ON CONFLICT``) resolve against;
+- ``(project_id, id)`` indexes for keyset pages, and the GiST index on
+  ``poles.location`` under the name the models declare;
+- ``project_stats``, seeded from the rows already in the network tables;
+- ``poles.location`` filled from latitude/longitude where it was never
+  written (PostgreSQL; other databases use ``POST
+  /infrastructure/poles/location/backfill``).
+
+Revision ID: 0002_network_import_and_stats
+Revises: 0001_initial_schema
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_network_import_and_stats"
+down_revision = "0001_initial_schema"
+branch_labels = None
+depends_on = None
+
+_SEED_PROJECT_STATS = """
+INSERT INTO project_stats (project_id, metric, key, value)
+SELECT project_id, 'poles', COALESCE(pole_type, ''), COUNT(*)
+FROM poles WHERE project_id IS NOT NULL GROUP BY project_id, pole_type
+UNION ALL
+SELECT project_id, 'conductors', COALESCE(voltage_level, ''), COUNT(*)
+FROM conductors WHERE project_id IS NOT NULL GROUP BY project_id, voltage_level
+UNION ALL
+SELECT project_id, 'conductor_m', COALESCE(voltage_level, ''), SUM(COALESCE(length, 0.0))
+FROM conductors WHERE project_id IS NOT NULL GROUP BY project_id, voltage_level
+HAVING SUM(COALESCE(length, 0.0)) <> 0
+UNION ALL
+SELECT p.project_id, 'equipment', COALESCE(e.equipment_type, ''), COUNT(*)
+FROM equipments e JOIN poles p ON p.id = e.pole_id
+WHERE p.project_id IS NOT NULL GROUP BY p.project_id, e.equipment_type
+"""
+
+# Same expression as app.domains.infrastructure.spatial.location_sql
+_BACKFILL_LOCATION = """
+UPDATE poles SET location = ST_Transform(ST_SetSRID(ST_MakePoint(longitude, latitude), 4326), 31983)
+WHERE location IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL
+"""
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("poles") as batch:
+        batch.add_column(sa.Column("osm_id", sa.BigInteger(), nullable=True))
+        batch.create_unique_constraint("uq_poles_project_osm", ["project_id", "osm_id"])
+    with op.batch_alter_table("conductors") as batch:
+        batch.add_column(sa.Column("osm_id", sa.BigInteger(), nullable=True))
+        batch.add_column(sa.Column("osm_segment", sa.Integer(), nullable=True))
+        batch.create_unique_constraint("uq_conductors_project_osm", ["project_id", "osm_id", "osm_segment"])
+    op.create_index("ix_poles_project_id_id", "poles", ["project_id", "id"])
+    op.create_index("ix_conductors_project_id_id", "conductors", ["project_id", "id"])
+    op.drop_index("idx_poles_location", table_name="poles")
+    op.create_index("ix_poles_location", "poles", ["location"], postgresql_using="gist")
+
+    op.create_table(
+        "project_stats",
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("metric", sa.String(20), primary_key=True),
+        sa.Column("key", sa.String(50), primary_key=True),
+        sa.Column("value", sa.Float(), nullable=False),
+    )
+    op.execute(_SEED_PROJECT_STATS)
+    if _is_postgresql():
+        op.execute(_BACKFILL_LOCATION)
+
+
+def downgrade() -> None:
+    op.drop_table("project_stats")
+    op.drop_index("ix_poles_location", table_name="poles")
+    op.create_index("idx_poles_location", "poles", ["location"], postgresql_using="gist")
+    op.drop_index("ix_conductors_project_id_id", table_name="conductors")
+    op.drop_index("ix_poles_project_id_id", table_name="poles")
+    with op.batch_alter_table("conductors") as batch:
+        batch.drop_constraint("uq_conductors_project_osm", type_="unique")
+        batch.drop_column("osm_segment")
+        batch.drop_column("osm_id")
+    with op.batch_alter_table("poles") as batch:
+        batch.drop_constraint("uq_poles_project_osm", type_="unique")
+        batch.drop_column("osm_id")
@@ -1,16 +1,40 @@
 """Calculations API endpoints — voltage drop, mechanical stress, material list."""
-from fastapi import APIRouter, HTTPException
+import math
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.executor import ExecutorBusyError
 from app.domains.calculations.schemas import (
     VoltageDropRequest, VoltageDropResponse,
+    VoltageDropBatchRequest, VoltageDropBatchResponse,
     MechanicalStressRequest, MechanicalStressResponse,
+    ProjectMechanicalStressRequest, ProjectMechanicalStressResponse,
+    VoltageDropSweepRequest, VoltageDropSweepResponse,
+    MechanicalStressSweepRequest, MechanicalStressSweepResponse,
+    ConductorSizingRequest, ConductorSizingResponse,
     MaterialListRequest, MaterialListResponse,
 )
-from app.domains.calculations.voltage_drop import calculate_voltage_drop
+from app.domains.calculations.voltage_drop import calculate_voltage_drop, calculate_voltage_drop_batch
 from app.domains.calculations.mechanical_stress import calculate_mechanical_stress
+from app.domains.calculations.executor import CALCULATION_EXECUTOR, should_offload
+from app.domains.calculations.service import NetworkCalculationService
+from app.domains.calculations.sweep import sweep_voltage_drop, sweep_mechanical_stress
 
 router = APIRouter()
 
 
+def get_network_service(db: AsyncSession = Depends(get_db)) -> NetworkCalculationService:
+    return NetworkCalculationService(db)
+
+
+def _busy(exc: ExecutorBusyError) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"})
+
+
+def _sweep_size(axes) -> int:
+    return math.prod(len(axis.values) for axis in axes)
+
+
 @router.post("/voltage-drop", response_model=VoltageDropResponse, summary="Calcular queda de tensão (NBR 5410)")
 async def voltage_drop(payload: VoltageDropRequest):
     """Calcula queda de tensão conforme ABNT NBR 5410."""
@@ -20,6 +44,40 @@ async def voltage_drop(payload: VoltageDropRequest):
         raise HTTPException(status_code=422, detail=str(exc)) from exc
 
 
+@router.post(
+    "/voltage-drop/batch",
+    response_model=VoltageDropBatchResponse,
+    summary="Calcular queda de tensão em lote (NBR 5410)",
+)
+async def voltage_drop_batch(payload: VoltageDropBatchRequest):
+    """Calcula a queda de tensão de milhares de trechos em uma única passada vetorizada."""
+    try:
+        return await CALCULATION_EXECUTOR.run(
+            calculate_voltage_drop_batch, payload, offload=should_offload(len(payload.items))
+        )
+    except ExecutorBusyError as exc:
+        raise _busy(exc) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+@router.post(
+    "/voltage-drop/sweep",
+    response_model=VoltageDropSweepResponse,
+    summary="Varredura paramétrica de queda de tensão",
+)
+async def voltage_drop_sweep(payload: VoltageDropSweepRequest):
+    """Avalia o produto cartesiano dos eixos e retorna a menor configuração conforme."""
+    try:
+        return await CALCULATION_EXECUTOR.run(
+            sweep_voltage_drop, payload, offload=should_offload(_sweep_size(payload.axes))
+        )
+    except ExecutorBusyError as exc:
+        raise _busy(exc) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
 @router.post(
     "/mechanical-stress",
     response_model=MechanicalStressResponse,
@@ -33,6 +91,67 @@ async def mechanical_stress(payload: MechanicalStressRequest):
         raise HTTPException(status_code=422, detail=str(exc)) from exc
 
 
+@router.post(
+    "/mechanical-stress/sweep",
+    response_model=MechanicalStressSweepResponse,
+    summary="Varredura paramétrica de esforço mecânico",
+)
+async def mechanical_stress_sweep(payload: MechanicalStressSweepRequest):
+    """Avalia o produto cartesiano dos eixos e retorna a menor configuração conforme."""
+    try:
+        return await CALCULATION_EXECUTOR.run(
+            sweep_mechanical_stress, payload, offload=should_offload(_sweep_size(payload.axes))
+        )
+    except ExecutorBusyError as exc:
+        raise _busy(exc) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+@router.post(
+    "/mechanical-stress/project/{project_id}",
+    response_model=ProjectMechanicalStressResponse,
+    summary="Calcular esforço mecânico de todos os postes do projeto (NBR 8458/8798)",
+)
+async def project_mechanical_stress(
+    project_id: int,
+    payload: ProjectMechanicalStressRequest,
+    service: NetworkCalculationService = Depends(get_network_service),
+):
+    """Deriva vãos e azimutes da geometria dos condutores e calcula todos os postes em uma passada."""
+    try:
+        result = await service.mechanical_stress(project_id, payload)
+    except ExecutorBusyError as exc:
+        raise _busy(exc) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    if result is None:
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
+    return result
+
+
+@router.post(
+    "/conductor-sizing/project/{project_id}",
+    response_model=ConductorSizingResponse,
+    summary="Dimensionar condutores do projeto pelo menor custo (NBR 5410)",
+)
+async def project_conductor_sizing(
+    project_id: int,
+    payload: ConductorSizingRequest,
+    service: NetworkCalculationService = Depends(get_network_service),
+):
+    """Escolhe a seção mais barata de cada trecho mantendo a queda acumulada dentro do limite."""
+    try:
+        result = await service.conductor_sizing(project_id, payload)
+    except ExecutorBusyError as exc:
+        raise _busy(exc) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    if result is None:
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
+    return result
+
+
 @router.post("/material-list", response_model=MaterialListResponse, summary="Gerar lista de material")
 async def material_list(payload: MaterialListRequest):
     """Gera lista de material para rede de distribuição aérea."""
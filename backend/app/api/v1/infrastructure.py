@@ -1,11 +1,16 @@
 """Infrastructure API endpoints — poles, conductors, equipment."""
-from fastapi import APIRouter, Depends, HTTPException
+from functools import partial
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
-from app.domains.infrastructure.service import InfrastructureService
+from app.core.database import get_db, get_read_db
+from app.domains.infrastructure.spatial import parse_spatial_filter
+from app.domains.infrastructure.service import InfrastructureService, MissingRowsError
 from app.domains.infrastructure.schemas import (
-    PoleCreate, PoleUpdate, PoleResponse,
-    ConductorCreate, ConductorUpdate, ConductorResponse,
+    PoleCreate, PoleUpdate, PoleResponse, PoleListItem,
+    ConductorCreate, ConductorUpdate, ConductorResponse, ConductorListItem,
+    OSMImportRequest, OSMImportResponse, LocationBackfillResponse,
+    PoleBulkCreate, PoleBulkUpdate, ConductorBulkCreate, ConductorBulkUpdate,
+    BulkDeleteRequest, BulkWriteResponse,
 )
 
 router = APIRouter()
@@ -15,11 +20,53 @@ def get_service(db: AsyncSession = Depends(get_db)) -> InfrastructureService:
     return InfrastructureService(db)
 
 
+def get_read_service(db: AsyncSession = Depends(get_read_db)) -> InfrastructureService:
+    return InfrastructureService(db)
+
+
+async def _page_response(listing, response: Response, project_id, after_id, limit, fields) -> list[dict]:
+    try:
+        rows, next_cursor = await listing(project_id, after_id, limit, fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return rows
+
+
+async def _bulk(operation, payload, not_found: str) -> BulkWriteResponse:
+    try:
+        return await operation(payload)
+    except MissingRowsError as exc:
+        raise HTTPException(status_code=404, detail=f"{not_found}: {exc.ids[:20]}")
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
 # ── Poles ──────────────────────────────────────────────────────────────────
 
-@router.get("/poles", response_model=list[PoleResponse], summary="Listar postes")
-async def list_poles(project_id: int | None = None, service: InfrastructureService = Depends(get_service)):
-    return await service.list_poles(project_id)
+@router.get(
+    "/poles", response_model=list[PoleListItem], response_model_exclude_unset=True, summary="Listar postes"
+)
+async def list_poles(
+    response: Response,
+    project_id: int | None = None,
+    after_id: int | None = Query(None, ge=0, description="Cursor: retorna apenas ids maiores (X-Next-Cursor)"),
+    limit: int | None = Query(None, ge=1, description="Itens por página (padrão e máximo definidos no servidor)"),
+    fields: str | None = Query(None, description="Campos separados por vírgula, ex.: id,latitude,longitude"),
+    bbox: str | None = Query(None, description="Janela do mapa: oeste,sul,leste,norte (graus WGS84)"),
+    near: str | None = Query(None, description="Centro da busca por raio: lat,lon"),
+    radius: float | None = Query(None, description="Raio em metros (com near)"),
+    service: InfrastructureService = Depends(get_read_service),
+):
+    """Lista paginada por id, com filtro espacial opcional; X-Next-Cursor traz o after_id da próxima página."""
+    try:
+        spatial = parse_spatial_filter(bbox, near, radius)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return await _page_response(
+        partial(service.page_poles, spatial=spatial), response, project_id, after_id, limit, fields
+    )
 
 
 @router.post("/poles", response_model=PoleResponse, status_code=201, summary="Cadastrar poste")
@@ -27,8 +74,32 @@ async def create_pole(payload: PoleCreate, service: InfrastructureService = Depe
     return await service.create_pole(payload)
 
 
+@router.post("/poles/bulk", response_model=BulkWriteResponse, status_code=201, summary="Cadastrar postes em lote")
+async def bulk_create_poles(payload: PoleBulkCreate, service: InfrastructureService = Depends(get_service)):
+    """Insere todos os postes em uma única transação; ids na ordem do envio."""
+    return await _bulk(service.bulk_create_poles, payload, "Postes não encontrados")
+
+
+@router.put("/poles/bulk", response_model=BulkWriteResponse, summary="Atualizar postes em lote")
+async def bulk_update_poles(payload: PoleBulkUpdate, service: InfrastructureService = Depends(get_service)):
+    return await _bulk(service.bulk_update_poles, payload, "Postes não encontrados")
+
+
+@router.delete("/poles/bulk", response_model=BulkWriteResponse, summary="Remover postes em lote")
+async def bulk_delete_poles(payload: BulkDeleteRequest, service: InfrastructureService = Depends(get_service)):
+    return await _bulk(service.bulk_delete_poles, payload, "Postes não encontrados")
+
+
+@router.post(
+    "/poles/location/backfill", response_model=LocationBackfillResponse, summary="Preencher location de postes antigos"
+)
+async def backfill_pole_locations(project_id: int | None = None, service: InfrastructureService = Depends(get_service)):
+    """Calcula location (UTM 23S) a partir de latitude/longitude onde ainda está vazio, para os filtros espaciais."""
+    return await service.backfill_locations(project_id)
+
+
 @router.get("/poles/{pole_id}", response_model=PoleResponse, summary="Obter poste")
-async def get_pole(pole_id: int, service: InfrastructureService = Depends(get_service)):
+async def get_pole(pole_id: int, service: InfrastructureService = Depends(get_read_service)):
     pole = await service.get_pole(pole_id)
     if not pole:
         raise HTTPException(status_code=404, detail="Poste não encontrado")
@@ -52,9 +123,20 @@ async def delete_pole(pole_id: int, service: InfrastructureService = Depends(get
 
 # ── Conductors ──────────────────────────────────────────────────────────────
 
-@router.get("/conductors", response_model=list[ConductorResponse], summary="Listar condutores")
-async def list_conductors(project_id: int | None = None, service: InfrastructureService = Depends(get_service)):
-    return await service.list_conductors(project_id)
+@router.get(
+    "/conductors", response_model=list[ConductorListItem], response_model_exclude_unset=True,
+    summary="Listar condutores",
+)
+async def list_conductors(
+    response: Response,
+    project_id: int | None = None,
+    after_id: int | None = Query(None, ge=0, description="Cursor: retorna apenas ids maiores (X-Next-Cursor)"),
+    limit: int | None = Query(None, ge=1, description="Itens por página (padrão e máximo definidos no servidor)"),
+    fields: str | None = Query(None, description="Campos separados por vírgula, ex.: id,latitude,longitude"),
+    service: InfrastructureService = Depends(get_read_service),
+):
+    """Lista paginada por id; o cabeçalho X-Next-Cursor traz o after_id da próxima página."""
+    return await _page_response(service.page_conductors, response, project_id, after_id, limit, fields)
 
 
 @router.post("/conductors", response_model=ConductorResponse, status_code=201, summary="Cadastrar condutor")
@@ -62,8 +144,26 @@ async def create_conductor(payload: ConductorCreate, service: InfrastructureServ
     return await service.create_conductor(payload)
 
 
+@router.post(
+    "/conductors/bulk", response_model=BulkWriteResponse, status_code=201, summary="Cadastrar condutores em lote"
+)
+async def bulk_create_conductors(payload: ConductorBulkCreate, service: InfrastructureService = Depends(get_service)):
+    """Insere todos os condutores em uma única transação; ids na ordem do envio."""
+    return await _bulk(service.bulk_create_conductors, payload, "Condutores não encontrados")
+
+
+@router.put("/conductors/bulk", response_model=BulkWriteResponse, summary="Atualizar condutores em lote")
+async def bulk_update_conductors(payload: ConductorBulkUpdate, service: InfrastructureService = Depends(get_service)):
+    return await _bulk(service.bulk_update_conductors, payload, "Condutores não encontrados")
+
+
+@router.delete("/conductors/bulk", response_model=BulkWriteResponse, summary="Remover condutores em lote")
+async def bulk_delete_conductors(payload: BulkDeleteRequest, service: InfrastructureService = Depends(get_service)):
+    return await _bulk(service.bulk_delete_conductors, payload, "Condutores não encontrados")
+
+
 @router.get("/conductors/{conductor_id}", response_model=ConductorResponse, summary="Obter condutor")
-async def get_conductor(conductor_id: int, service: InfrastructureService = Depends(get_service)):
+async def get_conductor(conductor_id: int, service: InfrastructureService = Depends(get_read_service)):
     conductor = await service.get_conductor(conductor_id)
     if not conductor:
         raise HTTPException(status_code=404, detail="Condutor não encontrado")
@@ -85,3 +185,17 @@ async def delete_conductor(conductor_id: int, service: InfrastructureService = D
     deleted = await service.delete_conductor(conductor_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Condutor não encontrado")
+
+
+# ── OSM import ──────────────────────────────────────────────────────────────
+
+@router.post("/import/osm", response_model=OSMImportResponse, summary="Importar postes e linhas do OSM")
+async def import_osm(payload: OSMImportRequest, service: InfrastructureService = Depends(get_service)):
+    """Cria ou atualiza em lote postes e vãos de condutores (linhas divididas nos postes) por osm_id."""
+    try:
+        result = await service.import_osm(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
+    return result
@@ -1,12 +1,29 @@
 """Mapping API endpoints — OSM, elevation, coordinate conversion."""
-from fastapi import APIRouter, Query, HTTPException
-from app.domains.mapping.service import MappingService
-from app.domains.mapping.schemas import OSMResponse, ElevationResponse, UTMConversionResponse
+import json
+import math
+from typing import AsyncIterator
+from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.http import get_http_pool
+from app.domains.mapping.area_import import AREA_IMPORT_JOBS
+from app.domains.mapping.elevation import ElevationRateLimitedError
+from app.domains.mapping.service import AreaImportService, MappingService
+from app.domains.mapping.schemas import (
+    OSMResponse, ElevationResponse, ElevationBatchRequest, ElevationBatchResponse, UTMConversionResponse,
+    UTMBatchRequest, UTMBatchResponse, WGS84BatchRequest, WGS84BatchResponse,
+    AreaImportRequest, AreaImportStatus,
+)
 
 router = APIRouter()
 _service = MappingService()
 
 
+def _rate_limited(exc: ElevationRateLimitedError) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": str(math.ceil(exc.retry_after))})
+
+
 @router.get("/osm", response_model=OSMResponse, summary="Buscar dados OSM ao redor de coordenadas")
 async def get_osm_data(
     lat: float = Query(..., description="Latitude WGS84"),
@@ -20,6 +37,74 @@ async def get_osm_data(
         raise HTTPException(status_code=502, detail=f"Erro ao consultar OSM: {exc}") from exc
 
 
+async def _ndjson(first: dict, records: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    yield json.dumps(first, ensure_ascii=False).encode() + b"\n"
+    try:
+        async for record in records:
+            yield json.dumps(record, ensure_ascii=False).encode() + b"\n"
+    except Exception as exc:
+        # Headers are already sent: report the failure in-band
+        yield json.dumps({"kind": "error", "detail": f"Erro ao consultar OSM: {exc}"}).encode() + b"\n"
+
+
+@router.get("/osm/stream", summary="Transmitir dados OSM como NDJSON")
+async def stream_osm_data(
+    lat: float = Query(..., description="Latitude WGS84"),
+    lon: float = Query(..., description="Longitude WGS84"),
+    radius: int = Query(500, ge=50, le=5000, description="Raio em metros"),
+):
+    """Uma linha JSON por elemento classificado, seguida de uma linha de resumo (memória constante)."""
+    try:
+        records = _service.stream_osm_data(lat, lon, radius)
+        first = await records.__anext__()
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=f"Erro ao consultar OSM: {exc}") from exc
+    return StreamingResponse(_ndjson(first, records), media_type="application/x-ndjson")
+
+
+def get_area_import_service(db: AsyncSession = Depends(get_db)) -> AreaImportService:
+    return AreaImportService(db)
+
+
+@router.post(
+    "/osm/area",
+    response_model=AreaImportStatus,
+    status_code=202,
+    summary="Importar dados OSM de uma área grande (blocos em paralelo)",
+)
+async def start_osm_area_import(
+    payload: AreaImportRequest, service: AreaImportService = Depends(get_area_import_service)
+):
+    """Divide o polígono em blocos e consulta o Overpass em paralelo; acompanhe pelo job_id."""
+    try:
+        job = await service.start(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    if job is None:
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
+    return job.progress()
+
+
+@router.get("/osm/area/{job_id}", response_model=AreaImportStatus, summary="Progresso da importação de área")
+async def get_osm_area_import(job_id: str):
+    job = AREA_IMPORT_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Importação não encontrada")
+    return job.progress()
+
+
+@router.get("/osm/area/{job_id}/result", response_model=OSMResponse, summary="Resultado da importação de área")
+async def get_osm_area_import_result(job_id: str):
+    job = AREA_IMPORT_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Importação não encontrada")
+    if job.result is None:
+        raise HTTPException(status_code=409, detail=f"Importação ainda não concluída ({job.status}).")
+    return job.result
+
+
 @router.get("/elevation", response_model=ElevationResponse, summary="Obter elevação de coordenadas")
 async def get_elevation(
     lat: float = Query(..., description="Latitude WGS84"),
@@ -28,10 +113,33 @@ async def get_elevation(
     """Obtém altitude via OpenTopoData (SRTM 90m)."""
     try:
         return await _service.fetch_elevation(lat, lon)
+    except ElevationRateLimitedError as exc:
+        raise _rate_limited(exc) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=f"Erro ao obter elevação: {exc}") from exc
+
+
+@router.post(
+    "/elevation/batch",
+    response_model=ElevationBatchResponse,
+    summary="Obter elevação de vários pontos",
+)
+async def get_elevation_batch(payload: ElevationBatchRequest):
+    """Consulta até 10.000 pontos, deduplicados e agrupados em chamadas de até 100 localizações."""
+    try:
+        return await _service.fetch_elevation_batch(payload)
+    except ElevationRateLimitedError as exc:
+        raise _rate_limited(exc) from exc
     except Exception as exc:
         raise HTTPException(status_code=502, detail=f"Erro ao obter elevação: {exc}") from exc
 
 
+@router.get("/elevation/cache-stats", summary="Métricas do cache de elevação")
+async def elevation_cache_stats():
+    """Acertos em memória e no Redis, faltas, despejos e ocupação do cache LRU."""
+    return _service.elevation_provider.stats()
+
+
 @router.get(
     "/convert-utm",
     response_model=UTMConversionResponse,
@@ -48,3 +156,35 @@ async def convert_utm(
         return _service.convert_utm_to_wgs84(easting, northing, zone, hemisphere)
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Erro na conversão: {exc}") from exc
+
+
+@router.post(
+    "/convert-utm/batch",
+    response_model=UTMBatchResponse,
+    summary="Converter lote de coordenadas UTM SIRGAS2000 para WGS84",
+)
+async def convert_utm_batch(payload: UTMBatchRequest):
+    """Converte até 200.000 pontos em uma única chamada vetorizada."""
+    try:
+        return _service.convert_utm_to_wgs84_batch(payload)
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"Erro na conversão: {exc}") from exc
+
+
+@router.post(
+    "/convert-wgs84/batch",
+    response_model=WGS84BatchResponse,
+    summary="Converter lote de coordenadas WGS84 para UTM SIRGAS2000",
+)
+async def convert_wgs84_batch(payload: WGS84BatchRequest):
+    """Converte até 200.000 pontos em uma única chamada vetorizada."""
+    try:
+        return _service.convert_wgs84_to_utm_batch(payload)
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"Erro na conversão: {exc}") from exc
+
+
+@router.get("/http-stats", summary="Métricas do pool de conexões HTTP externas")
+async def http_stats():
+    """Requisições, conexões abertas e taxa de reaproveitamento para Overpass/OpenTopoData."""
+    return get_http_pool().stats()
@@ -1,19 +1,38 @@
 """Projects API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from typing import Literal
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.security import hash_string
 from app.domains.projects.service import ProjectService
-from app.domains.projects.schemas import ProjectCreate, ProjectUpdate, ProjectResponse
+from app.domains.projects.material_export import build_xlsx, iter_csv
+from app.domains.projects.schemas import (
+    ProjectCreate, ProjectUpdate, ProjectResponse, ProjectStats, ProjectSummary, NetworkSnapshot,
+)
+from app.domains.calculations.service import NetworkCalculationService
+from app.domains.calculations.schemas import LoadFlowRequest, LoadFlowResponse
 
 router = APIRouter()
 
+_XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
 
 def get_service(db: AsyncSession = Depends(get_db)) -> ProjectService:
     return ProjectService(db)
 
 
-@router.get("/", response_model=list[ProjectResponse], summary="Listar projetos")
-async def list_projects(service: ProjectService = Depends(get_service)):
+def get_read_service(db: AsyncSession = Depends(get_read_db)) -> ProjectService:
+    return ProjectService(db)
+
+
+def get_calculation_service(db: AsyncSession = Depends(get_db)) -> NetworkCalculationService:
+    return NetworkCalculationService(db)
+
+
+@router.get("/", response_model=list[ProjectSummary], summary="Listar projetos com totais da rede")
+async def list_projects(service: ProjectService = Depends(get_read_service)):
     return await service.list_projects()
 
 
@@ -23,7 +42,7 @@ async def create_project(payload: ProjectCreate, service: ProjectService = Depen
 
 
 @router.get("/{project_id}", response_model=ProjectResponse, summary="Obter projeto")
-async def get_project(project_id: int, service: ProjectService = Depends(get_service)):
+async def get_project(project_id: int, service: ProjectService = Depends(get_read_service)):
     project = await service.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Projeto não encontrado")
@@ -47,9 +66,88 @@ async def delete_project(project_id: int, service: ProjectService = Depends(get_
         raise HTTPException(status_code=404, detail="Projeto não encontrado")
 
 
+@router.post("/{project_id}/stats/rebuild", response_model=ProjectStats, summary="Recalcular totais do projeto")
+async def rebuild_project_stats(project_id: int, service: ProjectService = Depends(get_service)):
+    """Recalcula os agregados de project_stats a partir das tabelas da rede."""
+    stats = await service.rebuild_stats(project_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
+    return stats
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+@router.get(
+    "/{project_id}/network",
+    response_model=NetworkSnapshot,
+    summary="Topologia da rede do projeto (colunar, com ETag)",
+    responses={304: {"description": "Topologia inalterada desde o ETag informado"}},
+)
+async def project_network(
+    project_id: int,
+    if_none_match: str | None = Header(None),
+    service: ProjectService = Depends(get_read_service),
+):
+    """Postes, condutores (como índices de postes) e equipamentos em arrays por atributo."""
+    snapshot = await service.network_snapshot(project_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
+    body = json.dumps(snapshot, separators=(",", ":"))
+    etag = f'"{hash_string(body)[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/{project_id}/material-list", summary="Gerar lista de material do projeto")
-async def project_material_list(project_id: int, service: ProjectService = Depends(get_service)):
+async def project_material_list(
+    project_id: int,
+    format: Literal["json", "csv", "xlsx"] = Query("json", description="Formato: json, csv ou xlsx"),
+    service: ProjectService = Depends(get_read_service),
+):
+    """Postes, cabos e equipamentos agregados no banco e codificados conforme a concessionária."""
     material_list = await service.generate_material_list(project_id)
     if material_list is None:
         raise HTTPException(status_code=404, detail="Projeto não encontrado")
-    return material_list
+    if format == "json":
+        return material_list
+    filename = f"material_projeto_{project_id}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if format == "csv":
+        return StreamingResponse(iter_csv(material_list["items"]), media_type="text/csv; charset=utf-8", headers=headers)
+    return Response(content=build_xlsx(material_list["items"]), media_type=_XLSX_MEDIA_TYPE, headers=headers)
+
+
+@router.get(
+    "/{project_id}/load-flow",
+    response_model=LoadFlowResponse,
+    summary="Fluxo de carga radial — queda de tensão acumulada por poste",
+)
+async def project_load_flow(
+    project_id: int,
+    source_pole_id: int | None = Query(None, description="Poste de origem (padrão: detectado pela topologia)"),
+    load_kva_per_pole: float = Query(5.0, ge=0, description="Demanda por poste em kVA"),
+    nominal_voltage: float = Query(220.0, gt=0, description="Tensão nominal em Volts"),
+    power_factor: float = Query(0.92, ge=0.0, le=1.0, description="Fator de potência (cosφ)"),
+    service: NetworkCalculationService = Depends(get_calculation_service),
+):
+    """Varredura backward/forward sobre a rede radial de postes e condutores do projeto."""
+    params = LoadFlowRequest(
+        source_pole_id=source_pole_id,
+        load_kva_per_pole=load_kva_per_pole,
+        nominal_voltage=nominal_voltage,
+        power_factor=power_factor,
+    )
+    try:
+        result = await service.load_flow(project_id, params)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    if result is None:
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
+    return result
@@ -0,0 +1,130 @@
+"""Redis cache — shared async client for JSON payloads with fail-open semantics.
+
+A cache outage must never fail a request: connection and protocol errors are
+logged and treated as misses, and Redis is skipped for ``_RETRY_AFTER_S``
+seconds after a failure so requests don't pay a connect timeout each time.
+Payloads above ``_COMPRESS_MIN_BYTES`` are stored zlib-compressed; a value that
+does not decode (corrupt, or written by something else under the prefix) is
+logged, deleted and treated as a miss.
+"""
+from functools import lru_cache
+import json
+import logging
+import time
+import zlib
+from typing import Any
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_RETRY_AFTER_S = 30.0
+_COMPRESS_MIN_BYTES = 1024
+_RAW, _ZLIB = b"j", b"z"
+
+
+class RedisCache:
+    def __init__(self, url: str, prefix: str = "sisdist:"):
+        self.url = url
+        self.prefix = prefix
+        self._client: redis.Redis | None = None
+        self._down_until = 0.0
+
+    def _get_client(self) -> redis.Redis | None:
+        if time.monotonic() < self._down_until:
+            return None
+        if self._client is None:
+            self._client = redis.from_url(self.url, socket_connect_timeout=0.5, socket_timeout=1.0)
+        return self._client
+
+    def _mark_down(self, exc: Exception) -> None:
+        logger.warning("Redis indisponível (%s); cache desativado por %.0fs", exc, _RETRY_AFTER_S)
+        self._down_until = time.monotonic() + _RETRY_AFTER_S
+
+    @staticmethod
+    def _decode(payload: bytes | None) -> Any | None:
+        """Raises ``zlib.error`` or ``ValueError`` for payloads not written by :meth:`_encode`."""
+        if not payload:
+            return None
+        marker, body = payload[:1], payload[1:]
+        if marker == _ZLIB:
+            body = zlib.decompress(body)
+        elif marker != _RAW:
+            raise ValueError(f"marcador desconhecido {marker!r}")
+        return json.loads(body)
+
+    async def _decode_all(self, client: redis.Redis, keys: list[str], payloads: list) -> list[Any | None]:
+        values, unreadable = [], []
+        for key, payload in zip(keys, payloads):
+            try:
+                values.append(self._decode(payload))
+            except (zlib.error, ValueError) as exc:  # JSONDecodeError and UnicodeDecodeError are ValueErrors
+                logger.warning("Entrada de cache ilegível em %s (%s); descartada", key, exc)
+                unreadable.append(self.prefix + key)
+                values.append(None)
+        if unreadable:
+            try:
+                await client.delete(*unreadable)
+            except (RedisError, OSError) as exc:
+                self._mark_down(exc)
+        return values
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        body = json.dumps(value, separators=(",", ":")).encode()
+        return _ZLIB + zlib.compress(body) if len(body) >= _COMPRESS_MIN_BYTES else _RAW + body
+
+    async def get_json(self, key: str) -> Any | None:
+        client = self._get_client()
+        if client is None:
+            return None
+        try:
+            payload = await client.get(self.prefix + key)
+        except (RedisError, OSError) as exc:
+            self._mark_down(exc)
+            return None
+        return (await self._decode_all(client, [key], [payload]))[0]
+
+    async def set_json(self, key: str, value: Any, ttl: int) -> None:
+        client = self._get_client()
+        if client is None or ttl <= 0:
+            return
+        try:
+            await client.set(self.prefix + key, self._encode(value), ex=ttl)
+        except (RedisError, OSError) as exc:
+            self._mark_down(exc)
+
+    async def get_many_json(self, keys: list[str]) -> list[Any | None]:
+        """MGET counterpart of :meth:`get_json`; all misses when Redis is unavailable."""
+        client = self._get_client()
+        if client is None or not keys:
+            return [None] * len(keys)
+        try:
+            payloads = await client.mget([self.prefix + key for key in keys])
+        except (RedisError, OSError) as exc:
+            self._mark_down(exc)
+            return [None] * len(keys)
+        return await self._decode_all(client, keys, payloads)
+
+    async def set_many_json(self, items: dict[str, Any], ttl: int) -> None:
+        client = self._get_client()
+        if client is None or ttl <= 0 or not items:
+            return
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(self.prefix + key, self._encode(value), ex=ttl)
+                await pipe.execute()
+        except (RedisError, OSError) as exc:
+            self._mark_down(exc)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+@lru_cache()
+def get_cache() -> RedisCache:
+    return RedisCache(get_settings().redis_url)
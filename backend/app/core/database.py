@@ -1,27 +1,137 @@
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+import logging
+from sqlalchemy import event, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
-from app.core.config import get_settings
+from sqlalchemy.orm import DeclarativeBase, Session
+from app.core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
 
 
 class Base(DeclarativeBase):
     pass
 
 
+_AFTER_COMMIT = "after_commit"
+
+
+def on_commit(db: AsyncSession, callback) -> None:
+    """Run ``callback()`` once the session's transaction commits; dropped on rollback.
+
+    For process-local caches derived from the database: changing them before the
+    commit would keep an edit that was rolled back, or let a concurrent reader
+    re-cache rows from before it.
+    """
+    db.sync_session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT, []):
+        callback()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_after_commit(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_AFTER_COMMIT, None)
+
+
+def upsert_insert(db: AsyncSession, model):
+    """Dialect ``insert()`` supporting ``on_conflict_do_update`` for the session's database."""
+    dialect = db.get_bind().dialect.name
+    insert = _UPSERT_INSERTS.get(dialect)
+    if insert is None:
+        raise ValueError(f"Operação em lote não suportada para o banco '{dialect}'.")
+    return insert(model)
+
+
+def engine_options(url: str, settings: Settings) -> dict:
+    """``create_async_engine`` keyword arguments for ``url`` from the pool settings."""
+    if url.startswith("sqlite"):
+        # SQLite gets a static or null pool from SQLAlchemy; sizing does not apply
+        return {"connect_args": {"check_same_thread": False}}
+    options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if "+asyncpg" in url:
+        cache_size = settings.db_statement_cache_size if settings.db_server_prepared_statements else 0
+        options["connect_args"] = {
+            "statement_cache_size": cache_size,           # asyncpg's own cache
+            "prepared_statement_cache_size": cache_size,  # SQLAlchemy adapter's cache
+        }
+    return options
+
+
 def get_engine(database_url: str | None = None):
     settings = get_settings()
     url = database_url or settings.database_url
-    connect_args = {}
-    if url.startswith("sqlite"):
-        connect_args = {"check_same_thread": False}
-    return create_async_engine(url, echo=False, connect_args=connect_args)
+    return create_async_engine(url, echo=False, **engine_options(url, settings))
 
 
 def get_session_factory(engine):
     return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+class ReadOnlySession(Session):
+    """Session behind :func:`get_read_db`; its connection autocommits, so a flush would write."""
+
+    def flush(self, objects=None) -> None:
+        if self.new or self.dirty or self.deleted:
+            raise RuntimeError("Sessão somente leitura: alterações não podem ser gravadas.")
+
+
+def get_read_session_factory(engine):
+    """Sessions on autocommit connections: no BEGIN/COMMIT round trips and no autoflush."""
+    return async_sessionmaker(
+        engine.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        sync_session_class=ReadOnlySession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+
+
+# Per-transaction options for read_snapshot(); dialects not listed read as they are
+_SNAPSHOT_OPTIONS = {"postgresql": {"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}}
+
+
+@asynccontextmanager
+async def read_snapshot(db: AsyncSession):
+    """Run the block's queries against one snapshot (REPEATABLE READ, READ ONLY on PostgreSQL).
+
+    Read-only sessions autocommit, so without this every statement of a
+    multi-query read sees a different state of the database. Enter it before
+    the session's first query: an isolation level only applies to a new
+    transaction, so a session already in one keeps it and a warning is logged.
+    The snapshot transaction is rolled back on exit.
+    """
+    options = _SNAPSHOT_OPTIONS.get(db.get_bind().dialect.name)
+    if options is not None and db.in_transaction():
+        logger.warning("read_snapshot(): sessão já em transação; leituras seguem sem snapshot %s.", options)
+        options = None
+    if options is None:
+        yield
+        return
+    await db.connection(execution_options=options)
+    try:
+        yield
+    finally:
+        await db.rollback()
+
+
 _engine = None
 _session_factory = None
+_replica_engine = None
+_read_session_factory = None
 
 
 def _get_default_engine():
@@ -38,6 +148,97 @@ def _get_default_session_factory():
     return _session_factory
 
 
+def _get_replica_engine():
+    """Engine for ``database_read_url``; None when reads share the primary."""
+    global _replica_engine
+    read_url = get_settings().database_read_url
+    if _replica_engine is None and read_url:
+        _replica_engine = get_engine(read_url)
+    return _replica_engine
+
+
+def _get_read_session_factory():
+    global _read_session_factory
+    if _read_session_factory is None:
+        _read_session_factory = get_read_session_factory(_get_replica_engine() or _get_default_engine())
+    return _read_session_factory
+
+
+async def warm_pool(engine=None, connections: int | None = None) -> int:
+    """Open ``connections`` pooled connections up front; returns how many were opened.
+
+    Failures are logged and left to the first request, so the API still starts
+    while the database is unreachable.
+    """
+    engine = engine or _get_default_engine()
+    settings = get_settings()
+    if connections is None:
+        connections = min(settings.db_pool_warm, settings.db_pool_size)
+    if connections <= 0:
+        return 0
+    try:
+        async with AsyncExitStack() as stack:
+            conns = await asyncio.gather(*(stack.enter_async_context(engine.connect()) for _ in range(connections)))
+            for conn in conns:
+                await conn.execute(text("SELECT 1"))
+    except Exception as exc:
+        logger.warning("Não foi possível pré-abrir conexões com o banco: %s", exc)
+        return 0
+    return connections
+
+
+async def warm_pools() -> dict[str, int]:
+    """Warm the primary pool and, when one is configured, the replica's."""
+    opened = {"primary": await warm_pool(_get_default_engine())}
+    replica = _get_replica_engine()
+    if replica is not None:
+        opened["replica"] = await warm_pool(replica)
+    return opened
+
+
+async def dispose_engine() -> None:
+    global _engine, _session_factory, _replica_engine, _read_session_factory
+    for engine in (_engine, _replica_engine):
+        if engine is not None:
+            await engine.dispose()
+    _engine = _replica_engine = None
+    _session_factory = _read_session_factory = None
+
+
+def pool_stats(engine, max_overflow: int | None = None) -> dict:
+    """Connections checked out/in and overflow for the engine's pool.
+
+    ``max_overflow`` is the limit the engine was built with (default:
+    ``Settings.db_max_overflow``, as in :func:`engine_options`); -1 means unbounded.
+    """
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__}
+    if not hasattr(pool, "checkedout"):
+        return stats  # static/null pools (SQLite) keep no counters
+    if max_overflow is None:
+        max_overflow = get_settings().db_max_overflow
+    capacity = pool.size() + max_overflow if max_overflow >= 0 else None
+    checked_out = pool.checkedout()
+    return {
+        **stats,
+        "size": pool.size(),
+        "max_overflow": max_overflow,
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "utilization": round(checked_out / capacity, 4) if capacity else None,
+    }
+
+
+def database_pool_stats() -> dict:
+    """:func:`pool_stats` for the primary engine and, when configured, the replica."""
+    stats = {"primary": pool_stats(_get_default_engine())}
+    replica = _get_replica_engine()
+    if replica is not None:
+        stats["replica"] = pool_stats(replica)
+    return stats
+
+
 async def get_db() -> AsyncSession:
     factory = _get_default_session_factory()
     async with factory() as session:
@@ -47,3 +248,10 @@ async def get_db() -> AsyncSession:
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_read_db() -> AsyncSession:
+    """Session for list/get handlers, on the read replica when one is configured."""
+    factory = _get_read_session_factory()
+    async with factory() as session:
+        yield session
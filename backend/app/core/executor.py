@@ -0,0 +1,99 @@
+"""Process-pool executor for CPU-bound work called from async handlers.
+
+Handlers await :meth:`CalculationExecutor.run`, which ships the call to a warm
+worker process so the event loop keeps serving other requests. At most
+``max_workers`` calls run at once and at most ``max_queue`` more wait for a
+slot; beyond that :class:`ExecutorBusyError` is raised immediately so the API
+can answer 503 instead of piling up work. If a worker dies mid-call (e.g.
+killed for memory), the broken pool is discarded, :class:`WorkerCrashedError`
+is raised and the next call starts fresh workers. ``max_workers=0`` runs every
+call inline (useful for debugging and single-core deployments).
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when the executor's queue is full."""
+
+
+class WorkerCrashedError(ExecutorBusyError):
+    """Raised when a worker process died while running the call."""
+
+
+def _noop() -> None:
+    return None
+
+
+class CalculationExecutor:
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int,
+        initializer: Callable[[], None] | None = None,
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._initializer = initializer
+        self._pool: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._slots_loop: asyncio.AbstractEventLoop | None = None
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Calls running or waiting for a worker."""
+        return self._in_flight
+
+    def start(self) -> None:
+        """Start the workers and let each one run the initializer before the first request."""
+        if self._pool is not None or self.max_workers <= 0:
+            return
+        self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=self._initializer)
+        for _ in range(self.max_workers):
+            self._pool.submit(_noop)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def aclose(self) -> None:
+        """:meth:`shutdown` for async callers: waits for the workers off the event loop."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        if self._pool is pool:  # concurrent callers may already have replaced it
+            self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_workers)
+            self._slots_loop = loop
+        return self._slots
+
+    async def run(self, fn: Callable[..., Any], *args: Any, offload: bool = True) -> Any:
+        """Run ``fn(*args)`` in a worker (or inline when ``offload`` is False or there are no workers)."""
+        if not offload or self.max_workers <= 0:
+            return fn(*args)
+        if self._in_flight >= self.max_workers + self.max_queue:
+            raise ExecutorBusyError("Servidor de cálculo ocupado. Tente novamente em instantes.")
+        self._in_flight += 1
+        try:
+            async with self._get_slots():
+                self.start()
+                pool = self._pool
+                loop = asyncio.get_running_loop()
+                try:
+                    return await loop.run_in_executor(pool, fn, *args)
+                except BrokenProcessPool as exc:
+                    self._discard(pool)
+                    raise WorkerCrashedError("Processo de cálculo interrompido. Tente novamente.") from exc
+        finally:
+            self._in_flight -= 1
@@ -0,0 +1,136 @@
+"""Shared outbound HTTP client — one keep-alive pool for the application lifetime.
+
+External APIs (Overpass, OpenTopoData) are called through a single
+``httpx.AsyncClient`` so TCP/TLS connections are reused across requests
+(HTTP/2 when the ``h2`` package is installed). Each host also gets a
+concurrency cap, so a burst of map requests can't trip a provider's rate
+limit. Streams relayed to API clients hold their upstream connection at the
+client's reading pace, so they count against a separate, smaller per-host
+cap and slow consumers cannot starve ordinary requests. Connection reuse is
+measured through httpcore's trace hook.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator
+from urllib.parse import urlsplit
+import httpx
+from app.core.config import get_settings
+
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the installed extras
+    _HTTP2_AVAILABLE = False
+
+
+class HTTPClientPool:
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        per_host_limit: int = 8,
+        stream_per_host_limit: int = 4,
+        timeout: float = 30.0,
+        http2: bool = True,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_keepalive_connections
+        )
+        self.per_host_limit = per_host_limit
+        self.stream_per_host_limit = stream_per_host_limit
+        self.timeout = timeout
+        self.http2 = http2 and _HTTP2_AVAILABLE
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._stream_slots: dict[str, asyncio.Semaphore] = {}
+        self._stats = {"requests": 0, "connections_opened": 0, "errors": 0}
+
+    def client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it on first use in the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            # Connections are bound to the loop that opened them
+            self._client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=self.http2)
+            self._loop = loop
+            self._host_slots = {}
+            self._stream_slots = {}
+        return self._client
+
+    def _slot(self, host: str, relayed: bool = False) -> asyncio.Semaphore:
+        slots = self._stream_slots if relayed else self._host_slots
+        slot = slots.get(host)
+        if slot is None:
+            slot = slots[host] = asyncio.Semaphore(self.stream_per_host_limit if relayed else self.per_host_limit)
+        return slot
+
+    async def _trace(self, event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.complete":
+            self._stats["connections_opened"] += 1
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        client = self.client()
+        extensions = {**kwargs.pop("extensions", {}), "trace": self._trace}
+        async with self._slot(urlsplit(url).netloc):
+            self._stats["requests"] += 1
+            try:
+                return await client.request(method, url, extensions=extensions, **kwargs)
+            except httpx.HTTPError:
+                self._stats["errors"] += 1
+                raise
+
+    @asynccontextmanager
+    async def stream(
+        self, method: str, url: str, relayed: bool = False, **kwargs: Any
+    ) -> AsyncIterator[httpx.Response]:
+        """Like :meth:`request`, but the body is read incrementally; the host slot is held until exit.
+
+        Pass ``relayed=True`` when the body is forwarded to an API client as it
+        arrives: the stream then takes a slot from the separate streaming cap.
+        """
+        client = self.client()
+        extensions = {**kwargs.pop("extensions", {}), "trace": self._trace}
+        async with self._slot(urlsplit(url).netloc, relayed):
+            self._stats["requests"] += 1
+            try:
+                async with client.stream(method, url, extensions=extensions, **kwargs) as response:
+                    yield response
+            except httpx.HTTPError:
+                self._stats["errors"] += 1
+                raise
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    def stats(self) -> dict[str, Any]:
+        requests = self._stats["requests"]
+        opened = self._stats["connections_opened"]
+        reused = max(requests - opened, 0)
+        return {
+            **self._stats,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / requests, 4) if requests else 0.0,
+            "http2": self.http2,
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+@lru_cache()
+def get_http_pool() -> HTTPClientPool:
+    settings = get_settings()
+    return HTTPClientPool(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        per_host_limit=settings.http_per_host_limit,
+        stream_per_host_limit=settings.http_stream_per_host_limit,
+        timeout=settings.http_timeout,
+        http2=settings.http2,
+    )
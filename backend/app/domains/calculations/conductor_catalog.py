@@ -0,0 +1,308 @@
+"""Conductor catalog — precompiled impedance index shared by the calculation modules.
+
+The ABNT NBR 5410 / manufacturer table is compiled once at import time into a
+frozen per-type index (sorted section tuples plus R/X columns, and the
+diameter/weight columns used by the mechanical calculations and the cost
+column used by the sizing optimizer). Scalar lookups
+use bisect (O(log n)) behind a memo of exact and previously seen sections;
+vectorized lookups use the same columns as read-only NumPy arrays.
+"""
+from bisect import bisect_left
+from dataclasses import dataclass
+import numpy as np
+
+# Conductor properties table — resistance (Ω/km) and reactance (Ω/km)
+# Source: ABNT NBR 5410 / manufacturer datasheets
+_CONDUCTOR_TABLE: dict[str, dict[float, tuple[float, float]]] = {
+    "CA": {
+        16:  (1.915, 0.335),
+        25:  (1.200, 0.320),
+        35:  (0.868, 0.310),
+        50:  (0.641, 0.300),
+        70:  (0.443, 0.290),
+        95:  (0.320, 0.280),
+        120: (0.253, 0.275),
+        150: (0.206, 0.270),
+        185: (0.164, 0.265),
+        240: (0.125, 0.260),
+    },
+    "CAA": {
+        16:  (1.900, 0.340),
+        25:  (1.190, 0.325),
+        35:  (0.860, 0.315),
+        50:  (0.630, 0.305),
+        70:  (0.435, 0.295),
+        95:  (0.315, 0.285),
+        120: (0.248, 0.278),
+        150: (0.200, 0.272),
+        185: (0.160, 0.268),
+        240: (0.122, 0.262),
+    },
+    "ACSR": {
+        16:  (1.900, 0.340),
+        25:  (1.190, 0.325),
+        35:  (0.860, 0.315),
+        50:  (0.630, 0.305),
+        70:  (0.435, 0.295),
+        95:  (0.315, 0.285),
+        120: (0.248, 0.278),
+        150: (0.200, 0.272),
+        185: (0.160, 0.268),
+        240: (0.122, 0.262),
+    },
+}
+
+# Conductor mechanical data — outer diameter (mm) and weight (kg/km)
+# Source: typical manufacturer datasheets (CA per NBR 7271, CAA/ACSR per NBR 7270)
+_CONDUCTOR_MECHANICAL_TABLE: dict[str, dict[float, tuple[float, float]]] = {
+    "CA": {
+        16:  (5.1, 43.0),
+        25:  (6.4, 68.0),
+        35:  (7.5, 95.0),
+        50:  (9.0, 137.0),
+        70:  (10.7, 190.0),
+        95:  (12.5, 260.0),
+        120: (14.0, 330.0),
+        150: (15.8, 410.0),
+        185: (17.5, 510.0),
+        240: (19.9, 660.0),
+    },
+    "CAA": {
+        16:  (5.4, 62.0),
+        25:  (6.8, 100.0),
+        35:  (8.1, 140.0),
+        50:  (9.6, 195.0),
+        70:  (11.4, 275.0),
+        95:  (13.6, 380.0),
+        120: (15.2, 480.0),
+        150: (17.1, 600.0),
+        185: (19.0, 745.0),
+        240: (21.6, 970.0),
+    },
+}
+_CONDUCTOR_MECHANICAL_TABLE["ACSR"] = _CONDUCTOR_MECHANICAL_TABLE["CAA"]
+
+# Reference installed cost per metre of conductor (R$/m) used by the sizing optimizer
+# Source: typical market prices — update from the concessionaire's price list
+_CONDUCTOR_COST_TABLE: dict[str, dict[float, float]] = {
+    "CA": {
+        16: 3.2, 25: 4.6, 35: 6.1, 50: 8.4, 70: 11.5,
+        95: 15.3, 120: 19.0, 150: 23.5, 185: 28.9, 240: 37.0,
+    },
+    "CAA": {
+        16: 4.0, 25: 5.8, 35: 7.6, 50: 10.5, 70: 14.4,
+        95: 19.1, 120: 23.8, 150: 29.4, 185: 36.1, 240: 46.3,
+    },
+}
+_CONDUCTOR_COST_TABLE["ACSR"] = _CONDUCTOR_COST_TABLE["CAA"]
+
+# Non-standard sections memoized per catalog before the memo is cleared
+_MAX_MEMO_ENTRIES = 4096
+
+
+class SectionOutOfRangeError(ValueError):
+    """Raised by vectorized lookups; ``position`` is the first offending element."""
+
+    def __init__(self, message: str, position: int):
+        super().__init__(message)
+        self.position = position
+
+
+def _frozen_array(values) -> np.ndarray:
+    arr = np.array(values, dtype=float)
+    arr.setflags(write=False)
+    return arr
+
+
+@dataclass(frozen=True)
+class ConductorTypeIndex:
+    """Sorted section/R/X (and diameter/weight) columns for a single conductor type."""
+
+    conductor_type: str
+    sections: tuple[float, ...]
+    resistance: tuple[float, ...]
+    reactance: tuple[float, ...]
+    section_array: np.ndarray
+    resistance_array: np.ndarray
+    reactance_array: np.ndarray
+    diameter_array: np.ndarray  # mm (NaN when the type has no mechanical data)
+    weight_array: np.ndarray    # kg/km
+    cost_array: np.ndarray      # R$/m (NaN when the type has no price)
+
+    @classmethod
+    def build(
+        cls,
+        conductor_type: str,
+        table: dict[float, tuple[float, float]],
+        mechanical: dict[float, tuple[float, float]] | None = None,
+        cost: dict[float, float] | None = None,
+    ) -> "ConductorTypeIndex":
+        sections = tuple(sorted(table))
+        resistance = tuple(table[s][0] for s in sections)
+        reactance = tuple(table[s][1] for s in sections)
+        mechanical = mechanical or {}
+        cost = cost or {}
+        nan = (float("nan"), float("nan"))
+        return cls(
+            conductor_type=conductor_type,
+            sections=sections,
+            resistance=resistance,
+            reactance=reactance,
+            section_array=_frozen_array(sections),
+            resistance_array=_frozen_array(resistance),
+            reactance_array=_frozen_array(reactance),
+            diameter_array=_frozen_array([mechanical.get(s, nan)[0] for s in sections]),
+            weight_array=_frozen_array([mechanical.get(s, nan)[1] for s in sections]),
+            cost_array=_frozen_array([cost.get(s, nan[0]) for s in sections]),
+        )
+
+    def interpolate(self, cross_section: float) -> tuple[float, float]:
+        """Return (R, X) for the section, interpolating linearly between neighbours."""
+        sections = self.sections
+        if cross_section < sections[0] or cross_section > sections[-1]:
+            raise ValueError(
+                f"Seção {cross_section} mm² fora do intervalo suportado ({sections[0]}–{sections[-1]} mm²)."
+            )
+        i = bisect_left(sections, cross_section)
+        if sections[i] == cross_section:
+            return self.resistance[i], self.reactance[i]
+        s_lo, s_hi = sections[i - 1], sections[i]
+        t = (cross_section - s_lo) / (s_hi - s_lo)
+        r = self.resistance[i - 1] + t * (self.resistance[i] - self.resistance[i - 1])
+        x = self.reactance[i - 1] + t * (self.reactance[i] - self.reactance[i - 1])
+        return r, x
+
+
+class ConductorCatalog:
+    """Read-only conductor catalog with O(log n) scalar and vectorized lookups."""
+
+    def __init__(
+        self,
+        table: dict[str, dict[float, tuple[float, float]]],
+        mechanical: dict[str, dict[float, tuple[float, float]]] | None = None,
+        cost: dict[str, dict[float, float]] | None = None,
+    ):
+        mechanical = mechanical or {}
+        cost = cost or {}
+        self._indexes: dict[str, ConductorTypeIndex] = {
+            ctype.upper(): ConductorTypeIndex.build(ctype.upper(), sections, mechanical.get(ctype), cost.get(ctype))
+            for ctype, sections in table.items()
+        }
+        # Accept the common spellings without calling .upper() on the hot path
+        self._aliases: dict[str, ConductorTypeIndex] = {}
+        for ctype, index in self._indexes.items():
+            self._aliases[ctype] = index
+            self._aliases[ctype.lower()] = index
+            self._aliases[ctype.capitalize()] = index
+        self._memo: dict[tuple[str, float], tuple[float, float]] = {}
+        self._prime_memo()
+
+    def _prime_memo(self) -> None:
+        self._memo.clear()
+        for alias, index in self._aliases.items():
+            for s, r, x in zip(index.sections, index.resistance, index.reactance):
+                self._memo[(alias, s)] = (r, x)
+
+    @property
+    def conductor_types(self) -> tuple[str, ...]:
+        return tuple(self._indexes)
+
+    def index(self, conductor_type: str) -> ConductorTypeIndex:
+        """Return the index for a conductor type (case-insensitive)."""
+        index = self._aliases.get(conductor_type)
+        if index is None:
+            index = self._indexes.get(conductor_type.upper())
+        if index is None:
+            raise ValueError(f"Tipo de condutor desconhecido: {conductor_type}. Use CA, CAA ou ACSR.")
+        return index
+
+    def properties(self, conductor_type: str, cross_section: float) -> tuple[float, float]:
+        """Return (resistance Ω/km, reactance Ω/km), memoized per (type, section)."""
+        key = (conductor_type, cross_section)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+        result = self.index(conductor_type).interpolate(cross_section)
+        if len(self._memo) >= _MAX_MEMO_ENTRIES:
+            self._prime_memo()
+        self._memo[key] = result
+        return result
+
+    def _interp_columns(self, conductor_type: str, sections: np.ndarray, columns: tuple[str, ...]):
+        """Interpolate the given index columns for many sections of one conductor type."""
+        index = self.index(conductor_type)
+        out_of_range = (sections < index.sections[0]) | (sections > index.sections[-1])
+        if out_of_range.any():
+            pos = int(np.argmax(out_of_range))
+            raise SectionOutOfRangeError(
+                f"Seção {sections[pos]:g} mm² fora do intervalo suportado "
+                f"({index.sections[0]}–{index.sections[-1]} mm²).",
+                pos,
+            )
+        return tuple(np.interp(sections, index.section_array, getattr(index, column)) for column in columns)
+
+    def _lookup_columns(self, conductor_types: list[str], sections: np.ndarray, columns: tuple[str, ...]):
+        out = tuple(np.empty(len(sections)) for _ in columns)
+        groups: dict[str, list[int]] = {}
+        for i, ctype in enumerate(conductor_types):
+            groups.setdefault(ctype, []).append(i)
+        for ctype, positions in groups.items():
+            rows = np.array(positions)
+            try:
+                values = self._interp_columns(ctype, sections[rows], columns)
+            except SectionOutOfRangeError as exc:
+                raise ValueError(f"Item {positions[exc.position]}: {exc}") from exc
+            except ValueError as exc:
+                raise ValueError(f"Item {positions[0]}: {exc}") from exc
+            for target, column in zip(out, values):
+                target[rows] = column
+        return out
+
+    def type_arrays(self, conductor_type: str, sections: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized (resistance, reactance) for many sections of a single conductor type."""
+        return self._interp_columns(conductor_type, sections, ("resistance_array", "reactance_array"))
+
+    def lookup_arrays(self, conductor_types: list[str], sections: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized (resistance, reactance) lookup with np.interp between table sections.
+
+        Errors are prefixed with the offending item position so batch callers can report it.
+        """
+        return self._lookup_columns(conductor_types, sections, ("resistance_array", "reactance_array"))
+
+    def mechanical_arrays(self, conductor_types: list[str], sections: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized (diameter mm, weight kg/km) lookup with np.interp between table sections."""
+        return self._lookup_columns(conductor_types, sections, ("diameter_array", "weight_array"))
+
+    def cost_array(self, conductor_types: list[str], sections: np.ndarray) -> np.ndarray:
+        """Vectorized cost (R$/m) lookup with np.interp between table sections."""
+        return self._lookup_columns(conductor_types, sections, ("cost_array",))[0]
+
+    def candidate_columns(
+        self, conductor_types: list[str], allowed_sections: list[float] | None = None
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Per-item (section, R, X, cost) rows over each type's table sections.
+
+        Rows are padded with NaN to the widest type; sections outside
+        ``allowed_sections`` keep their impedance but get a NaN cost.
+        """
+        width = max((len(self.index(t).sections) for t in set(conductor_types)), default=0)
+        columns = [np.full((len(conductor_types), width), np.nan) for _ in range(4)]
+        allowed = None if allowed_sections is None else np.array(sorted(set(allowed_sections)), dtype=float)
+        groups: dict[str, list[int]] = {}
+        for i, ctype in enumerate(conductor_types):
+            groups.setdefault(ctype, []).append(i)
+        for ctype, positions in groups.items():
+            index = self.index(ctype)
+            rows = np.array(positions)[:, None]
+            k = len(index.sections)
+            cost = index.cost_array
+            if allowed is not None:
+                cost = np.where(np.isin(index.section_array, allowed), cost, np.nan)
+            for target, values in zip(
+                columns, (index.section_array, index.resistance_array, index.reactance_array, cost)
+            ):
+                target[rows, np.arange(k)] = values
+        return tuple(columns)
+
+
+CONDUCTOR_CATALOG = ConductorCatalog(_CONDUCTOR_TABLE, _CONDUCTOR_MECHANICAL_TABLE, _CONDUCTOR_COST_TABLE)
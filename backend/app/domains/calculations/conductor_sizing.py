@@ -0,0 +1,133 @@
+"""Conductor sizing optimizer — cheapest section per segment within the voltage-drop limit.
+
+Under the constant-current load model the branch currents do not depend on
+the chosen sections, so the ΔV% of a segment is a function of its own section
+only and the problem decomposes over the radial tree. The admissible drop is
+discretized into ``budget_steps`` buckets (segment drops are rounded up, so any
+feasible answer is also feasible in the exact model) and, for every node ``v``
+and remaining budget ``b``::
+
+    F(v, b) = Σ_children c  min_s [ cost(c, s) + F(c, b − q(c, s)) ]
+
+is evaluated bottom-up in reverse DFS preorder, one vectorized
+(sections × budgets) table per segment, then the chosen sections are read back
+top-down. Cost is O(segments · sections · budget_steps) instead of
+sections^segments for brute force. The read-back keeps one choice per
+(segment, budget), so ``budget_steps`` is lowered on large feeders to keep that
+table under ``_MAX_CHOICE_CELLS`` bytes.
+
+The single limit applied to every node is the most restrictive voltage level
+in the feeder unless the caller overrides it. :func:`optimize_conductor_sizes`
+is a pure function over picklable arrays so it can run in a worker process.
+"""
+from dataclasses import dataclass
+import time
+import numpy as np
+from app.domains.calculations.network import RadialNetwork
+from app.domains.calculations.voltage_drop import _voltage_drop_arrays
+
+_MAX_CHOICE_CELLS = 20_000_000  # one byte per cell: ≈20 MB per request in a worker
+_MIN_BUDGET_STEPS = 20
+
+
+@dataclass
+class SizingProblem:
+    """Optimizer input; per-edge arrays are aligned with ``network.conductor_ids``."""
+
+    network: RadialNetwork
+    branch_current: np.ndarray   # node → current in the branch feeding it (A)
+    length: np.ndarray           # m
+    phases: np.ndarray
+    candidate_resistance: np.ndarray  # edge × candidate (Ω/km), NaN pads unavailable candidates
+    candidate_reactance: np.ndarray
+    candidate_cost: np.ndarray        # edge × candidate (R$/m), NaN excludes the candidate
+    power_factor: float
+    nominal_voltage: float
+    limit_pct: float
+    budget_steps: int
+
+
+@dataclass
+class SizingResult:
+    feasible: bool
+    choice: np.ndarray        # edge → chosen candidate column (-1 for edges outside the tree)
+    evaluated_candidates: int
+    runtime_ms: float
+    budget_steps: int         # resolution actually used (see _MAX_CHOICE_CELLS)
+
+
+def _candidate_drop_pct(problem: SizingProblem, edges: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """ΔV% of every candidate section on the given edges (edges × candidates)."""
+    _, pct = _voltage_drop_arrays(
+        current[:, None],
+        problem.length[edges, None],
+        problem.candidate_resistance[edges],
+        problem.candidate_reactance[edges],
+        np.float64(problem.power_factor),
+        problem.phases[edges, None],
+        np.float64(problem.nominal_voltage),
+    )
+    return pct
+
+
+def optimize_conductor_sizes(problem: SizingProblem) -> SizingResult:
+    """Choose one candidate per tree edge minimizing total cost under the drop limit."""
+    started = time.perf_counter()
+    network = problem.network
+    choice = np.full(len(network.conductor_ids), -1, dtype=np.int64)
+    if len(network.order) <= 1:
+        return SizingResult(True, choice, 0, (time.perf_counter() - started) * 1000.0, problem.budget_steps)
+
+    tree_nodes = network.order[1:]
+    steps = min(problem.budget_steps, max(_MIN_BUDGET_STEPS, _MAX_CHOICE_CELLS // len(tree_nodes) - 1))
+    tree_edges = network.parent_edge[tree_nodes]
+    drop = _candidate_drop_pct(problem, tree_edges, problem.branch_current[tree_nodes])
+    cost = problem.candidate_cost[tree_edges] * problem.length[tree_edges, None]
+    unavailable = np.isnan(drop) | np.isnan(cost)
+    cost = np.where(unavailable, np.inf, cost)
+    # Round up so the discrete solution never underestimates the real drop
+    step = problem.limit_pct / steps
+    quanta = np.where(unavailable, steps + 1, np.ceil(np.nan_to_num(drop, nan=0.0) / step - 1e-9))
+    quanta = np.minimum(quanta, steps + 1).astype(np.int64)
+
+    budgets = np.arange(steps + 1)
+    row_of = np.empty(network.num_nodes, dtype=np.int64)
+    row_of[tree_nodes] = np.arange(len(tree_nodes))
+    best_choice = np.empty((len(tree_nodes), steps + 1), dtype=np.int8 if quanta.shape[1] <= 127 else np.int16)
+    subtree_cost: dict[int, np.ndarray] = {}
+    zero = np.zeros(steps + 1)
+
+    for node in tree_nodes[::-1].tolist():
+        row = row_of[node]
+        below = subtree_cost.pop(node, zero)
+        remaining = budgets[None, :] - quanta[row][:, None]
+        table = np.where(remaining >= 0, below[np.maximum(remaining, 0)], np.inf) + cost[row][:, None]
+        picked = table.argmin(axis=0)
+        best_choice[row] = picked
+        parent = int(network.parent[node])
+        value = table[picked, budgets]
+        acc = subtree_cost.get(parent)
+        subtree_cost[parent] = value if acc is None else acc + value
+
+    root_cost = subtree_cost.get(int(network.source), zero)
+    feasible = bool(np.isfinite(root_cost[steps]))
+
+    if feasible:
+        budget_at = np.empty(network.num_nodes, dtype=np.int64)
+        budget_at[network.source] = steps
+        for node in tree_nodes.tolist():
+            row = row_of[node]
+            picked = int(best_choice[row, budget_at[network.parent[node]]])
+            choice[tree_edges[row]] = picked
+            budget_at[node] = budget_at[network.parent[node]] - quanta[row, picked]
+    else:
+        # Nothing fits: report the lowest-drop candidate on every segment
+        choice[tree_edges] = np.where(unavailable, np.inf, drop).argmin(axis=1)
+
+    return SizingResult(
+        feasible=feasible,
+        choice=choice,
+        evaluated_candidates=int(len(tree_nodes) * quanta.shape[1] * (steps + 1)),
+        runtime_ms=(time.perf_counter() - started) * 1000.0,
+        budget_steps=steps,
+    )
@@ -0,0 +1,46 @@
+"""Shared executor for the heavy calculation modes (batches, sweeps, project-wide runs)."""
+from app.core.config import get_settings
+from app.core.executor import CalculationExecutor
+
+
+def _warm_worker() -> None:
+    """Size a two-span feeder in the worker so the first request finds every module imported.
+
+    Pickled calls name their function by module, so without this the first
+    project-wide request in each worker would also import the service layer
+    (SQLAlchemy, repositories) before it starts computing.
+    """
+    import numpy as np
+    from app.domains.calculations import mechanical_stress, sweep  # noqa: F401
+    from app.domains.calculations.schemas import ConductorSizingRequest
+    from app.domains.calculations.service import ProjectNetworkData, size_project_conductors
+
+    data = ProjectNetworkData(
+        pole_ids=np.array([1, 2, 3]),
+        latitude=np.array([-22.9, -22.9003, -22.9006]),
+        longitude=np.full(3, -43.1),
+        pole_height=np.full(3, np.nan),
+        pole_class=[None] * 3,
+        conductor_ids=np.array([1, 2]),
+        from_pole_ids=np.array([1, 2]),
+        to_pole_ids=np.array([2, 3]),
+        conductor_types=["CA", "CA"],
+        cross_section=np.array([35.0, 35.0]),
+        voltage_levels=["BT", "BT"],
+        phases=np.array([3, 3]),
+        length=np.array([33.0, 33.0]),
+    )
+    size_project_conductors(0, data, ConductorSizingRequest(budget_steps=20))
+
+
+def should_offload(items: int) -> bool:
+    """Small requests are cheaper inline than the round trip to a worker."""
+    return items >= get_settings().calculation_offload_min_items
+
+
+_settings = get_settings()
+CALCULATION_EXECUTOR = CalculationExecutor(
+    _settings.calculation_workers,
+    _settings.calculation_max_queue,
+    initializer=_warm_worker,
+)
@@ -0,0 +1,122 @@
+"""Per-project cache of solved feeders with incremental conductor updates.
+
+The load-flow endpoint stores the solved :class:`FeederState` here. Infrastructure
+writes then keep it current instead of forcing a full rebuild:
+
+- an electrical change to one conductor (type, section, length, voltage level)
+  only alters the drop across that branch, so the difference is added to the
+  contiguous preorder slice holding its downstream subtree;
+- a change of phase count alters the load currents, so the feeder is re-solved
+  on the cached topology (no database round trip);
+- anything that changes topology (conductor/pole create or delete, pole moves)
+  invalidates the project.
+
+Writers apply these changes once their transaction commits, and every applied
+change (cached or not) bumps the project's :meth:`generation`. A load flow that
+read the rows before such a commit passes the generation it started with to
+:meth:`put`, so its result is not cached over the change.
+
+The cache is process-local; each worker keeps its own copy.
+"""
+from collections import OrderedDict
+import numpy as np
+from app.core.config import get_settings
+from app.domains.calculations.conductor_catalog import CONDUCTOR_CATALOG
+from app.domains.calculations.load_flow import FeederState, compute_branch_drop_pct, edge_limits, solve_feeder
+from app.domains.calculations.schemas import LoadFlowRequest
+
+
+class FeederStateCache:
+    def __init__(self, max_projects: int = 32):
+        self.max_projects = max_projects
+        self._states: OrderedDict[int, FeederState] = OrderedDict()
+        self._generations: dict[int, int] = {}
+
+    def get(self, project_id: int, params: LoadFlowRequest) -> FeederState | None:
+        state = self._states.get(project_id)
+        if state is None or state.params != params:
+            return None
+        self._states.move_to_end(project_id)
+        return state
+
+    def generation(self, project_id: int) -> int:
+        """Bumped on every invalidation of or conductor update to ``project_id``."""
+        return self._generations.get(project_id, 0)
+
+    def put(self, project_id: int, state: FeederState, generation: int | None = None) -> None:
+        if generation is not None and generation != self.generation(project_id):
+            return  # solved from rows that have changed since
+        self._states[project_id] = state
+        self._states.move_to_end(project_id)
+        while len(self._states) > self.max_projects:
+            self._states.popitem(last=False)
+
+    def _bump(self, project_id: int) -> None:
+        self._generations[project_id] = self.generation(project_id) + 1
+
+    def invalidate(self, project_id: int | None) -> None:
+        if project_id is not None:
+            self._states.pop(project_id, None)
+            self._bump(project_id)
+
+    def clear(self) -> None:
+        self._states.clear()
+        self._generations.clear()
+
+    def apply_conductor_update(self, project_id: int | None, conductor_id: int, changes: dict) -> bool:
+        """Fold a conductor edit into the cached feeder; returns False when nothing was cached.
+
+        ``changes`` holds the updated ``Conductor`` attributes and their new values.
+        """
+        if project_id is None:
+            return False
+        # Even with nothing cached, a solve in flight may have read the old row
+        self._bump(project_id)
+        state = self._states.get(project_id)
+        if state is None:
+            return False
+        network, edges = state.network, state.edges
+        e = network.edge_of(conductor_id)
+        if e < 0:
+            self.invalidate(project_id)
+            return False
+        if changes.get("length", 0.0) is None:
+            # Length falls back to the geodesic span, which needs pole coordinates
+            self.invalidate(project_id)
+            return False
+
+        try:
+            if "conductor_type" in changes or "cross_section" in changes:
+                ctype = changes.get("conductor_type")
+                section = changes.get("cross_section")
+                if ctype is None or section is None:
+                    # Callers pass both attributes whenever either one changes
+                    self.invalidate(project_id)
+                    return False
+                edges.resistance[e], edges.reactance[e] = CONDUCTOR_CATALOG.properties(ctype, section)
+        except ValueError:
+            self.invalidate(project_id)
+            return False
+        if "length" in changes:
+            edges.length[e] = changes["length"]
+        if "voltage_level" in changes:
+            edges.limit_pct[e] = edge_limits([changes["voltage_level"]])[0]
+        if "phases" in changes and changes["phases"] is not None and changes["phases"] != edges.phases[e]:
+            edges.phases[e] = changes["phases"]
+            self.put(project_id, solve_feeder(network, edges, state.params))
+            return True
+
+        # Only the branch feeding the child end of this edge changes its drop
+        child = network.edge_to[e] if network.parent_edge[network.edge_to[e]] == e else network.edge_from[e]
+        if network.parent_edge[child] != e:
+            return True  # loop-closing or island edge: not part of the solved feeder
+        nodes = np.array([child])
+        new_drop = compute_branch_drop_pct(network, edges, state.params, nodes, state.branch_current[nodes])[0]
+        delta = new_drop - state.branch_drop_pct[child]
+        state.branch_drop_pct[child] = new_drop
+        pos = network.position[child]
+        state.drop_pct[network.order[pos:network.subtree_end[pos]]] += delta
+        return True
+
+
+FEEDER_CACHE = FeederStateCache(get_settings().feeder_cache_max_projects)
@@ -0,0 +1,137 @@
+"""Radial feeder load flow — cumulative voltage drop per pole (ABNT NBR 5410).
+
+Backward sweep: the current in each branch is the sum of the load currents
+downstream of it. Forward sweep: the ΔV% at each pole is the sum of the branch
+ΔV% on the path from the source. Loads are modelled as constant current at
+nominal voltage (S / (√3·Vn) behind three-phase branches, S / Vn behind
+single-phase ones), so one sweep in each direction is exact.
+
+Both sweeps run over the DFS preorder of :class:`RadialNetwork` and are fully
+vectorized (cumulative sums and range updates), so 50k-pole feeders solve in
+milliseconds once the topology is built.
+"""
+from dataclasses import dataclass
+import math
+import numpy as np
+from app.domains.calculations.network import RadialNetwork
+from app.domains.calculations.schemas import LoadFlowRequest, LoadFlowResponse
+from app.domains.calculations.voltage_drop import _VOLTAGE_LIMITS, _voltage_drop_arrays
+
+
+@dataclass
+class FeederEdges:
+    """Per-edge electrical data aligned with ``RadialNetwork.conductor_ids``."""
+
+    length: np.ndarray        # m
+    resistance: np.ndarray    # Ω/km
+    reactance: np.ndarray     # Ω/km
+    phases: np.ndarray
+    limit_pct: np.ndarray
+
+
+def edge_limits(voltage_levels: list[str]) -> np.ndarray:
+    return np.fromiter(
+        (_VOLTAGE_LIMITS.get((level or "BT").upper(), 7.0) for level in voltage_levels),
+        dtype=float,
+        count=len(voltage_levels),
+    )
+
+
+@dataclass
+class FeederState:
+    """Solved feeder: node-indexed results plus the inputs needed to update them."""
+
+    network: RadialNetwork
+    edges: FeederEdges
+    params: LoadFlowRequest
+    branch_current: np.ndarray   # node → current in the branch feeding it (A)
+    branch_drop_pct: np.ndarray  # node → ΔV% across the branch feeding it
+    drop_pct: np.ndarray         # node → cumulative ΔV% from the source
+
+
+def compute_branch_drop_pct(network: RadialNetwork, edges: FeederEdges, params: LoadFlowRequest,
+                             nodes: np.ndarray, branch_current: np.ndarray) -> np.ndarray:
+    """ΔV% across the branches feeding ``nodes`` (which must all have a parent edge)."""
+    e = network.parent_edge[nodes]
+    n = len(nodes)
+    _, pct = _voltage_drop_arrays(
+        branch_current,
+        edges.length[e],
+        edges.resistance[e],
+        edges.reactance[e],
+        np.full(n, params.power_factor),
+        edges.phases[e],
+        np.full(n, params.nominal_voltage),
+    )
+    return pct
+
+
+def solve_feeder(network: RadialNetwork, edges: FeederEdges, params: LoadFlowRequest) -> FeederState:
+    """Run the backward/forward sweep over the whole feeder."""
+    n = network.num_nodes
+    fed = network.parent_edge >= 0
+    fed_nodes = np.flatnonzero(fed)
+
+    # Load current at each fed pole, referred to the phase arrangement of its branch
+    load_current = np.zeros(n)
+    phase_factor = np.where(edges.phases[network.parent_edge[fed_nodes]] == 3, math.sqrt(3), 1.0)
+    load_current[fed_nodes] = params.load_kva_per_pole * 1000.0 / (phase_factor * params.nominal_voltage)
+
+    # Backward sweep: branch current = downstream load
+    branch_current = network.subtree_sum(load_current)
+
+    # Forward sweep: cumulative ΔV% along the path from the source
+    branch_drop_pct = np.zeros(n)
+    branch_drop_pct[fed_nodes] = compute_branch_drop_pct(network, edges, params, fed_nodes, branch_current[fed_nodes])
+    drop_pct = network.path_sum(branch_drop_pct)
+
+    return FeederState(
+        network=network,
+        edges=edges,
+        params=params,
+        branch_current=branch_current,
+        branch_drop_pct=branch_drop_pct,
+        drop_pct=drop_pct,
+    )
+
+
+def build_load_flow_response(state: FeederState, project_id: int) -> LoadFlowResponse:
+    network = state.network
+    params = state.params
+    order = network.order
+    pole_ids = network.pole_ids
+    disconnected = pole_ids[network.position < 0]
+
+    if len(order) == 0:
+        return LoadFlowResponse(
+            project_id=project_id,
+            nominal_voltage=params.nominal_voltage,
+            pole_ids=[], voltage_drop_pct=[], voltage_v=[], limit_pct=[], compliant=[],
+            disconnected_pole_ids=disconnected.tolist(),
+        )
+
+    drop = state.drop_pct[order]
+    node_limit = np.full(network.num_nodes, max(_VOLTAGE_LIMITS.values()))
+    fed_nodes = np.flatnonzero(network.parent_edge >= 0)
+    node_limit[fed_nodes] = state.edges.limit_pct[network.parent_edge[fed_nodes]]
+    limit = node_limit[order]
+    compliant = drop <= limit
+    worst = int(np.argmax(drop))
+    source_children = order[network.parent[order] == network.source]
+
+    return LoadFlowResponse(
+        project_id=project_id,
+        source_pole_id=int(pole_ids[network.source]),
+        nominal_voltage=params.nominal_voltage,
+        pole_ids=pole_ids[order].tolist(),
+        voltage_drop_pct=np.round(drop, 4).tolist(),
+        voltage_v=np.round(params.nominal_voltage * (1.0 - drop / 100.0), 2).tolist(),
+        limit_pct=limit.tolist(),
+        compliant=compliant.tolist(),
+        worst_pole_id=int(pole_ids[order[worst]]),
+        worst_voltage_drop_pct=round(float(drop[worst]), 4),
+        all_compliant=bool(compliant.all()),
+        source_current_a=round(float(state.branch_current[source_children].sum()), 2),
+        disconnected_pole_ids=disconnected.tolist(),
+        loop_conductor_ids=network.conductor_ids[network.loop_edges].tolist(),
+    )
@@ -7,9 +7,19 @@ Loads considered:
     - Tension load: from cable tension at the attachment point
     - Moment at base: M = resultant × attachment_height
 Safety factor requirement: ≥ 2.5 (NBR 8458/8798)
+
+Project mode (all poles at once, NumPy):
+    - Each pole carries half of every span attached to it (wind and weight)
+    - Tension is summed as vectors along each span's bearing, so it cancels on
+      tangent poles, becomes 2·T·sin(δ/2) on angle poles and T on dead-ends
+    - Horizontal = √(wind² + |ΣT|²); moment = horizontal × attachment height
 """
 import math
-from app.domains.calculations.schemas import MechanicalStressRequest, MechanicalStressResponse
+import numpy as np
+from app.domains.calculations.schemas import (
+    MechanicalStressRequest, MechanicalStressResponse,
+    ProjectMechanicalStressRequest, ProjectMechanicalStressResponse,
+)
 
 _GRAVITY = 9.80665  # m/s²
 _DRAG_COEFF = 1.2   # Cf for cylindrical conductor
@@ -58,3 +68,129 @@ def calculate_mechanical_stress(request: MechanicalStressRequest) -> MechanicalS
         total_resultant_n=round(total_resultant, 2),
         moment_nm=round(moment, 2),
     )
+
+
+# ── Vectorized single-pole kernel ───────────────────────────────────────────
+
+def _mechanical_stress_arrays(
+    wind_speed: np.ndarray,
+    conductor_diameter: np.ndarray,
+    span_length: np.ndarray,
+    conductor_weight: np.ndarray,
+    conductor_tension: np.ndarray,
+    attachment_height: np.ndarray,
+    num_conductors: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (total horizontal N, total resultant N, moment N·m) — same model as calculate_mechanical_stress."""
+    q = _AIR_DENSITY_FACTOR * wind_speed ** 2
+    fw = np.maximum(_DRAG_COEFF * q * (conductor_diameter / 1000.0) * span_length, 0.0)
+    wc = (conductor_weight / 1000.0) * _GRAVITY * span_length
+    total_horizontal = np.sqrt(fw ** 2 + conductor_tension ** 2) * num_conductors
+    total_vertical = wc * num_conductors
+    total_resultant = np.sqrt(total_horizontal ** 2 + total_vertical ** 2)
+    return total_horizontal, total_resultant, total_horizontal * attachment_height
+
+
+# ── Project mode (vectorized) ───────────────────────────────────────────────
+
+def _parse_nominal_load_n(pole_class: str | None) -> float:
+    """Nominal load in N from a pole class such as "300" (daN, NBR 8451); NaN when unknown."""
+    try:
+        return float(str(pole_class).strip().lower().removesuffix("dan")) * 10.0
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _classify_structures(degree: np.ndarray, deflection: np.ndarray, tangent_max_angle: float) -> list[str]:
+    structure = np.select(
+        [degree == 0, degree == 1, (degree == 2) & (deflection <= tangent_max_angle), degree == 2],
+        ["isolado", "fim_de_linha", "tangente", "angulo"],
+        default="derivacao",
+    )
+    return structure.tolist()
+
+
+def calculate_project_mechanical_stress(
+    project_id: int,
+    request: ProjectMechanicalStressRequest,
+    pole_ids: np.ndarray,
+    latitude: np.ndarray,
+    longitude: np.ndarray,
+    pole_height: np.ndarray,
+    pole_class: list[str | None],
+    edge_a: np.ndarray,
+    edge_b: np.ndarray,
+    span: np.ndarray,
+    diameter_mm: np.ndarray,
+    weight_kg_km: np.ndarray,
+    num_conductors: np.ndarray,
+) -> ProjectMechanicalStressResponse:
+    """Evaluate every pole of a project at once.
+
+    Edges are given as pole indices (``edge_a``/``edge_b``) with their span (m),
+    conductor diameter/weight and number of conductors (phases).
+    """
+    n = len(pole_ids)
+    q = _AIR_DENSITY_FACTOR * request.wind_speed ** 2
+
+    # Half of each span is carried by each end pole
+    wind_half = num_conductors * _DRAG_COEFF * q * (diameter_mm / 1000.0) * span / 2.0
+    weight_half = num_conductors * (weight_kg_km / 1000.0) * _GRAVITY * span / 2.0
+
+    # Unit vector from a towards b on a local tangent plane (east, north)
+    mean_lat = np.radians((latitude[edge_a] + latitude[edge_b]) / 2.0)
+    east = np.radians(longitude[edge_b] - longitude[edge_a]) * np.cos(mean_lat)
+    north = np.radians(latitude[edge_b] - latitude[edge_a])
+    norm = np.hypot(east, north)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ue = np.nan_to_num(east / norm)
+        un = np.nan_to_num(north / norm)
+
+    ends = np.concatenate((edge_a, edge_b))
+
+    def per_pole(values_a: np.ndarray, values_b: np.ndarray) -> np.ndarray:
+        return np.bincount(ends, weights=np.concatenate((values_a, values_b)), minlength=n)
+
+    degree = np.bincount(ends, minlength=n)
+    wind = per_pole(wind_half, wind_half)
+    weight = per_pole(weight_half, weight_half)
+    pull = num_conductors * request.conductor_tension
+    tension_e = per_pole(pull * ue, -pull * ue)
+    tension_n = per_pole(pull * un, -pull * un)
+    tension = np.hypot(tension_e, tension_n)
+
+    # Line deflection on two-span poles: |u1 + u2| = 2·cos(θ/2), deflection = 180° − θ
+    sum_e = per_pole(ue, -ue)
+    sum_n = per_pole(un, -un)
+    half_angle = np.arccos(np.clip(np.hypot(sum_e, sum_n) / 2.0, 0.0, 1.0))
+    deflection = np.where(degree == 2, 180.0 - np.degrees(2.0 * half_angle), 0.0)
+
+    horizontal = np.hypot(wind, tension)
+    resultant = np.hypot(horizontal, weight)
+    attachment = np.fmin(request.attachment_height, pole_height)
+    moment = horizontal * attachment
+
+    nominal = np.array([_parse_nominal_load_n(c) for c in pole_class], dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        utilization = horizontal / nominal
+    overloaded = pole_ids[np.nan_to_num(utilization, nan=0.0) > 1.0]
+
+    def optional(values: np.ndarray, decimals: int) -> list[float | None]:
+        return [None if math.isnan(v) else v for v in np.round(values, decimals).tolist()]
+
+    return ProjectMechanicalStressResponse(
+        project_id=project_id,
+        wind_speed=request.wind_speed,
+        pole_ids=pole_ids.tolist(),
+        structure=_classify_structures(degree, deflection, request.tangent_max_angle),
+        deflection_deg=np.round(deflection, 2).tolist(),
+        wind_load_n=np.round(wind, 2).tolist(),
+        weight_load_n=np.round(weight, 2).tolist(),
+        tension_resultant_n=np.round(tension, 2).tolist(),
+        total_resultant_n=np.round(resultant, 2).tolist(),
+        moment_nm=np.round(moment, 2).tolist(),
+        nominal_load_n=optional(nominal, 2),
+        utilization=optional(utilization, 4),
+        worst_pole_id=int(pole_ids[np.argmax(moment)]) if n else None,
+        overloaded_pole_ids=overloaded.tolist(),
+    )
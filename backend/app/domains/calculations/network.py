@@ -0,0 +1,183 @@
+"""Radial network topology built from pole/conductor rows.
+
+Poles become nodes and conductors become edges of an undirected graph stored as
+CSR arrays (indptr/indices). The feeder tree is obtained with an iterative DFS
+from the source pole, yielding a preorder in which every subtree occupies a
+contiguous slice ``order[pos:subtree_end[pos]]``. Downstream aggregations
+(backward sweep) and cumulative path sums (forward sweep) then become
+cumulative-sum and range-update operations over that slice layout.
+"""
+from dataclasses import dataclass
+import numpy as np
+
+_EARTH_RADIUS_M = 6371008.8  # mean Earth radius (IUGG)
+
+
+def geodesic_distance_m(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle (haversine) distance in metres — element-wise over arrays."""
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = np.radians(np.asarray(lon2) - np.asarray(lon1))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * _EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+@dataclass
+class RadialNetwork:
+    """Feeder tree over poles (nodes) and conductors (edges), indexed by array position."""
+
+    pole_ids: np.ndarray        # node → pole id
+    conductor_ids: np.ndarray   # edge → conductor id
+    edge_from: np.ndarray       # edge → node (as stored, pole_from_id)
+    edge_to: np.ndarray         # edge → node (as stored, pole_to_id)
+    source: int                 # node index of the source pole (-1 when there are no poles)
+    order: np.ndarray           # DFS preorder of the nodes reachable from the source
+    position: np.ndarray        # node → position in order (-1 when disconnected)
+    subtree_end: np.ndarray     # position → exclusive end of that node's subtree in order
+    parent: np.ndarray          # node → parent node (-1 for source/disconnected)
+    parent_edge: np.ndarray     # node → edge linking it to its parent (-1 for source/disconnected)
+    loop_edges: np.ndarray      # edges closing a loop (ignored by radial calculations)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.pole_ids)
+
+    def node_of(self, pole_id: int) -> int:
+        """Return the node index of a pole id, or -1."""
+        i = int(np.searchsorted(self.pole_ids, pole_id))
+        if i < len(self.pole_ids) and self.pole_ids[i] == pole_id:
+            return i
+        return -1
+
+    def edge_of(self, conductor_id: int) -> int:
+        """Return the edge index of a conductor id, or -1."""
+        i = int(np.searchsorted(self.conductor_ids, conductor_id))
+        if i < len(self.conductor_ids) and self.conductor_ids[i] == conductor_id:
+            return i
+        return -1
+
+    def subtree_sum(self, node_values: np.ndarray) -> np.ndarray:
+        """Sum node_values over every node's subtree (0 for disconnected nodes)."""
+        totals = np.zeros(self.num_nodes)
+        if len(self.order) == 0:
+            return totals
+        prefix = np.concatenate(([0.0], np.cumsum(node_values[self.order])))
+        starts = np.arange(len(self.order))
+        totals[self.order] = prefix[self.subtree_end] - prefix[starts]
+        return totals
+
+    def path_sum(self, node_increments: np.ndarray) -> np.ndarray:
+        """Accumulate node_increments from the source down to every node (0 for disconnected)."""
+        totals = np.zeros(self.num_nodes)
+        if len(self.order) == 0:
+            return totals
+        values = node_increments[self.order]
+        diff = np.concatenate((values, [0.0]))
+        np.add.at(diff, self.subtree_end, -values)
+        totals[self.order] = np.cumsum(diff[:-1])
+        return totals
+
+
+def build_radial_network(
+    pole_ids: np.ndarray,
+    conductor_ids: np.ndarray,
+    from_pole_ids: np.ndarray,
+    to_pole_ids: np.ndarray,
+    source_pole_id: int | None = None,
+) -> RadialNetwork:
+    """Build the feeder tree.
+
+    Poles and conductors must be sorted by id (node/edge indices follow that order) and
+    conductors whose endpoints are not among ``pole_ids`` must be filtered out by the
+    caller. When ``source_pole_id`` is omitted the source is the lowest-id pole that
+    feeds at least one conductor and is not fed by any.
+    """
+    pole_ids = np.asarray(pole_ids, dtype=np.int64)
+    conductor_ids = np.asarray(conductor_ids, dtype=np.int64)
+    edge_from = np.searchsorted(pole_ids, np.asarray(from_pole_ids, dtype=np.int64))
+    edge_to = np.searchsorted(pole_ids, np.asarray(to_pole_ids, dtype=np.int64))
+    n, m = len(pole_ids), len(conductor_ids)
+
+    if source_pole_id is not None:
+        source = int(np.searchsorted(pole_ids, source_pole_id))
+        if source >= n or pole_ids[source] != source_pole_id:
+            raise ValueError(f"Poste de origem {source_pole_id} não pertence ao projeto.")
+    elif n == 0:
+        source = -1
+    else:
+        fed = np.zeros(n, dtype=bool)
+        fed[edge_to] = True
+        feeds = np.zeros(n, dtype=bool)
+        feeds[edge_from] = True
+        candidates = np.flatnonzero(feeds & ~fed)
+        source = int(candidates[0]) if len(candidates) else 0
+
+    # Undirected CSR adjacency: for node v, neighbours are indices[indptr[v]:indptr[v + 1]]
+    endpoints = np.concatenate((edge_from, edge_to))
+    others = np.concatenate((edge_to, edge_from))
+    edges = np.concatenate((np.arange(m), np.arange(m)))
+    by_node = np.argsort(endpoints, kind="stable")
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(endpoints, minlength=n))))
+    indices = others[by_node].tolist()
+    adj_edges = edges[by_node].tolist()
+    indptr_l = indptr.tolist()
+
+    parent = np.full(n, -1, dtype=np.int64)
+    parent_edge = np.full(n, -1, dtype=np.int64)
+    position = np.full(n, -1, dtype=np.int64)
+    order: list[int] = []
+    subtree_end: list[int] = []
+    loop_edges: list[int] = []
+
+    if source >= 0:
+        parent_l = [-1] * n
+        parent_edge_l = [-1] * n
+        visited = [False] * n
+        visited[source] = True
+        used = [False] * m
+        # Stack of (node, next adjacency cursor); a node's subtree ends when it is popped
+        position_l = [-1] * n
+        position_l[source] = 0
+        order.append(source)
+        subtree_end.append(0)
+        stack = [[source, indptr_l[source]]]
+        while stack:
+            frame = stack[-1]
+            v, cursor = frame
+            if cursor < indptr_l[v + 1]:
+                frame[1] = cursor + 1
+                e = adj_edges[cursor]
+                if used[e]:
+                    continue
+                used[e] = True
+                w = indices[cursor]
+                if visited[w]:
+                    loop_edges.append(e)
+                    continue
+                visited[w] = True
+                parent_l[w] = v
+                parent_edge_l[w] = e
+                position_l[w] = len(order)
+                order.append(w)
+                subtree_end.append(0)
+                stack.append([w, indptr_l[w]])
+            else:
+                stack.pop()
+                subtree_end[position_l[v]] = len(order)
+        parent = np.array(parent_l, dtype=np.int64)
+        parent_edge = np.array(parent_edge_l, dtype=np.int64)
+        position = np.array(position_l, dtype=np.int64)
+
+    return RadialNetwork(
+        pole_ids=pole_ids,
+        conductor_ids=conductor_ids,
+        edge_from=edge_from,
+        edge_to=edge_to,
+        source=source,
+        order=np.array(order, dtype=np.int64),
+        position=position,
+        subtree_end=np.array(subtree_end, dtype=np.int64),
+        parent=parent,
+        parent_edge=parent_edge,
+        loop_edges=np.array(sorted(loop_edges), dtype=np.int64),
+    )
@@ -35,6 +35,68 @@ class VoltageDropResponse(BaseModel):
     standard: str = "ABNT NBR 5410"
 
 
+class VoltageDropBatchRequest(BaseModel):
+    items: list[VoltageDropRequest] = Field(
+        ..., min_length=1, max_length=50000, description="Trechos a calcular em uma única passada"
+    )
+
+
+class VoltageDropBatchResponse(BaseModel):
+    results: list[VoltageDropResponse] = Field(..., description="Resultados na mesma ordem dos trechos enviados")
+    total: int
+    non_compliant: int = Field(..., description="Quantidade de trechos acima do limite normativo")
+
+
+# ── Feeder load flow ────────────────────────────────────────────────────────
+
+class LoadFlowRequest(BaseModel):
+    source_pole_id: Optional[int] = Field(None, description="Poste de origem (padrão: detectado pela topologia)")
+    load_kva_per_pole: float = Field(5.0, ge=0, description="Demanda por poste em kVA")
+    nominal_voltage: float = Field(220.0, gt=0, description="Tensão nominal em Volts")
+    power_factor: float = Field(0.92, ge=0.0, le=1.0, description="Fator de potência (cosφ)")
+
+
+class LoadFlowResponse(BaseModel):
+    project_id: int
+    source_pole_id: Optional[int] = None
+    nominal_voltage: float
+    pole_ids: list[int] = Field(..., description="Postes alimentados, em ordem de percurso a partir da origem")
+    voltage_drop_pct: list[float] = Field(..., description="Queda de tensão acumulada em cada poste (%)")
+    voltage_v: list[float] = Field(..., description="Tensão estimada em cada poste (V)")
+    limit_pct: list[float] = Field(..., description="Limite regulatório aplicável a cada poste (%)")
+    compliant: list[bool]
+    worst_pole_id: Optional[int] = None
+    worst_voltage_drop_pct: float = 0.0
+    all_compliant: bool = True
+    source_current_a: float = Field(0.0, description="Corrente total na saída da origem (A)")
+    disconnected_pole_ids: list[int] = Field([], description="Postes sem caminho até a origem")
+    loop_conductor_ids: list[int] = Field([], description="Condutores que fecham malha (ignorados)")
+    standard: str = "ABNT NBR 5410"
+
+
+class ConductorSizingRequest(LoadFlowRequest):
+    limit_pct: Optional[float] = Field(
+        None, gt=0, description="Limite de queda acumulada (%); padrão: o mais restritivo dos níveis de tensão"
+    )
+    allowed_sections: Optional[list[float]] = Field(None, description="Seções candidatas em mm² (padrão: catálogo)")
+    budget_steps: int = Field(200, ge=20, le=2000, description="Resolução da discretização da queda admissível")
+
+
+class ConductorSizingResponse(BaseModel):
+    project_id: int
+    feasible: bool = Field(..., description="Existe combinação de seções que atende ao limite?")
+    limit_pct: float
+    conductor_ids: list[int]
+    current_sections: list[float]
+    sections: list[float] = Field(..., description="Seção ótima por condutor em mm²")
+    current_cost: float = Field(..., description="Custo das seções atuais (R$)")
+    total_cost: float = Field(..., description="Custo das seções ótimas (R$)")
+    worst_voltage_drop_pct: float = Field(..., description="Maior queda acumulada com as seções ótimas (%)")
+    evaluated_candidates: int
+    budget_steps: int = Field(..., description="Resolução usada (reduzida em redes com muitos trechos)")
+    runtime_ms: float
+
+
 # ── Mechanical Stress ───────────────────────────────────────────────────────
 
 class MechanicalStressRequest(BaseModel):
@@ -58,6 +120,89 @@ class MechanicalStressResponse(BaseModel):
     standard: str = "ABNT NBR 8458/8798"
 
 
+class ProjectMechanicalStressRequest(BaseModel):
+    wind_speed: float = Field(..., gt=0, description="Velocidade do vento em m/s")
+    conductor_tension: float = Field(..., gt=0, description="Tração de projeto por condutor em N")
+    attachment_height: float = Field(
+        10.0, gt=0, description="Altura de fixação em metros (limitada à altura do poste, quando cadastrada)"
+    )
+    tangent_max_angle: float = Field(
+        5.0, ge=0, le=90, description="Deflexão máxima (graus) para classificar o poste como tangente"
+    )
+
+
+class ProjectMechanicalStressResponse(BaseModel):
+    project_id: int
+    wind_speed: float
+    pole_ids: list[int]
+    structure: list[str] = Field(
+        ..., description="Função estrutural: tangente, angulo, fim_de_linha, derivacao ou isolado"
+    )
+    deflection_deg: list[float] = Field(..., description="Deflexão da linha no poste (0 exceto em postes de passagem)")
+    wind_load_n: list[float] = Field(..., description="Carga de vento total (meio vão de cada lado) em N")
+    weight_load_n: list[float] = Field(..., description="Carga vertical total (meio vão de cada lado) em N")
+    tension_resultant_n: list[float] = Field(..., description="Resultante vetorial das trações pelos azimutes em N")
+    total_resultant_n: list[float]
+    moment_nm: list[float] = Field(..., description="Momento fletor no engastamento em N·m")
+    nominal_load_n: list[Optional[float]] = Field(..., description="Carga nominal da classe do poste (daN × 10)")
+    utilization: list[Optional[float]] = Field(..., description="Esforço horizontal / carga nominal")
+    worst_pole_id: Optional[int] = None
+    overloaded_pole_ids: list[int] = []
+    safety_factor_required: float = 2.5
+    standard: str = "ABNT NBR 8458/8798"
+
+
+# ── Parametric sweeps ───────────────────────────────────────────────────────
+
+class SweepAxis(BaseModel):
+    field: str = Field(..., description="Campo da requisição base a variar")
+    values: list[float | str] = Field(..., min_length=1, max_length=1000)
+
+
+class VoltageDropSweepRequest(BaseModel):
+    base: VoltageDropRequest
+    axes: list[SweepAxis] = Field(
+        ..., min_length=1, max_length=5,
+        description="current, length, cross_section, power_factor, nominal_voltage ou conductor_type",
+    )
+
+
+class VoltageDropSweepResponse(BaseModel):
+    axes: list[SweepAxis] = Field(..., description="Eixos avaliados (numéricos em ordem crescente)")
+    shape: list[int]
+    evaluated: int
+    voltage_drop_pct: list[float] = Field(..., description="Matriz achatada em ordem C (último eixo varia mais rápido)")
+    compliant: list[bool]
+    limit_pct: float
+    best: Optional[dict[str, float | str]] = Field(
+        None, description="Primeira combinação conforme na ordem dos eixos (menores valores primeiro)"
+    )
+    best_voltage_drop_pct: Optional[float] = None
+
+
+class MechanicalStressSweepRequest(BaseModel):
+    base: MechanicalStressRequest
+    axes: list[SweepAxis] = Field(
+        ..., min_length=1, max_length=5,
+        description=(
+            "wind_speed, conductor_diameter, span_length, conductor_weight, conductor_tension, "
+            "attachment_height ou num_conductors"
+        ),
+    )
+    pole_nominal_load_n: float = Field(..., gt=0, description="Carga nominal do poste em N (critério de conformidade)")
+
+
+class MechanicalStressSweepResponse(BaseModel):
+    axes: list[SweepAxis]
+    shape: list[int]
+    evaluated: int
+    total_resultant_n: list[float] = Field(..., description="Matriz achatada em ordem C (último eixo varia mais rápido)")
+    moment_nm: list[float]
+    compliant: list[bool] = Field(..., description="Esforço horizontal ≤ carga nominal do poste")
+    best: Optional[dict[str, float | str]] = None
+    best_total_resultant_n: Optional[float] = None
+
+
 # ── Material List ───────────────────────────────────────────────────────────
 
 class MaterialItem(BaseModel):
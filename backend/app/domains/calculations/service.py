@@ -0,0 +1,209 @@
+"""Network calculation service — project-level calculations over the pole/conductor graph."""
+from dataclasses import dataclass
+from functools import partial
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domains.calculations.conductor_catalog import CONDUCTOR_CATALOG
+from app.domains.calculations.conductor_sizing import SizingProblem, optimize_conductor_sizes
+from app.domains.calculations.executor import CALCULATION_EXECUTOR, should_offload
+from app.domains.calculations.feeder_cache import FEEDER_CACHE
+from app.domains.calculations.mechanical_stress import calculate_project_mechanical_stress
+from app.domains.calculations.load_flow import FeederEdges, edge_limits, solve_feeder, build_load_flow_response
+from app.domains.calculations.network import RadialNetwork, build_radial_network, geodesic_distance_m
+from app.domains.calculations.schemas import (
+    LoadFlowRequest, LoadFlowResponse,
+    ProjectMechanicalStressRequest, ProjectMechanicalStressResponse,
+    ConductorSizingRequest, ConductorSizingResponse,
+)
+from app.domains.calculations.voltage_drop import _VOLTAGE_LIMITS
+from app.domains.infrastructure.repository import NetworkRepository
+from app.domains.projects.repository import ProjectRepository
+
+
+@dataclass
+class ProjectNetworkData:
+    """Column arrays for a project's poles and (valid) conductors, sorted by id."""
+
+    pole_ids: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+    pole_height: np.ndarray
+    pole_class: list[str | None]
+    conductor_ids: np.ndarray
+    from_pole_ids: np.ndarray
+    to_pole_ids: np.ndarray
+    conductor_types: list[str]
+    cross_section: np.ndarray
+    voltage_levels: list[str]
+    phases: np.ndarray
+    length: np.ndarray  # stored length, or geodesic span between the poles (0 when unknown)
+
+    @classmethod
+    def from_rows(cls, pole_rows, conductor_rows) -> "ProjectNetworkData":
+        pole_ids = np.array([r.id for r in pole_rows], dtype=np.int64)
+        latitude = np.array([np.nan if r.latitude is None else r.latitude for r in pole_rows], dtype=float)
+        longitude = np.array([np.nan if r.longitude is None else r.longitude for r in pole_rows], dtype=float)
+
+        known = set(pole_ids.tolist())
+        rows = [
+            r for r in conductor_rows
+            if r.pole_from_id in known and r.pole_to_id in known
+        ]
+        from_ids = np.array([r.pole_from_id for r in rows], dtype=np.int64)
+        to_ids = np.array([r.pole_to_id for r in rows], dtype=np.int64)
+        stored = np.array([np.nan if r.length is None else r.length for r in rows], dtype=float)
+        i, j = np.searchsorted(pole_ids, from_ids), np.searchsorted(pole_ids, to_ids)
+        span = geodesic_distance_m(latitude[i], longitude[i], latitude[j], longitude[j])
+        length = np.where(np.isnan(stored), span, stored)
+
+        return cls(
+            pole_ids=pole_ids,
+            latitude=latitude,
+            longitude=longitude,
+            pole_height=np.array([np.nan if r.pole_height is None else r.pole_height for r in pole_rows], dtype=float),
+            pole_class=[r.pole_class for r in pole_rows],
+            conductor_ids=np.array([r.id for r in rows], dtype=np.int64),
+            from_pole_ids=from_ids,
+            to_pole_ids=to_ids,
+            conductor_types=[r.conductor_type for r in rows],
+            cross_section=np.array([r.cross_section for r in rows], dtype=float),
+            voltage_levels=[r.voltage_level for r in rows],
+            phases=np.array([r.phases for r in rows], dtype=np.int64),
+            length=np.nan_to_num(length, nan=0.0),
+        )
+
+    def feeder_edges(self) -> FeederEdges:
+        resistance, reactance = CONDUCTOR_CATALOG.lookup_arrays(self.conductor_types, self.cross_section)
+        return FeederEdges(
+            length=self.length,
+            resistance=resistance,
+            reactance=reactance,
+            phases=self.phases,
+            limit_pct=edge_limits(self.voltage_levels),
+        )
+
+    def radial_network(self, source_pole_id: int | None = None) -> RadialNetwork:
+        return build_radial_network(
+            self.pole_ids, self.conductor_ids, self.from_pole_ids, self.to_pole_ids, source_pole_id
+        )
+
+
+def size_project_conductors(
+    project_id: int, data: ProjectNetworkData, request: ConductorSizingRequest
+) -> ConductorSizingResponse:
+    """Load flow, candidate sections, sizing DP and re-solve; one picklable call for a worker."""
+    edges = data.feeder_edges()
+    network = data.radial_network(request.source_pole_id)
+    state = solve_feeder(network, edges, request)
+
+    sections, resistance, reactance, cost = CONDUCTOR_CATALOG.candidate_columns(
+        data.conductor_types, request.allowed_sections
+    )
+    tree_edges = network.parent_edge[network.order[1:]]
+    limit_pct = request.limit_pct
+    if limit_pct is None:
+        limit_pct = float(edges.limit_pct[tree_edges].min()) if len(tree_edges) else max(_VOLTAGE_LIMITS.values())
+    problem = SizingProblem(
+        network=network,
+        branch_current=state.branch_current,
+        length=data.length,
+        phases=data.phases,
+        candidate_resistance=resistance,
+        candidate_reactance=reactance,
+        candidate_cost=cost,
+        power_factor=request.power_factor,
+        nominal_voltage=request.nominal_voltage,
+        limit_pct=limit_pct,
+        budget_steps=request.budget_steps,
+    )
+    result = optimize_conductor_sizes(problem)
+
+    # Segments outside the solved tree keep their current section
+    rows = np.arange(len(data.conductor_ids))
+    picked = result.choice >= 0
+    column = np.maximum(result.choice, 0)
+    chosen = np.where(picked, sections[rows, column], data.cross_section)
+    sized = FeederEdges(
+        length=data.length,
+        resistance=np.where(picked, resistance[rows, column], edges.resistance),
+        reactance=np.where(picked, reactance[rows, column], edges.reactance),
+        phases=data.phases,
+        limit_pct=edges.limit_pct,
+    )
+    sized_drop = solve_feeder(network, sized, request).drop_pct[network.order]
+    current_cost = CONDUCTOR_CATALOG.cost_array(data.conductor_types, data.cross_section) * data.length
+    total_cost = CONDUCTOR_CATALOG.cost_array(data.conductor_types, chosen) * data.length
+
+    return ConductorSizingResponse(
+        project_id=project_id,
+        feasible=result.feasible,
+        limit_pct=limit_pct,
+        conductor_ids=data.conductor_ids.tolist(),
+        current_sections=data.cross_section.tolist(),
+        sections=chosen.tolist(),
+        current_cost=round(float(np.nansum(current_cost)), 2),
+        total_cost=round(float(np.nansum(total_cost)), 2),
+        worst_voltage_drop_pct=round(float(sized_drop.max()), 4) if len(sized_drop) else 0.0,
+        evaluated_candidates=result.evaluated_candidates,
+        budget_steps=result.budget_steps,
+        runtime_ms=round(result.runtime_ms, 2),
+    )
+
+
+class NetworkCalculationService:
+    def __init__(self, db: AsyncSession):
+        self.projects = ProjectRepository(db)
+        self.network = NetworkRepository(db)
+
+    async def _project_exists(self, project_id: int) -> bool:
+        return await self.projects.get(project_id) is not None
+
+    async def load_network_data(self, project_id: int) -> ProjectNetworkData:
+        pole_rows = await self.network.pole_rows(project_id)
+        conductor_rows = await self.network.conductor_rows(project_id)
+        return ProjectNetworkData.from_rows(pole_rows, conductor_rows)
+
+    async def load_flow(self, project_id: int, params: LoadFlowRequest) -> LoadFlowResponse | None:
+        if not await self._project_exists(project_id):
+            return None
+        state = FEEDER_CACHE.get(project_id, params)
+        if state is None:
+            generation = FEEDER_CACHE.generation(project_id)
+            data = await self.load_network_data(project_id)
+            state = solve_feeder(data.radial_network(params.source_pole_id), data.feeder_edges(), params)
+            FEEDER_CACHE.put(project_id, state, generation)
+        return build_load_flow_response(state, project_id)
+
+    async def mechanical_stress(
+        self, project_id: int, request: ProjectMechanicalStressRequest
+    ) -> ProjectMechanicalStressResponse | None:
+        if not await self._project_exists(project_id):
+            return None
+        data = await self.load_network_data(project_id)
+        diameter, weight = CONDUCTOR_CATALOG.mechanical_arrays(data.conductor_types, data.cross_section)
+        run = partial(
+            calculate_project_mechanical_stress,
+            project_id,
+            request,
+            pole_ids=data.pole_ids,
+            latitude=data.latitude,
+            longitude=data.longitude,
+            pole_height=data.pole_height,
+            pole_class=data.pole_class,
+            edge_a=np.searchsorted(data.pole_ids, data.from_pole_ids),
+            edge_b=np.searchsorted(data.pole_ids, data.to_pole_ids),
+            span=data.length,
+            diameter_mm=diameter,
+            weight_kg_km=weight,
+            num_conductors=data.phases.astype(float),
+        )
+        return await CALCULATION_EXECUTOR.run(run, offload=should_offload(len(data.pole_ids)))
+
+    async def conductor_sizing(
+        self, project_id: int, request: ConductorSizingRequest
+    ) -> ConductorSizingResponse | None:
+        if not await self._project_exists(project_id):
+            return None
+        data = await self.load_network_data(project_id)
+        # Every step is CPU-bound on large feeders: keep the whole pipeline off the event loop
+        return await CALCULATION_EXECUTOR.run(size_project_conductors, project_id, data, request)
@@ -0,0 +1,154 @@
+"""Parametric sweeps — evaluate the Cartesian product of parameter ranges in one vectorized pass.
+
+A sweep takes a base request plus up to five axes (field + values). Every
+combination is materialised as flat NumPy columns (row-major: the last axis
+varies fastest) and fed to the same kernels used by the batch endpoints.
+Numeric axes are sorted ascending, so the first compliant combination in
+row-major order is the "smallest" compliant configuration.
+"""
+import numpy as np
+from pydantic import BaseModel, ValidationError
+from app.domains.calculations.conductor_catalog import CONDUCTOR_CATALOG
+from app.domains.calculations.mechanical_stress import _mechanical_stress_arrays
+from app.domains.calculations.schemas import (
+    SweepAxis,
+    VoltageDropSweepRequest, VoltageDropSweepResponse,
+    MechanicalStressSweepRequest, MechanicalStressSweepResponse,
+)
+from app.domains.calculations.voltage_drop import _VOLTAGE_LIMITS, _voltage_drop_arrays
+
+_MAX_COMBINATIONS = 1_000_000
+
+_VOLTAGE_DROP_FIELDS = {"current", "length", "cross_section", "power_factor", "nominal_voltage", "conductor_type"}
+_MECHANICAL_FIELDS = {
+    "wind_speed", "conductor_diameter", "span_length", "conductor_weight",
+    "conductor_tension", "attachment_height", "num_conductors",
+}
+_TEXT_FIELDS = {"conductor_type"}
+
+
+def _axis_values(base: BaseModel, field: str, values: list) -> list:
+    """Values coerced and checked against the base request's constraints for ``field``."""
+    data = base.model_dump()
+    checked = []
+    for value in dict.fromkeys(values):
+        try:
+            checked.append(getattr(type(base).model_validate({**data, field: value}), field))
+        except ValidationError as exc:
+            reason = next((e["msg"] for e in exc.errors() if e["loc"] == (field,)), "valor inválido")
+            raise ValueError(f"Valor {value!r} inválido para {field}: {reason}.") from None
+    return checked
+
+
+def _normalize_axes(axes: list[SweepAxis], allowed: set[str], base: BaseModel) -> list[SweepAxis]:
+    seen: set[str] = set()
+    normalized = []
+    for axis in axes:
+        if axis.field not in allowed:
+            raise ValueError(f"Campo não suportado na varredura: {axis.field}. Use: {', '.join(sorted(allowed))}.")
+        if axis.field in seen:
+            raise ValueError(f"Campo repetido na varredura: {axis.field}.")
+        seen.add(axis.field)
+        values = _axis_values(base, axis.field, axis.values)
+        if axis.field not in _TEXT_FIELDS:
+            values = sorted(dict.fromkeys(values))
+        normalized.append(SweepAxis(field=axis.field, values=values))
+    total = int(np.prod([len(a.values) for a in normalized]))
+    if total > _MAX_COMBINATIONS:
+        raise ValueError(f"Varredura com {total} combinações excede o máximo de {_MAX_COMBINATIONS}.")
+    return normalized
+
+
+def _grid_indices(axes: list[SweepAxis]) -> dict[str, np.ndarray]:
+    """Flat per-axis value indices for every combination (row-major)."""
+    shape = tuple(len(a.values) for a in axes)
+    grids = np.indices(shape).reshape(len(axes), -1)
+    return {axis.field: grid for axis, grid in zip(axes, grids)}
+
+
+def _columns(base: dict, axes: list[SweepAxis], fields: set[str], size: int) -> dict[str, np.ndarray]:
+    indices = _grid_indices(axes)
+    by_field = {a.field: a for a in axes}
+    columns = {}
+    for field in fields - _TEXT_FIELDS:
+        if field in by_field:
+            columns[field] = np.asarray(by_field[field].values, dtype=float)[indices[field]]
+        else:
+            columns[field] = np.full(size, float(base[field]))
+    columns["_indices"] = indices
+    return columns
+
+
+def _best(axes: list[SweepAxis], compliant: np.ndarray) -> tuple[int | None, dict | None]:
+    hits = np.flatnonzero(compliant)
+    if len(hits) == 0:
+        return None, None
+    flat = int(hits[0])
+    position = np.unravel_index(flat, tuple(len(a.values) for a in axes))
+    return flat, {a.field: a.values[int(i)] for a, i in zip(axes, position)}
+
+
+def sweep_voltage_drop(request: VoltageDropSweepRequest) -> VoltageDropSweepResponse:
+    axes = _normalize_axes(request.axes, _VOLTAGE_DROP_FIELDS, request.base)
+    shape = [len(a.values) for a in axes]
+    size = int(np.prod(shape))
+    base = request.base.model_dump()
+    cols = _columns(base, axes, _VOLTAGE_DROP_FIELDS, size)
+    if any((cols[f] <= 0).any() for f in ("current", "length", "cross_section", "nominal_voltage")):
+        raise ValueError("Corrente, comprimento, seção e tensão nominal devem ser positivos.")
+    if ((cols["power_factor"] < 0) | (cols["power_factor"] > 1)).any():
+        raise ValueError("Fator de potência deve estar entre 0 e 1.")
+
+    # Conductor impedances: interpolate once per conductor type on the section column
+    type_axis = next((a for a in axes if a.field == "conductor_type"), None)
+    type_values = type_axis.values if type_axis else [request.base.conductor_type]
+    type_index = cols["_indices"]["conductor_type"] if type_axis else np.zeros(size, dtype=int)
+    resistance = np.empty(size)
+    reactance = np.empty(size)
+    for k, ctype in enumerate(type_values):
+        mask = type_index == k
+        resistance[mask], reactance[mask] = CONDUCTOR_CATALOG.type_arrays(ctype, cols["cross_section"][mask])
+
+    _, pct = _voltage_drop_arrays(
+        cols["current"], cols["length"], resistance, reactance, cols["power_factor"],
+        np.full(size, request.base.phases), cols["nominal_voltage"],
+    )
+    limit = _VOLTAGE_LIMITS.get(request.base.voltage_level.upper(), 7.0)
+    compliant = pct <= limit
+    flat, best = _best(axes, compliant)
+    return VoltageDropSweepResponse(
+        axes=axes,
+        shape=shape,
+        evaluated=size,
+        voltage_drop_pct=np.round(pct, 4).tolist(),
+        compliant=compliant.tolist(),
+        limit_pct=limit,
+        best=best,
+        best_voltage_drop_pct=None if flat is None else round(float(pct[flat]), 4),
+    )
+
+
+def sweep_mechanical_stress(request: MechanicalStressSweepRequest) -> MechanicalStressSweepResponse:
+    axes = _normalize_axes(request.axes, _MECHANICAL_FIELDS, request.base)
+    shape = [len(a.values) for a in axes]
+    size = int(np.prod(shape))
+    cols = _columns(request.base.model_dump(), axes, _MECHANICAL_FIELDS, size)
+    if any((cols[f] <= 0).any() for f in _MECHANICAL_FIELDS):
+        raise ValueError("Todos os valores da varredura mecânica devem ser positivos.")
+
+    horizontal, resultant, moment = _mechanical_stress_arrays(
+        cols["wind_speed"], cols["conductor_diameter"], cols["span_length"], cols["conductor_weight"],
+        cols["conductor_tension"], cols["attachment_height"], cols["num_conductors"],
+    )
+    compliant = horizontal <= request.pole_nominal_load_n
+    flat, best = _best(axes, compliant)
+    return MechanicalStressSweepResponse(
+        axes=axes,
+        shape=shape,
+        evaluated=size,
+        total_resultant_n=np.round(resultant, 2).tolist(),
+        moment_nm=np.round(moment, 2).tolist(),
+        compliant=compliant.tolist(),
+        best=best,
+        best_total_resultant_n=None if flat is None else round(float(resultant[flat]), 2),
+    )
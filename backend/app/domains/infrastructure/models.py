@@ -1,6 +1,6 @@
 """Infrastructure domain DB models — Pole, Conductor, Equipment."""
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+from sqlalchemy import BigInteger, Column, Integer, String, Float, DateTime, ForeignKey, Index, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -16,13 +16,19 @@ def _point_col():
     """Return a geometry Point column, or String when PostGIS is unavailable."""
     try:
         from geoalchemy2 import Geometry
-        return Column(Geometry("POINT", srid=31983), nullable=True)
+        # GiST index declared explicitly in Pole.__table_args__
+        return Column(Geometry("POINT", srid=31983, spatial_index=False), nullable=True)
     except Exception:
         return Column(String, nullable=True)
 
 
 class Pole(Base):
     __tablename__ = "poles"
+    __table_args__ = (
+        UniqueConstraint("project_id", "osm_id", name="uq_poles_project_osm"),
+        Index("ix_poles_project_id_id", "project_id", "id"),  # keyset pages per project
+        Index("ix_poles_location", "location", postgresql_using="gist"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)
@@ -36,6 +42,7 @@ class Pole(Base):
     pole_class = Column(String(10), nullable=True)
     owner = Column(String(50), nullable=True)
     observations = Column(Text, nullable=True)
+    osm_id = Column(BigInteger, nullable=True)  # OSM node id when imported
     installed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
@@ -46,6 +53,10 @@ class Pole(Base):
 
 class Conductor(Base):
     __tablename__ = "conductors"
+    __table_args__ = (
+        UniqueConstraint("project_id", "osm_id", "osm_segment", name="uq_conductors_project_osm"),
+        Index("ix_conductors_project_id_id", "project_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)
@@ -57,6 +68,8 @@ class Conductor(Base):
     phases = Column(Integer, nullable=False, default=3)
     length = Column(Float, nullable=True)
     observations = Column(Text, nullable=True)
+    osm_id = Column(BigInteger, nullable=True)  # OSM way id when imported
+    osm_segment = Column(Integer, nullable=True)  # span index within the way
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     pole_from = relationship("Pole", foreign_keys=[pole_from_id], back_populates="conductors_from")
@@ -0,0 +1,117 @@
+"""Conversion of OSM power data into pole and conductor rows.
+
+Poles and towers become ``Pole`` rows keyed by their OSM node id. Each power
+line is split at the nodes that are imported poles: every span between two
+consecutive poles becomes one ``Conductor`` keyed by (way id, span index),
+with its length measured on the WGS84 ellipsoid along the way's geometry.
+Stretches before the first or after the last pole of a way have no pole at
+one end and are skipped.
+"""
+from dataclasses import dataclass, field
+import re
+import numpy as np
+from pyproj import Geod
+from app.domains.mapping.schemas import OSMNode, OSMResponse, OSMWay
+
+_GEOD = Geod(ellps="WGS84")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_MT_MIN_VOLTS = 1000.0
+
+_POLE_MATERIALS = {
+    "concrete": "concreto",
+    "reinforced_concrete": "concreto",
+    "wood": "madeira",
+    "steel": "aço",
+    "metal": "aço",
+}
+
+
+@dataclass
+class ConductorSpan:
+    osm_id: int
+    osm_segment: int
+    node_from: int
+    node_to: int
+    length: float | None
+    voltage_level: str
+
+
+@dataclass
+class OSMImportPlan:
+    poles: list[dict] = field(default_factory=list)
+    spans: list[ConductorSpan] = field(default_factory=list)
+    skipped_stretches: int = 0
+
+
+def _tag_number(value) -> float | None:
+    match = _NUMBER.search(str(value)) if value is not None else None
+    return float(match.group()) if match else None
+
+
+def _pole_row(node: OSMNode, project_id: int, default_type: str) -> dict:
+    tags = node.tags or {}
+    ref = str(tags.get("ref") or "").strip()
+    operator = str(tags.get("operator") or "").strip()
+    return {
+        "project_id": project_id,
+        "osm_id": node.osm_id,
+        "code": (ref or f"OSM-{node.osm_id}")[:50],
+        "latitude": node.lat,
+        "longitude": node.lon,
+        "pole_type": _POLE_MATERIALS.get(str(tags.get("material", "")).lower(), default_type),
+        "pole_height": _tag_number(tags.get("height")),
+        "owner": operator[:50] or None,
+    }
+
+
+def voltage_level(tags: dict, default: str) -> str:
+    """BT/MT from the ``voltage`` tag (highest circuit wins); ``default`` when untagged."""
+    volts = [float(v) for v in _NUMBER.findall(str(tags.get("voltage", "")))]
+    if not volts:
+        return default
+    return "MT" if max(volts) >= _MT_MIN_VOLTS else "BT"
+
+
+def _way_lengths(ways: list[OSMWay]) -> list[np.ndarray | None]:
+    """Cumulative geodesic distance (m) at each vertex, one ellipsoid call for all ways."""
+    usable = [w for w in ways if len(w.geometry) == len(w.nodes) and len(w.nodes) >= 2]
+    if not usable:
+        return [None] * len(ways)
+    lat = np.concatenate([[p["lat"] for p in w.geometry] for w in usable])
+    lon = np.concatenate([[p["lon"] for p in w.geometry] for w in usable])
+    _, _, dist = _GEOD.inv(lon[:-1], lat[:-1], lon[1:], lat[1:])
+    dist = np.atleast_1d(dist)
+    cumulative: dict[int, np.ndarray] = {}
+    start = 0
+    for way in usable:
+        n = len(way.nodes)
+        # Pairs straddling two ways are sliced away
+        cumulative[id(way)] = np.concatenate([[0.0], np.cumsum(dist[start:start + n - 1])])
+        start += n
+    return [cumulative.get(id(w)) for w in ways]
+
+
+def plan_osm_import(osm: OSMResponse, project_id: int, default_voltage_level: str = "BT") -> OSMImportPlan:
+    """Pole rows and conductor spans for ``osm``; duplicate node ids are kept once."""
+    plan = OSMImportPlan()
+    pole_ids: set[int] = set()
+    for nodes, default_type in ((osm.poles, "concreto"), (osm.towers, "aço")):
+        for node in nodes:
+            if node.osm_id not in pole_ids:
+                pole_ids.add(node.osm_id)
+                plan.poles.append(_pole_row(node, project_id, default_type))
+
+    ways = list({w.osm_id: w for w in osm.power_lines}.values())
+    for way, cumulative in zip(ways, _way_lengths(ways)):
+        level = voltage_level(way.tags or {}, default_voltage_level)
+        at_poles = [i for i, node in enumerate(way.nodes) if node in pole_ids]
+        if not at_poles:
+            plan.skipped_stretches += 1
+            continue
+        plan.skipped_stretches += (at_poles[0] > 0) + (at_poles[-1] < len(way.nodes) - 1)
+        for segment, (a, b) in enumerate(zip(at_poles, at_poles[1:])):
+            if way.nodes[a] == way.nodes[b]:
+                continue  # closed ring back to the same pole
+            length = round(float(cumulative[b] - cumulative[a]), 2) if cumulative is not None else None
+            plan.spans.append(ConductorSpan(way.osm_id, segment, way.nodes[a], way.nodes[b], length, level))
+    return plan
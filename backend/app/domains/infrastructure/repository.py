@@ -1,19 +1,88 @@
 """Infrastructure domain repository."""
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.domains.infrastructure.models import Pole, Conductor
+from sqlalchemy import delete, func, insert, select, update
+from app.core.database import upsert_insert
+from app.domains.infrastructure.models import Pole, Conductor, Equipment
 
+# Rows per multi-VALUES statement, well under the bind-parameter limits
+_UPSERT_CHUNK = 500
+
+
+class _BulkRepository:
+    """Set-based (Core) reads and writes shared by the pole and conductor repositories."""
+
+    model = None
 
-class PoleRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def list(self, project_id: int | None = None) -> list[Pole]:
-        q = select(Pole)
+    async def project_ids(self, ids: list[int]) -> dict[int, int | None]:
+        """``{id: project_id}`` for the ids that exist."""
+        q = select(self.model.id, self.model.project_id).where(self.model.id.in_(ids))
+        return dict((await self.db.execute(q)).tuples().all())
+
+    async def page(
+        self, columns: list[str], project_id: int | None, after_id: int | None, limit: int, where=()
+    ) -> list[dict]:
+        """Keyset page ordered by id: up to ``limit`` rows with ``id > after_id``, as plain dicts."""
+        q = select(*(getattr(self.model, name) for name in columns)).where(*where)
+        if project_id is not None:
+            q = q.where(self.model.project_id == project_id)
+        if after_id is not None:
+            q = q.where(self.model.id > after_id)
+        q = q.order_by(self.model.id).limit(limit)
+        return [dict(row) for row in (await self.db.execute(q)).mappings()]
+
+    async def values(self, ids: list[int], *columns: str):
+        """(id, project_id, *columns) rows for ``ids`` — the state before a bulk change."""
+        q = select(self.model.id, self.model.project_id, *(getattr(self.model, c) for c in columns))
+        return (await self.db.execute(q.where(self.model.id.in_(ids)))).all()
+
+    async def bulk_create(self, rows: list[dict]) -> list[int]:
+        """INSERT ... RETURNING id batched by the driver; ids follow the order of ``rows``."""
+        stmt = insert(self.model).returning(self.model.id, sort_by_parameter_order=True)
+        return list((await self.db.execute(stmt, rows)).scalars().all())
+
+    async def bulk_update(self, rows: list[dict]) -> None:
+        """UPDATE by primary key; each row carries ``id`` plus the columns to change."""
+        await self.db.execute(update(self.model), rows)
+
+    async def bulk_delete(self, ids: list[int]) -> None:
+        await self.db.execute(delete(self.model).where(self.model.id.in_(ids)))
+
+
+class PoleRepository(_BulkRepository):
+    model = Pole
+
+    # Declared before list(), which shadows the builtin in annotations below
+    async def coordinates(self, project_id: int | None = None, ids=None, missing_location: bool = False):
+        """(id, latitude, longitude) rows of located poles, by project or by id."""
+        q = select(Pole.id, Pole.latitude, Pole.longitude).where(
+            Pole.latitude.is_not(None), Pole.longitude.is_not(None)
+        )
+        if missing_location:
+            q = q.where(Pole.location.is_(None))
         if project_id is not None:
             q = q.where(Pole.project_id == project_id)
-        result = await self.db.execute(q)
-        return list(result.scalars().all())
+        if ids is not None:
+            q = q.where(Pole.id.in_(ids))
+        return (await self.db.execute(q)).all()
+
+    async def fill_locations(self, location, project_id: int | None = None) -> int:
+        """Set ``location`` on poles that have coordinates but none yet, in one UPDATE."""
+        q = update(Pole).where(Pole.location.is_(None), Pole.latitude.is_not(None), Pole.longitude.is_not(None))
+        if project_id is not None:
+            q = q.where(Pole.project_id == project_id)
+        return (await self.db.execute(q.values(location=location))).rowcount
+
+    async def with_equipment(self, ids: list[int]) -> list[int]:
+        q = select(Equipment.pole_id).where(Equipment.pole_id.in_(ids)).distinct()
+        return sorted((await self.db.execute(q)).scalars().all())
+
+    async def detach_conductors(self, ids: list[int]) -> None:
+        """Null the pole references of conductors attached to poles about to be removed."""
+        for column in (Conductor.pole_from_id, Conductor.pole_to_id):
+            await self.db.execute(update(Conductor).where(column.in_(ids)).values({column.key: None}))
 
     async def get(self, pole_id: int) -> Pole | None:
         result = await self.db.execute(select(Pole).where(Pole.id == pole_id))
@@ -30,16 +99,8 @@ class PoleRepository:
         await self.db.flush()
 
 
-class ConductorRepository:
-    def __init__(self, db: AsyncSession):
-        self.db = db
-
-    async def list(self, project_id: int | None = None) -> list[Conductor]:
-        q = select(Conductor)
-        if project_id is not None:
-            q = q.where(Conductor.project_id == project_id)
-        result = await self.db.execute(q)
-        return list(result.scalars().all())
+class ConductorRepository(_BulkRepository):
+    model = Conductor
 
     async def get(self, conductor_id: int) -> Conductor | None:
         result = await self.db.execute(select(Conductor).where(Conductor.id == conductor_id))
@@ -54,3 +115,115 @@ class ConductorRepository:
     async def delete(self, conductor: Conductor) -> None:
         await self.db.delete(conductor)
         await self.db.flush()
+
+
+class NetworkRepository:
+    """Set-based, column-only reads of a project's network (no ORM hydration)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def pole_rows(self, project_id: int):
+        q = (
+            select(
+                Pole.id, Pole.code, Pole.latitude, Pole.longitude, Pole.elevation,
+                Pole.pole_type, Pole.pole_height, Pole.pole_class,
+            )
+            .where(Pole.project_id == project_id)
+            .order_by(Pole.id)
+        )
+        return (await self.db.execute(q)).all()
+
+    async def conductor_rows(self, project_id: int):
+        q = (
+            select(
+                Conductor.id, Conductor.pole_from_id, Conductor.pole_to_id,
+                Conductor.conductor_type, Conductor.cross_section, Conductor.voltage_level,
+                Conductor.phases, Conductor.length,
+            )
+            .where(Conductor.project_id == project_id)
+            .order_by(Conductor.id)
+        )
+        return (await self.db.execute(q)).all()
+
+    async def pole_groups(self, project_id: int):
+        """(pole_type, pole_height, pole_class, count) aggregated in SQL."""
+        keys = (Pole.pole_type, Pole.pole_height, Pole.pole_class)
+        q = select(*keys, func.count()).where(Pole.project_id == project_id).group_by(*keys).order_by(*keys)
+        return (await self.db.execute(q)).all()
+
+    async def conductor_groups(self, project_id: int):
+        """(conductor_type, cross_section, cable metres = Σ length × phases) aggregated in SQL."""
+        keys = (Conductor.conductor_type, Conductor.cross_section)
+        cable = func.coalesce(func.sum(func.coalesce(Conductor.length, 0.0) * Conductor.phases), 0.0)
+        q = select(*keys, cable).where(Conductor.project_id == project_id).group_by(*keys).order_by(*keys)
+        return (await self.db.execute(q)).all()
+
+    async def equipment_groups(self, project_id: int):
+        q = (
+            select(Equipment.equipment_type, func.count())
+            .join(Pole, Pole.id == Equipment.pole_id)
+            .where(Pole.project_id == project_id)
+            .group_by(Equipment.equipment_type)
+            .order_by(Equipment.equipment_type)
+        )
+        return (await self.db.execute(q)).all()
+
+    async def equipment_rows(self, project_id: int):
+        q = (
+            select(
+                Equipment.id, Equipment.pole_id, Equipment.equipment_type,
+                Equipment.manufacturer, Equipment.model,
+            )
+            .join(Pole, Pole.id == Equipment.pole_id)
+            .where(Pole.project_id == project_id)
+            .order_by(Equipment.id)
+        )
+        return (await self.db.execute(q)).all()
+
+
+class OSMImportRepository:
+    """Bulk upserts of OSM-derived rows keyed by (project_id, osm_id[, osm_segment])."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def existing_pole_osm_ids(self, project_id: int) -> set[int]:
+        q = select(Pole.osm_id).where(Pole.project_id == project_id, Pole.osm_id.is_not(None))
+        return set((await self.db.execute(q)).scalars().all())
+
+    async def existing_conductor_keys(self, project_id: int) -> set[tuple[int, int]]:
+        q = select(Conductor.osm_id, Conductor.osm_segment).where(
+            Conductor.project_id == project_id, Conductor.osm_id.is_not(None)
+        )
+        return {tuple(row) for row in (await self.db.execute(q)).all()}
+
+    async def upsert_poles(self, rows: list[dict]) -> dict[int, int]:
+        """Insert or move poles; returns ``{osm_id: pole id}``. Edited attributes are kept."""
+        ids: dict[int, int] = {}
+        for start in range(0, len(rows), _UPSERT_CHUNK):
+            stmt = upsert_insert(self.db, Pole).values(rows[start:start + _UPSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Pole.project_id, Pole.osm_id],
+                set_={
+                    "latitude": stmt.excluded.latitude,
+                    "longitude": stmt.excluded.longitude,
+                    "location": stmt.excluded.location,
+                },
+            ).returning(Pole.osm_id, Pole.id)
+            ids.update((await self.db.execute(stmt)).tuples().all())
+        return ids
+
+    async def upsert_conductors(self, rows: list[dict]) -> None:
+        """Insert spans or refresh their topology and length; electrical attributes are kept."""
+        for start in range(0, len(rows), _UPSERT_CHUNK):
+            stmt = upsert_insert(self.db, Conductor).values(rows[start:start + _UPSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Conductor.project_id, Conductor.osm_id, Conductor.osm_segment],
+                set_={
+                    "pole_from_id": stmt.excluded.pole_from_id,
+                    "pole_to_id": stmt.excluded.pole_to_id,
+                    "length": stmt.excluded.length,
+                },
+            )
+            await self.db.execute(stmt)
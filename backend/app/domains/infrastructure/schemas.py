@@ -1,7 +1,16 @@
 """Infrastructure domain Pydantic schemas."""
 from datetime import datetime
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Literal, Optional
+from app.domains.mapping.schemas import OSMResponse
+
+_MAX_BULK_ITEMS = 10_000
+
+
+def _check_unique_ids(ids: list[int]) -> list[int]:
+    if len(set(ids)) != len(ids):
+        raise ValueError("A lista contém ids repetidos.")
+    return ids
 
 
 class PoleBase(BaseModel):
@@ -35,11 +44,30 @@ class PoleUpdate(BaseModel):
 
 class PoleResponse(PoleBase):
     id: int
+    osm_id: Optional[int] = None
     created_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
 
 
+class PoleListItem(BaseModel):
+    """Row of the pole listing: only ``id`` and the fields asked for in ``fields=``."""
+
+    id: int
+    code: Optional[str] = None
+    project_id: Optional[int] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    elevation: Optional[float] = None
+    pole_type: Optional[str] = None
+    pole_height: Optional[float] = None
+    pole_class: Optional[str] = None
+    owner: Optional[str] = None
+    observations: Optional[str] = None
+    osm_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
 class ConductorBase(BaseModel):
     project_id: Optional[int] = None
     pole_from_id: Optional[int] = None
@@ -67,6 +95,100 @@ class ConductorUpdate(BaseModel):
 
 class ConductorResponse(ConductorBase):
     id: int
+    osm_id: Optional[int] = None
+    osm_segment: Optional[int] = None
     created_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
+
+
+class ConductorListItem(BaseModel):
+    """Row of the conductor listing: only ``id`` and the fields asked for in ``fields=``."""
+
+    id: int
+    project_id: Optional[int] = None
+    pole_from_id: Optional[int] = None
+    pole_to_id: Optional[int] = None
+    conductor_type: Optional[str] = None
+    cross_section: Optional[float] = None
+    voltage_level: Optional[str] = None
+    phases: Optional[int] = None
+    length: Optional[float] = None
+    observations: Optional[str] = None
+    osm_id: Optional[int] = None
+    osm_segment: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
+# ── Bulk operations ─────────────────────────────────────────────────────────
+
+class PoleBulkCreate(BaseModel):
+    items: list[PoleCreate] = Field(..., min_length=1, max_length=_MAX_BULK_ITEMS)
+
+
+class PoleBulkUpdateItem(PoleUpdate):
+    id: int
+
+
+class PoleBulkUpdate(BaseModel):
+    items: list[PoleBulkUpdateItem] = Field(..., min_length=1, max_length=_MAX_BULK_ITEMS)
+
+    @field_validator("items")
+    @classmethod
+    def _unique(cls, items):
+        _check_unique_ids([item.id for item in items])
+        return items
+
+
+class ConductorBulkCreate(BaseModel):
+    items: list[ConductorCreate] = Field(..., min_length=1, max_length=_MAX_BULK_ITEMS)
+
+
+class ConductorBulkUpdateItem(ConductorUpdate):
+    id: int
+
+
+class ConductorBulkUpdate(BaseModel):
+    items: list[ConductorBulkUpdateItem] = Field(..., min_length=1, max_length=_MAX_BULK_ITEMS)
+
+    @field_validator("items")
+    @classmethod
+    def _unique(cls, items):
+        _check_unique_ids([item.id for item in items])
+        return items
+
+
+class BulkDeleteRequest(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=_MAX_BULK_ITEMS)
+
+    @field_validator("ids")
+    @classmethod
+    def _unique(cls, ids):
+        return _check_unique_ids(ids)
+
+
+class BulkWriteResponse(BaseModel):
+    ids: list[int] = Field(..., description="Ids afetados, na ordem do envio")
+    count: int
+
+
+class LocationBackfillResponse(BaseModel):
+    updated: int = Field(..., description="Postes que receberam location")
+
+
+class OSMImportRequest(BaseModel):
+    project_id: int
+    osm: OSMResponse = Field(..., description="Resultado de /mapping/osm ou de uma importação por área")
+    conductor_type: str = Field("CA", description="Tipo dos condutores criados: CA, CAA, ACSR")
+    cross_section: float = Field(35.0, gt=0, description="Seção dos condutores criados em mm²")
+    voltage_level: Literal["BT", "MT"] = Field("BT", description="Nível de tensão das linhas sem tag voltage")
+    phases: int = Field(3, ge=1, le=3)
+
+
+class OSMImportResponse(BaseModel):
+    project_id: int
+    poles_created: int
+    poles_updated: int
+    conductors_created: int
+    conductors_updated: int
+    skipped_stretches: int = Field(..., description="Trechos de linha sem poste em uma das pontas")
@@ -1,23 +1,130 @@
 """Infrastructure domain service."""
+from collections import Counter
+from functools import partial
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.domains.infrastructure.repository import PoleRepository, ConductorRepository
+from app.core.config import get_settings
+from app.core.database import on_commit
+from app.domains.calculations.feeder_cache import FEEDER_CACHE
+from app.domains.infrastructure.osm_import import plan_osm_import
+from app.domains.infrastructure.spatial import POLE_GRIDS, GridIndex, SpatialFilter, location_ewkt, location_sql
+from app.domains.infrastructure.repository import PoleRepository, ConductorRepository, OSMImportRepository
 from app.domains.infrastructure.models import Pole, Conductor
 from app.domains.infrastructure.schemas import (
     PoleCreate, PoleUpdate, PoleResponse,
     ConductorCreate, ConductorUpdate, ConductorResponse,
+    OSMImportRequest, OSMImportResponse, LocationBackfillResponse,
+    PoleBulkCreate, PoleBulkUpdate, ConductorBulkCreate, ConductorBulkUpdate,
+    BulkDeleteRequest, BulkWriteResponse,
 )
+from app.domains.projects.repository import ProjectRepository, ProjectStatsRepository
+
+settings = get_settings()
+
+# Columns a listing may project; ``id`` is always returned (it is the cursor)
+_POLE_FIELDS = tuple(PoleResponse.model_fields)
+_CONDUCTOR_FIELDS = tuple(ConductorResponse.model_fields)
+
+
+class MissingRowsError(LookupError):
+    """Raised by bulk operations when some of the requested ids do not exist."""
+
+    def __init__(self, ids: list[int]):
+        super().__init__(ids)
+        self.ids = ids
+
+
+def _invalidate(db: AsyncSession, project_ids, poles: bool = False) -> None:
+    """Drop the projects' cached feeders (and pole grids) once ``db`` commits."""
+    project_ids = set(project_ids)
+
+    def drop() -> None:
+        for project_id in project_ids:
+            FEEDER_CACHE.invalidate(project_id)
+            if poles:
+                POLE_GRIDS.invalidate(project_id)
+
+    on_commit(db, drop)
+
+
+def _pole_stats(rows, sign: int, deltas: Counter | None = None) -> Counter:
+    """project_stats deltas for (project_id, pole_type) rows added (+1) or removed (-1)."""
+    deltas = Counter() if deltas is None else deltas
+    for project_id, pole_type in rows:
+        deltas[(project_id, "poles", pole_type)] += sign
+    return deltas
+
+
+def _conductor_stats(rows, sign: int, deltas: Counter | None = None) -> Counter:
+    """Same for (project_id, voltage_level, length) conductor rows."""
+    deltas = Counter() if deltas is None else deltas
+    for project_id, voltage_level, length in rows:
+        deltas[(project_id, "conductors", voltage_level)] += sign
+        deltas[(project_id, "conductor_m", voltage_level)] += sign * (length or 0.0)
+    return deltas
+
+
+def _with_location(rows: list[dict]) -> list[dict]:
+    """Fill ``location`` from latitude/longitude for rows about to be inserted."""
+    locations = location_ewkt([r.get("latitude") for r in rows], [r.get("longitude") for r in rows])
+    for row, location in zip(rows, locations):
+        row["location"] = location
+    return rows
+
+
+def _projection(fields: str | None, allowed: tuple[str, ...]) -> list[str]:
+    if not fields:
+        return list(allowed)
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"Campos desconhecidos: {', '.join(unknown)}. Disponíveis: {', '.join(allowed)}")
+    return ["id", *dict.fromkeys(name for name in names if name != "id")]
+
+
+async def _page(repo, allowed, project_id, after_id, limit, fields, where=()) -> tuple[list[dict], int | None]:
+    """One keyset page plus the cursor of the next one (None on the last page)."""
+    limit = min(limit or settings.list_page_size, settings.list_max_page_size)
+    rows = await repo.page(_projection(fields, allowed), project_id, after_id, limit + 1, where)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, rows[-1]["id"]
 
 
 class InfrastructureService:
     def __init__(self, db: AsyncSession):
+        self.db = db
         self.poles = PoleRepository(db)
         self.conductors = ConductorRepository(db)
+        self.osm = OSMImportRepository(db)
+        self.projects = ProjectRepository(db)
+        self.stats = ProjectStatsRepository(db)
 
     # ── Poles ──────────────────────────────────────────────────────────────
 
-    async def list_poles(self, project_id: int | None = None) -> list[PoleResponse]:
-        poles = await self.poles.list(project_id)
-        return [PoleResponse.model_validate(p) for p in poles]
+    async def page_poles(
+        self, project_id: int | None = None, after_id: int | None = None,
+        limit: int | None = None, fields: str | None = None, spatial: SpatialFilter | None = None,
+    ) -> tuple[list[dict], int | None]:
+        """Poles as plain dicts (no ORM objects), ``limit`` at a time in id order."""
+        where = []
+        if spatial is not None and self.poles.db.get_bind().dialect.name == "postgresql":
+            where.append(spatial.sql(Pole))
+        elif spatial is not None:
+            ids = np.sort(spatial.search(await self._pole_grid(project_id)))
+            if after_id is not None:
+                ids = ids[ids > after_id]
+            where.append(Pole.id.in_(ids[:settings.list_max_page_size + 1].tolist()))
+        return await _page(self.poles, _POLE_FIELDS, project_id, after_id, limit, fields, where)
+
+    async def _pole_grid(self, project_id: int | None) -> GridIndex:
+        grid = POLE_GRIDS.get(project_id)
+        if grid is None:
+            rows = await self.poles.coordinates(project_id)
+            grid = GridIndex(*(np.array(col) for col in zip(*rows))) if rows else GridIndex([], [], [])
+            POLE_GRIDS.put(project_id, grid)
+        return grid
 
     async def get_pole(self, pole_id: int) -> PoleResponse | None:
         pole = await self.poles.get(pole_id)
@@ -26,18 +133,29 @@ class InfrastructureService:
         return PoleResponse.model_validate(pole)
 
     async def create_pole(self, payload: PoleCreate) -> PoleResponse:
-        pole = Pole(**payload.model_dump())
+        pole = Pole(**_with_location([payload.model_dump()])[0])
         pole = await self.poles.create(pole)
+        await self.stats.apply(_pole_stats([(pole.project_id, pole.pole_type)], +1))
+        _invalidate(self.db, [pole.project_id], poles=True)
         return PoleResponse.model_validate(pole)
 
     async def update_pole(self, pole_id: int, payload: PoleUpdate) -> PoleResponse | None:
         pole = await self.poles.get(pole_id)
         if pole is None:
             return None
-        for field, value in payload.model_dump(exclude_unset=True).items():
+        changes = payload.model_dump(exclude_unset=True)
+        old_type = pole.pole_type
+        for field, value in changes.items():
             setattr(pole, field, value)
+        if pole.pole_type != old_type:
+            await self.stats.apply(
+                _pole_stats([(pole.project_id, old_type)], -1, _pole_stats([(pole.project_id, pole.pole_type)], +1))
+            )
+        if "latitude" in changes or "longitude" in changes:
+            pole.location = location_ewkt([pole.latitude], [pole.longitude])[0]
         await self.poles.db.flush()
         await self.poles.db.refresh(pole)
+        _invalidate(self.db, [pole.project_id], poles=True)
         return PoleResponse.model_validate(pole)
 
     async def delete_pole(self, pole_id: int) -> bool:
@@ -45,13 +163,17 @@ class InfrastructureService:
         if pole is None:
             return False
         await self.poles.delete(pole)
+        await self.stats.apply(_pole_stats([(pole.project_id, pole.pole_type)], -1))
+        _invalidate(self.db, [pole.project_id], poles=True)
         return True
 
     # ── Conductors ──────────────────────────────────────────────────────────
 
-    async def list_conductors(self, project_id: int | None = None) -> list[ConductorResponse]:
-        conductors = await self.conductors.list(project_id)
-        return [ConductorResponse.model_validate(c) for c in conductors]
+    async def page_conductors(
+        self, project_id: int | None = None, after_id: int | None = None,
+        limit: int | None = None, fields: str | None = None,
+    ) -> tuple[list[dict], int | None]:
+        return await _page(self.conductors, _CONDUCTOR_FIELDS, project_id, after_id, limit, fields)
 
     async def get_conductor(self, conductor_id: int) -> ConductorResponse | None:
         conductor = await self.conductors.get(conductor_id)
@@ -62,16 +184,28 @@ class InfrastructureService:
     async def create_conductor(self, payload: ConductorCreate) -> ConductorResponse:
         conductor = Conductor(**payload.model_dump())
         conductor = await self.conductors.create(conductor)
+        await self.stats.apply(
+            _conductor_stats([(conductor.project_id, conductor.voltage_level, conductor.length)], +1)
+        )
+        _invalidate(self.db, [conductor.project_id])
         return ConductorResponse.model_validate(conductor)
 
     async def update_conductor(self, conductor_id: int, payload: ConductorUpdate) -> ConductorResponse | None:
         conductor = await self.conductors.get(conductor_id)
         if conductor is None:
             return None
-        for field, value in payload.model_dump(exclude_unset=True).items():
+        changes = payload.model_dump(exclude_unset=True)
+        before = (conductor.project_id, conductor.voltage_level, conductor.length)
+        for field, value in changes.items():
             setattr(conductor, field, value)
+        after = (conductor.project_id, conductor.voltage_level, conductor.length)
+        if after != before:
+            await self.stats.apply(_conductor_stats([before], -1, _conductor_stats([after], +1)))
         await self.conductors.db.flush()
         await self.conductors.db.refresh(conductor)
+        if "conductor_type" in changes or "cross_section" in changes:
+            changes.update(conductor_type=conductor.conductor_type, cross_section=conductor.cross_section)
+        on_commit(self.db, partial(FEEDER_CACHE.apply_conductor_update, conductor.project_id, conductor.id, changes))
         return ConductorResponse.model_validate(conductor)
 
     async def delete_conductor(self, conductor_id: int) -> bool:
@@ -79,4 +213,152 @@ class InfrastructureService:
         if conductor is None:
             return False
         await self.conductors.delete(conductor)
+        await self.stats.apply(
+            _conductor_stats([(conductor.project_id, conductor.voltage_level, conductor.length)], -1)
+        )
+        _invalidate(self.db, [conductor.project_id])
         return True
+
+    # ── Bulk ────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    async def _existing(repo, ids: list[int]) -> dict[int, int | None]:
+        found = await repo.project_ids(ids)
+        missing = [i for i in ids if i not in found]
+        if missing:
+            raise MissingRowsError(missing)
+        return found
+
+    async def _check_pole_refs(self, rows: list[dict]) -> None:
+        refs = {row[key] for row in rows for key in ("pole_from_id", "pole_to_id") if row.get(key) is not None}
+        if refs:
+            missing = refs - set(await self.poles.project_ids(list(refs)))
+            if missing:
+                raise ValueError(f"Postes inexistentes referenciados: {sorted(missing)[:20]}")
+
+    async def bulk_create_poles(self, payload: PoleBulkCreate) -> BulkWriteResponse:
+        rows = _with_location([item.model_dump() for item in payload.items])
+        ids = await self.poles.bulk_create(rows)
+        await self.stats.apply(_pole_stats(((row["project_id"], row["pole_type"]) for row in rows), +1))
+        _invalidate(self.db, (row["project_id"] for row in rows), poles=True)
+        return BulkWriteResponse(ids=ids, count=len(ids))
+
+    async def bulk_update_poles(self, payload: PoleBulkUpdate) -> BulkWriteResponse:
+        ids = [item.id for item in payload.items]
+        found = await self._existing(self.poles, ids)
+        rows = [item.model_dump(exclude_unset=True) for item in payload.items]
+        retyped = {row["id"]: row["pole_type"] for row in rows if "pole_type" in row}
+        if retyped:
+            before = await self.poles.values(list(retyped), "pole_type")
+            deltas = _pole_stats(((project_id, pole_type) for _, project_id, pole_type in before), -1)
+            await self.stats.apply(_pole_stats(((project_id, retyped[i]) for i, project_id, _ in before), +1, deltas))
+        await self.poles.bulk_update(rows)
+        moved = [row["id"] for row in rows if "latitude" in row or "longitude" in row]
+        if moved:
+            # Partial coordinate edits need the stored other half; read back after the update
+            located = {pole_id: (lat, lon) for pole_id, lat, lon in await self.poles.coordinates(ids=moved)}
+            lat = [located.get(pole_id, (None, None))[0] for pole_id in moved]
+            lon = [located.get(pole_id, (None, None))[1] for pole_id in moved]
+            await self.poles.bulk_update(
+                [{"id": pole_id, "location": loc} for pole_id, loc in zip(moved, location_ewkt(lat, lon))]
+            )
+        _invalidate(self.db, found.values(), poles=True)
+        return BulkWriteResponse(ids=ids, count=len(ids))
+
+    async def bulk_delete_poles(self, payload: BulkDeleteRequest) -> BulkWriteResponse:
+        found = await self._existing(self.poles, payload.ids)
+        with_equipment = await self.poles.with_equipment(payload.ids)
+        if with_equipment:
+            raise ValueError(f"Postes com equipamentos instalados: {with_equipment[:20]}")
+        before = await self.poles.values(payload.ids, "pole_type")
+        await self.stats.apply(_pole_stats(((project_id, pole_type) for _, project_id, pole_type in before), -1))
+        await self.poles.detach_conductors(payload.ids)
+        await self.poles.bulk_delete(payload.ids)
+        _invalidate(self.db, found.values(), poles=True)
+        return BulkWriteResponse(ids=payload.ids, count=len(payload.ids))
+
+    async def backfill_locations(self, project_id: int | None = None) -> LocationBackfillResponse:
+        """Fill ``location`` on poles stored before it existed; PostGIS filters skip NULL locations."""
+        if self.poles.db.get_bind().dialect.name == "postgresql":
+            return LocationBackfillResponse(updated=await self.poles.fill_locations(location_sql(Pole), project_id))
+        rows = await self.poles.coordinates(project_id, missing_location=True)
+        if rows:
+            locations = location_ewkt([lat for _, lat, _ in rows], [lon for _, _, lon in rows])
+            await self.poles.bulk_update([{"id": i, "location": loc} for (i, _, _), loc in zip(rows, locations)])
+        return LocationBackfillResponse(updated=len(rows))
+
+    async def bulk_create_conductors(self, payload: ConductorBulkCreate) -> BulkWriteResponse:
+        rows = [item.model_dump() for item in payload.items]
+        await self._check_pole_refs(rows)
+        ids = await self.conductors.bulk_create(rows)
+        await self.stats.apply(
+            _conductor_stats(((row["project_id"], row["voltage_level"], row["length"]) for row in rows), +1)
+        )
+        _invalidate(self.db, (row["project_id"] for row in rows))
+        return BulkWriteResponse(ids=ids, count=len(ids))
+
+    async def bulk_update_conductors(self, payload: ConductorBulkUpdate) -> BulkWriteResponse:
+        ids = [item.id for item in payload.items]
+        found = await self._existing(self.conductors, ids)
+        rows = [item.model_dump(exclude_unset=True) for item in payload.items]
+        resized = {row["id"]: row for row in rows if "voltage_level" in row or "length" in row}
+        if resized:
+            before = await self.conductors.values(list(resized), "voltage_level", "length")
+            after = [
+                (project_id, resized[i].get("voltage_level", level), resized[i].get("length", length))
+                for i, project_id, level, length in before
+            ]
+            deltas = _conductor_stats((row[1:] for row in before), -1)
+            await self.stats.apply(_conductor_stats(after, +1, deltas))
+        await self.conductors.bulk_update(rows)
+        _invalidate(self.db, found.values())
+        return BulkWriteResponse(ids=ids, count=len(ids))
+
+    async def bulk_delete_conductors(self, payload: BulkDeleteRequest) -> BulkWriteResponse:
+        found = await self._existing(self.conductors, payload.ids)
+        before = await self.conductors.values(payload.ids, "voltage_level", "length")
+        await self.stats.apply(_conductor_stats((row[1:] for row in before), -1))
+        await self.conductors.bulk_delete(payload.ids)
+        _invalidate(self.db, found.values())
+        return BulkWriteResponse(ids=payload.ids, count=len(payload.ids))
+
+    # ── OSM import ─────────────────────────────────────────────────────────
+
+    async def import_osm(self, payload: OSMImportRequest) -> OSMImportResponse | None:
+        """Upsert OSM poles and line spans into a project; None when the project does not exist."""
+        if await self.projects.get(payload.project_id) is None:
+            return None
+        plan = plan_osm_import(payload.osm, payload.project_id, payload.voltage_level)
+        known_poles = await self.osm.existing_pole_osm_ids(payload.project_id)
+        known_spans = await self.osm.existing_conductor_keys(payload.project_id)
+
+        pole_ids = await self.osm.upsert_poles(_with_location(plan.poles))
+        conductor_rows = [
+            {
+                "project_id": payload.project_id,
+                "osm_id": span.osm_id,
+                "osm_segment": span.osm_segment,
+                "pole_from_id": pole_ids[span.node_from],
+                "pole_to_id": pole_ids[span.node_to],
+                "conductor_type": payload.conductor_type,
+                "cross_section": payload.cross_section,
+                "voltage_level": span.voltage_level,
+                "phases": payload.phases,
+                "length": span.length,
+            }
+            for span in plan.spans
+        ]
+        await self.osm.upsert_conductors(conductor_rows)
+        await self.stats.recompute(payload.project_id)
+        _invalidate(self.db, [payload.project_id], poles=True)
+
+        poles_updated = sum(1 for row in plan.poles if row["osm_id"] in known_poles)
+        spans_updated = sum(1 for span in plan.spans if (span.osm_id, span.osm_segment) in known_spans)
+        return OSMImportResponse(
+            project_id=payload.project_id,
+            poles_created=len(plan.poles) - poles_updated,
+            poles_updated=poles_updated,
+            conductors_created=len(plan.spans) - spans_updated,
+            conductors_updated=spans_updated,
+            skipped_stretches=plan.skipped_stretches,
+        )
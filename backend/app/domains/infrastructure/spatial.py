@@ -0,0 +1,182 @@
+"""Spatial filters on poles — PostGIS when available, an in-memory grid otherwise.
+
+``Pole.location`` mirrors ``latitude``/``longitude`` as a SIRGAS 2000 / UTM 23S
+point (EPSG:31983) and is written alongside them on every insert and update.
+On PostgreSQL the filters become ``&&`` / ``ST_DWithin`` predicates served by
+the GiST index on ``location``; poles stored before ``location`` was written
+are filled by migration ``0002_network_import_and_stats`` (or
+:func:`location_sql` through the backfill endpoint) to be found by them. Other databases (SQLite in tests and local
+development) have no spatial SQL, so a per-project :class:`GridIndex` over the
+lat/lon columns answers the query and the page is read by id. Like the feeder
+cache, the grids are process-local and invalidated on pole writes.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+import math
+import numpy as np
+from sqlalchemy import and_, func
+from app.domains.calculations.network import geodesic_distance_m
+from app.domains.mapping.service import get_transformer
+
+LOCATION_SRID = 31983
+_WGS84 = 4326
+_METERS_PER_DEGREE = 111_320.0
+_BBOX_MARGIN_M = 50.0  # UTM envelope of a lat/lon box is not exact near its edges
+_MAX_RADIUS_M = 50_000.0
+
+
+def location_ewkt(lat: list[float | None], lon: list[float | None]) -> list[str | None]:
+    """EWKT UTM points for ``location``; None where a coordinate is missing."""
+    lat_arr = np.array([np.nan if v is None else v for v in lat], dtype=float)
+    lon_arr = np.array([np.nan if v is None else v for v in lon], dtype=float)
+    easting, northing = get_transformer(_WGS84, LOCATION_SRID).transform(lon_arr, lat_arr)
+    return [
+        f"SRID={LOCATION_SRID};POINT({e:.3f} {n:.3f})" if np.isfinite(e) and np.isfinite(n) else None
+        for e, n in zip(easting.tolist(), northing.tolist())
+    ]
+
+
+def location_sql(model):
+    """PostGIS expression computing ``location`` from the row's own latitude/longitude."""
+    return func.ST_Transform(func.ST_SetSRID(func.ST_MakePoint(model.longitude, model.latitude), _WGS84), LOCATION_SRID)
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    west: float
+    south: float
+    east: float
+    north: float
+
+    def sql(self, model):
+        envelope = func.ST_Transform(
+            func.ST_MakeEnvelope(self.west, self.south, self.east, self.north, _WGS84), LOCATION_SRID
+        )
+        return and_(
+            model.location.op("&&")(func.ST_Expand(envelope, _BBOX_MARGIN_M)),
+            model.latitude.between(self.south, self.north),
+            model.longitude.between(self.west, self.east),
+        )
+
+    def search(self, grid: "GridIndex") -> np.ndarray:
+        return grid.within_box(self.west, self.south, self.east, self.north)
+
+
+@dataclass(frozen=True)
+class Radius:
+    lat: float
+    lon: float
+    meters: float
+
+    def sql(self, model):
+        center = func.ST_Transform(func.ST_SetSRID(func.ST_MakePoint(self.lon, self.lat), _WGS84), LOCATION_SRID)
+        return func.ST_DWithin(model.location, center, self.meters)
+
+    def search(self, grid: "GridIndex") -> np.ndarray:
+        return grid.within_radius(self.lat, self.lon, self.meters)
+
+
+SpatialFilter = BoundingBox | Radius
+
+
+def _floats(text: str, count: int, name: str) -> list[float]:
+    try:
+        values = [float(v) for v in text.split(",")]
+    except ValueError:
+        values = []
+    if len(values) != count or not all(math.isfinite(v) for v in values):
+        raise ValueError(f"Parâmetro {name} inválido: esperados {count} números separados por vírgula.")
+    return values
+
+
+def parse_spatial_filter(bbox: str | None, near: str | None, radius: float | None) -> SpatialFilter | None:
+    """``bbox=oeste,sul,leste,norte`` or ``near=lat,lon`` plus ``radius`` (m)."""
+    if bbox and near:
+        raise ValueError("Use bbox ou near, não ambos.")
+    if bbox:
+        west, south, east, north = _floats(bbox, 4, "bbox")
+        if not (-180 <= west <= east <= 180 and -90 <= south <= north <= 90):
+            raise ValueError("bbox deve ser oeste,sul,leste,norte em graus WGS84.")
+        return BoundingBox(west, south, east, north)
+    if near:
+        lat, lon = _floats(near, 2, "near")
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError("near deve ser lat,lon em graus WGS84.")
+        if radius is None or not 0 < radius <= _MAX_RADIUS_M:
+            raise ValueError(f"radius (m) é obrigatório com near e deve estar entre 0 e {_MAX_RADIUS_M:.0f}.")
+        return Radius(lat, lon, radius)
+    return None
+
+
+class GridIndex:
+    """Uniform lat/lon grid over pole coordinates; queries scan only the covered cells."""
+
+    def __init__(self, ids: np.ndarray, lat: np.ndarray, lon: np.ndarray, cell_deg: float = 0.01):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.cell_deg = cell_deg
+        rows = np.floor(self.lat / cell_deg).astype(np.int64)
+        cols = np.floor(self.lon / cell_deg).astype(np.int64)
+        order = np.lexsort((cols, rows))
+        keys = np.stack([rows[order], cols[order]], axis=1)
+        starts = np.flatnonzero(np.r_[True, np.any(keys[1:] != keys[:-1], axis=1)]) if len(order) else []
+        bounds = np.r_[starts, len(order)]
+        self._cells = {
+            (int(keys[s, 0]), int(keys[s, 1])): order[s:e] for s, e in zip(bounds[:-1], bounds[1:])
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _candidates(self, west: float, south: float, east: float, north: float) -> np.ndarray:
+        r0, r1 = math.floor(south / self.cell_deg), math.floor(north / self.cell_deg)
+        c0, c1 = math.floor(west / self.cell_deg), math.floor(east / self.cell_deg)
+        if (r1 - r0 + 1) * (c1 - c0 + 1) > len(self._cells):
+            return np.arange(len(self.ids))  # box covers more cells than are occupied
+        parts = [
+            self._cells[(r, c)] for r in range(r0, r1 + 1) for c in range(c0, c1 + 1) if (r, c) in self._cells
+        ]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def within_box(self, west: float, south: float, east: float, north: float) -> np.ndarray:
+        pos = self._candidates(west, south, east, north)
+        lat, lon = self.lat[pos], self.lon[pos]
+        return self.ids[pos[(lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)]]
+
+    def within_radius(self, lat: float, lon: float, meters: float) -> np.ndarray:
+        dlat = meters / _METERS_PER_DEGREE
+        dlon = meters / (_METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        pos = self._candidates(lon - dlon, lat - dlat, lon + dlon, lat + dlat)
+        dist = geodesic_distance_m(lat, lon, self.lat[pos], self.lon[pos])
+        return self.ids[pos[dist <= meters]]
+
+
+class GridIndexCache:
+    """Grids keyed by project (None = all poles), least recently used dropped first."""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._grids: OrderedDict[int | None, GridIndex] = OrderedDict()
+
+    def get(self, project_id: int | None) -> GridIndex | None:
+        grid = self._grids.get(project_id)
+        if grid is not None:
+            self._grids.move_to_end(project_id)
+        return grid
+
+    def put(self, project_id: int | None, grid: GridIndex) -> None:
+        self._grids[project_id] = grid
+        self._grids.move_to_end(project_id)
+        while len(self._grids) > self.max_entries:
+            self._grids.popitem(last=False)
+
+    def invalidate(self, project_id: int | None) -> None:
+        self._grids.pop(project_id, None)
+        self._grids.pop(None, None)  # the all-poles grid covers every project
+
+    def clear(self) -> None:
+        self._grids.clear()
+
+
+POLE_GRIDS = GridIndexCache()
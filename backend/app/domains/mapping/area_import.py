@@ -0,0 +1,217 @@
+"""Large-area OSM import — a polygon split into concurrent tiled Overpass queries.
+
+The polygon's bounding box is cut into square tiles of
+``Settings.osm_import_tile_deg``; tiles that do not touch the polygon are
+dropped. Tiles are fetched with at most ``osm_import_concurrency`` queries in
+flight, each streamed and parsed element by element, and retried with
+exponential backoff on rate limits, server errors and dropped connections.
+Elements are deduplicated by (type, id) across tile borders and, once all
+tiles finish, clipped to the polygon (ways are kept when any vertex is inside).
+
+Jobs run in the background and are tracked in a process-local registry so
+clients can poll progress.
+"""
+import asyncio
+from dataclasses import dataclass, field
+import random
+import time
+import uuid
+import httpx
+import numpy as np
+from app.core.config import get_settings
+from app.core.http import HTTPClientPool, get_http_pool
+from app.domains.mapping.json_stream import iter_array_items
+from app.domains.mapping.osm_service import _build_response, _compact_element
+from app.domains.mapping.schemas import OSMResponse
+from app.domains.mapping.wkt import Polygon
+
+settings = get_settings()
+
+_BBOX_QUERY = """
+[out:json][timeout:90];
+(
+  node["power"="pole"]({s},{w},{n},{e});
+  node["power"="tower"]({s},{w},{n},{e});
+  way["power"~"line|minor_line"]({s},{w},{n},{e});
+  node["power"="substation"]({s},{w},{n},{e});
+  node["power"="transformer"]({s},{w},{n},{e});
+);
+out body geom;
+"""
+
+_MAX_TILES = 2500
+_MAX_ATTEMPTS = 4
+_BACKOFF_BASE_S = 2.0
+_RETRY_STATUS = {429, 502, 503, 504}
+_MAX_JOBS = 50
+
+Tile = tuple[float, float, float, float]  # (south, west, north, east)
+
+
+def plan_tiles(polygon: Polygon, tile_deg: float) -> list[Tile]:
+    """Grid tiles over the polygon's bounding box that intersect the polygon."""
+    south, west, north, east = polygon.bbox
+    rows = max(1, int(np.ceil((north - south) / tile_deg)))
+    cols = max(1, int(np.ceil((east - west) / tile_deg)))
+    if rows * cols > _MAX_TILES * 4:
+        raise ValueError(f"Área grande demais para importação ({rows * cols} blocos).")
+    tiles = []
+    for r in range(rows):
+        for c in range(cols):
+            tile = (
+                south + r * tile_deg,
+                west + c * tile_deg,
+                min(south + (r + 1) * tile_deg, north),
+                min(west + (c + 1) * tile_deg, east),
+            )
+            if polygon.intersects_box(*tile):
+                tiles.append(tile)
+    if len(tiles) > _MAX_TILES:
+        raise ValueError(f"Área grande demais para importação ({len(tiles)} blocos; máximo {_MAX_TILES}).")
+    return tiles
+
+
+@dataclass
+class AreaImportJob:
+    id: str
+    polygon: Polygon
+    tiles: list[Tile]
+    project_id: int | None = None
+    status: str = "pending"  # pending → running → completed | partial | failed
+    tiles_done: int = 0
+    tiles_failed: int = 0
+    retries: int = 0
+    elements_found: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: float | None = None
+    errors: list[str] = field(default_factory=list)
+    result: OSMResponse | None = None
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "partial", "failed")
+
+    def progress(self) -> dict:
+        total = len(self.tiles)
+        end = self.finished_at or time.monotonic()
+        return {
+            "job_id": self.id,
+            "project_id": self.project_id,
+            "status": self.status,
+            "tiles_total": total,
+            "tiles_done": self.tiles_done,
+            "tiles_failed": self.tiles_failed,
+            "progress_pct": round(100.0 * (self.tiles_done + self.tiles_failed) / total, 1) if total else 100.0,
+            "retries": self.retries,
+            "elements_found": self.elements_found,
+            "elapsed_s": round(end - self.started_at, 2),
+            "errors": self.errors[-10:],
+        }
+
+
+class AreaImportRegistry:
+    """Recent import jobs, oldest finished jobs dropped first."""
+
+    def __init__(self, max_jobs: int = _MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs: dict[str, AreaImportJob] = {}
+
+    def get(self, job_id: str) -> AreaImportJob | None:
+        return self._jobs.get(job_id)
+
+    def add(self, job: AreaImportJob) -> None:
+        self._jobs[job.id] = job
+        for old_id in [j.id for j in self._jobs.values() if j.finished]:
+            if len(self._jobs) <= self.max_jobs:
+                break
+            del self._jobs[old_id]
+
+    def clear(self) -> None:
+        self._jobs.clear()
+
+
+AREA_IMPORT_JOBS = AreaImportRegistry()
+
+
+def _retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRY_STATUS
+    return isinstance(exc, (httpx.TransportError, ValueError))
+
+
+async def _fetch_bbox(tile: Tile, http: HTTPClientPool) -> list[list]:
+    s, w, n, e = tile
+    query = _BBOX_QUERY.format(s=s, w=w, n=n, e=e)
+    async with http.stream("POST", settings.overpass_url, data={"data": query}, timeout=120) as resp:
+        resp.raise_for_status()
+        return [_compact_element(el) async for el in iter_array_items(resp.aiter_bytes(), "elements")]
+
+
+async def _fetch_tile_with_retry(job: AreaImportJob, tile: Tile, http: HTTPClientPool) -> list[list] | None:
+    for attempt in range(1, _MAX_ATTEMPTS + 1):
+        try:
+            return await _fetch_bbox(tile, http)
+        except Exception as exc:
+            if attempt == _MAX_ATTEMPTS or not _retryable(exc):
+                job.errors.append(f"Bloco {tile}: {exc}")
+                return None
+            job.retries += 1
+            delay = _BACKOFF_BASE_S * 2 ** (attempt - 1)
+            await asyncio.sleep(delay * (0.5 + random.random() / 2))
+    return None
+
+
+def _clip_to_polygon(polygon: Polygon, elements: list[list]) -> list[list]:
+    nodes = [el for el in elements if el[0] == "n"]
+    ways = [el for el in elements if el[0] == "w"]
+    kept: list[list] = []
+    if nodes:
+        lon = np.array([el[3] for el in nodes])
+        lat = np.array([el[2] for el in nodes])
+        kept.extend(el for el, inside in zip(nodes, polygon.contains(lon, lat)) if inside)
+    for way in ways:
+        coords = np.asarray(way[4], dtype=float).reshape(-1, 2)
+        if len(coords) and polygon.contains(coords[:, 1], coords[:, 0]).any():
+            kept.append(way)
+    return kept
+
+
+async def run_area_import(job: AreaImportJob, http: HTTPClientPool | None = None) -> None:
+    http = http or get_http_pool()
+    job.status = "running"
+    slots = asyncio.Semaphore(settings.osm_import_concurrency)
+    merged: dict[tuple[str, int], list] = {}
+
+    async def fetch(tile: Tile) -> None:
+        async with slots:
+            elements = await _fetch_tile_with_retry(job, tile, http)
+        if elements is None:
+            job.tiles_failed += 1
+            return
+        for el in elements:
+            merged.setdefault((el[0], el[1]), el)
+        job.elements_found = len(merged)
+        job.tiles_done += 1
+
+    try:
+        await asyncio.gather(*(fetch(tile) for tile in job.tiles))
+        job.result = _build_response(_clip_to_polygon(job.polygon, list(merged.values())))
+        if job.tiles_failed == 0:
+            job.status = "completed"
+        else:
+            job.status = "partial" if job.tiles_done else "failed"
+    except Exception as exc:
+        job.errors.append(str(exc))
+        job.status = "failed"
+    finally:
+        job.finished_at = time.monotonic()
+
+
+def start_area_import(polygon: Polygon, project_id: int | None = None, http: HTTPClientPool | None = None) -> AreaImportJob:
+    """Plan the tiles and start the import in the background."""
+    tiles = plan_tiles(polygon, settings.osm_import_tile_deg)
+    job = AreaImportJob(id=uuid.uuid4().hex, polygon=polygon, tiles=tiles, project_id=project_id)
+    AREA_IMPORT_JOBS.add(job)
+    job.task = asyncio.create_task(run_area_import(job, http))
+    return job
@@ -0,0 +1,350 @@
+"""Elevation providers and request coalescing.
+
+:class:`ElevationProvider` is the lookup interface used by ``MappingService``:
+many (lat, lon) points in, one elevation (or ``None`` where the dataset has no
+data) out per point. :class:`OpenTopoDataProvider` sends up to 100 locations
+per upstream call, one call at a time and at most one per
+``Settings.opentopodata_min_interval_s`` (the public API allows about 1 call/s).
+
+:class:`ElevationCoalescer` sits in front of a provider for single-point
+callers: points requested within a short window are deduplicated and resolved
+with one multi-location call, then fanned back to every waiter.
+
+:class:`SRTMProvider` answers from local SRTM ``.hgt`` tiles instead (offline,
+air-gapped deployments); ``Settings.elevation_provider`` selects the backend.
+
+:class:`CachedElevationProvider` puts an in-process LRU and Redis in front of
+remote providers, keyed by coordinates snapped to the 3" SRTM grid. Local
+rasters are not wrapped: a memmap read is cheaper than the cache and keeps the
+bilinear interpolation (and 1" resolution) that snapping would discard.
+"""
+from abc import ABC, abstractmethod
+import asyncio
+from collections import OrderedDict
+import math
+import os
+import time
+from urllib.parse import urlsplit
+import numpy as np
+from app.core.cache import RedisCache
+from app.core.config import Settings
+from app.core.http import HTTPClientPool, get_http_pool
+
+Point = tuple[float, float]
+
+
+class ElevationRateLimitedError(RuntimeError):
+    """The upstream provider answered 429; the lookup can be retried later."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Limite de requisições do provedor de elevação atingido. Tente novamente em {retry_after:g} s.")
+        self.retry_after = retry_after
+
+
+class ElevationProvider(ABC):
+    """Resolve elevations (m) for many WGS84 points at once."""
+
+    dataset: str = ""
+    max_locations: int = 100
+    coalesce: bool = True  # worth batching single-point lookups (remote providers)
+
+    @abstractmethod
+    async def lookup(self, points: list[Point]) -> list[float | None]:
+        """One elevation per point, in order; ``None`` where there is no data."""
+
+    def peek(self, lat: float, lon: float) -> tuple[bool, float | None]:
+        """Answer without I/O when possible: (found, elevation)."""
+        return False, None
+
+    def stats(self) -> dict:
+        return {"dataset": self.dataset, "cached": False}
+
+
+class OpenTopoDataProvider(ElevationProvider):
+    def __init__(
+        self, url: str, http: HTTPClientPool | None = None, max_locations: int = 100, min_interval_s: float = 0.0
+    ):
+        self.url = url
+        self.dataset = urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1] or "srtm90m"
+        self.max_locations = max_locations
+        self.min_interval_s = min_interval_s
+        self._http = http
+        self.upstream_calls = 0
+        self._pace: asyncio.Lock | None = None
+        self._pace_loop: asyncio.AbstractEventLoop | None = None
+        self._next_call = 0.0
+
+    def _pace_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._pace is None or self._pace_loop is not loop:
+            self._pace, self._pace_loop = asyncio.Lock(), loop
+        return self._pace
+
+    async def _lookup_chunk(self, points: list[Point]) -> list[float | None]:
+        locations = "|".join(f"{lat},{lon}" for lat, lon in points)
+        http = self._http or get_http_pool()
+        # One upstream call at a time per provider, spaced by min_interval_s
+        async with self._pace_lock():
+            delay = self._next_call - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.upstream_calls += 1
+            try:
+                resp = await http.get(f"{self.url}?locations={locations}", timeout=15)
+            finally:
+                self._next_call = time.monotonic() + self.min_interval_s
+        if resp.status_code == 429:
+            try:
+                retry_after = float(resp.headers.get("Retry-After", ""))
+            except ValueError:
+                retry_after = max(self.min_interval_s, 1.0)
+            raise ElevationRateLimitedError(retry_after)
+        resp.raise_for_status()
+        results = resp.json()["results"]
+        if len(results) != len(points):
+            raise ValueError(f"OpenTopoData retornou {len(results)} resultados para {len(points)} pontos.")
+        return [r.get("elevation") for r in results]
+
+    async def lookup(self, points: list[Point]) -> list[float | None]:
+        elevations: list[float | None] = []
+        for i in range(0, len(points), self.max_locations):
+            elevations.extend(await self._lookup_chunk(points[i:i + self.max_locations]))
+        return elevations
+
+
+_HGT_VOID = -32768
+
+
+class SRTMProvider(ElevationProvider):
+    """Bilinear sampling of local SRTM ``.hgt`` tiles through ``numpy.memmap``.
+
+    Tiles are named after their south-west corner (``S23W043.hgt`` covers
+    23°S–22°S, 43°W–42°W) and hold big-endian int16 rows from north to south,
+    1201×1201 (3") or 3601×3601 (1"). Points without a tile, or next to a void
+    sample, get ``None``.
+    """
+
+    dataset = "srtm-local"
+    max_locations = 1_000_000
+    coalesce = False
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._tiles: dict[tuple[int, int], np.ndarray | None] = {}
+
+    @staticmethod
+    def tile_name(lat_floor: int, lon_floor: int) -> str:
+        ns = "N" if lat_floor >= 0 else "S"
+        ew = "E" if lon_floor >= 0 else "W"
+        return f"{ns}{abs(lat_floor):02d}{ew}{abs(lon_floor):03d}.hgt"
+
+    def _tile(self, lat_floor: int, lon_floor: int) -> np.ndarray | None:
+        key = (lat_floor, lon_floor)
+        if key not in self._tiles:
+            path = os.path.join(self.directory, self.tile_name(lat_floor, lon_floor))
+            tile = None
+            if os.path.exists(path):
+                size = math.isqrt(os.path.getsize(path) // 2)
+                tile = np.memmap(path, dtype=">i2", mode="r", shape=(size, size))
+            self._tiles[key] = tile
+        return self._tiles[key]
+
+    def sample(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """Elevation (m) for each point, NaN where there is no data."""
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        out = np.full(lat.shape, np.nan)
+        lat_floor = np.floor(lat).astype(np.int64)
+        lon_floor = np.floor(lon).astype(np.int64)
+        keys = np.stack([lat_floor, lon_floor], axis=-1).reshape(-1, 2)
+        tiles, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(lat.shape)
+        for t, (lat0, lon0) in enumerate(tiles.tolist()):
+            grid = self._tile(lat0, lon0)
+            if grid is None:
+                continue
+            sel = inverse == t
+            last = grid.shape[0] - 1
+            row = (lat0 + 1 - lat[sel]) * last
+            col = (lon[sel] - lon0) * last
+            r0 = np.clip(np.floor(row).astype(np.int64), 0, last - 1)
+            c0 = np.clip(np.floor(col).astype(np.int64), 0, last - 1)
+            fr = row - r0
+            fc = col - c0
+            corners = np.stack([grid[r0, c0], grid[r0, c0 + 1], grid[r0 + 1, c0], grid[r0 + 1, c0 + 1]])
+            value = (
+                corners[0] * (1 - fr) * (1 - fc) + corners[1] * (1 - fr) * fc
+                + corners[2] * fr * (1 - fc) + corners[3] * fr * fc
+            )
+            out[sel] = np.where((corners == _HGT_VOID).any(axis=0), np.nan, value)
+        return out
+
+    async def lookup(self, points: list[Point]) -> list[float | None]:
+        if not points:
+            return []
+        coords = np.array(points, dtype=float)
+        values = self.sample(coords[:, 0], coords[:, 1])
+        return [None if math.isnan(v) else v for v in values.tolist()]
+
+
+def build_elevation_provider(settings: Settings, http: HTTPClientPool | None = None) -> ElevationProvider:
+    """Provider selected by ``Settings.elevation_provider`` (``opentopodata`` or ``srtm``)."""
+    backend = settings.elevation_provider.lower()
+    if backend == "srtm":
+        return SRTMProvider(settings.srtm_directory)
+    if backend == "opentopodata":
+        return OpenTopoDataProvider(
+            settings.opentopodata_url, http, min_interval_s=settings.opentopodata_min_interval_s
+        )
+    raise ValueError(f"Provedor de elevação desconhecido: {settings.elevation_provider}. Use opentopodata ou srtm.")
+
+
+# SRTM 3" grid: 1200 cells per degree (≈90 m)
+_GRID_PER_DEGREE = 1200
+
+
+class CachedElevationProvider(ElevationProvider):
+    """Two-tier cache (LRU, then Redis) over another provider.
+
+    Points are snapped to the nearest 3" grid node and the inner provider is
+    queried at that node, so every point sharing a key gets the same value.
+    """
+
+    def __init__(
+        self,
+        inner: ElevationProvider,
+        redis: RedisCache | None = None,
+        ttl: int = 0,
+        max_entries: int = 200_000,
+    ):
+        self.inner = inner
+        self.dataset = inner.dataset
+        self.max_locations = inner.max_locations
+        self.coalesce = inner.coalesce
+        self.redis = redis
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lru: OrderedDict[tuple[int, int], float | None] = OrderedDict()
+        self._stats = {"memory_hits": 0, "redis_hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def grid_key(lat: float, lon: float) -> tuple[int, int]:
+        return round(lat * _GRID_PER_DEGREE), round(lon * _GRID_PER_DEGREE)
+
+    def _redis_key(self, key: tuple[int, int]) -> str:
+        return f"elev:{self.dataset}:{key[0]}:{key[1]}"
+
+    def _remember(self, key: tuple[int, int], value: float | None) -> None:
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def peek(self, lat: float, lon: float) -> tuple[bool, float | None]:
+        """Memory-only lookup: (found, elevation)."""
+        key = self.grid_key(lat, lon)
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            self._stats["memory_hits"] += 1
+            return True, self._lru[key]
+        return False, None
+
+    async def lookup(self, points: list[Point]) -> list[float | None]:
+        keys = [self.grid_key(lat, lon) for lat, lon in points]
+        found: dict[tuple[int, int], float | None] = {}
+        missing: list[tuple[int, int]] = []
+        for key in dict.fromkeys(keys):
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                found[key] = self._lru[key]
+                self._stats["memory_hits"] += 1
+            else:
+                missing.append(key)
+
+        if missing and self.redis is not None and self.ttl > 0:
+            cached = await self.redis.get_many_json([self._redis_key(k) for k in missing])
+            still_missing = []
+            for key, value in zip(missing, cached):
+                if value is None:
+                    still_missing.append(key)
+                else:
+                    # Stored as a one-element list so "no data" (null) is distinguishable from a miss
+                    found[key] = value[0]
+                    self._remember(key, value[0])
+                    self._stats["redis_hits"] += 1
+            missing = still_missing
+
+        if missing:
+            self._stats["misses"] += len(missing)
+            nodes = [(k[0] / _GRID_PER_DEGREE, k[1] / _GRID_PER_DEGREE) for k in missing]
+            values = await self.inner.lookup(nodes)
+            for key, value in zip(missing, values):
+                found[key] = value
+                self._remember(key, value)
+            if self.redis is not None and self.ttl > 0:
+                await self.redis.set_many_json(
+                    {self._redis_key(k): [v] for k, v in zip(missing, values)}, self.ttl
+                )
+        return [found[key] for key in keys]
+
+    def stats(self) -> dict:
+        lookups = self._stats["memory_hits"] + self._stats["redis_hits"] + self._stats["misses"]
+        hits = lookups - self._stats["misses"]
+        return {
+            "dataset": self.dataset,
+            "cached": True,
+            **self._stats,
+            "entries": len(self._lru),
+            "max_entries": self.max_entries,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+async def lookup_unique(provider: ElevationProvider, points: list[Point]) -> list[float | None]:
+    """Look up each distinct point once and map the results back to the input order."""
+    unique = list(dict.fromkeys(points))
+    if not unique:
+        return []
+    found = dict(zip(unique, await provider.lookup(unique)))
+    return [found[p] for p in points]
+
+
+class ElevationCoalescer:
+    def __init__(self, provider: ElevationProvider, window_s: float = 0.01):
+        self.provider = provider
+        self.window_s = window_s
+        self._pending: dict[Point, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def get(self, lat: float, lon: float) -> float | None:
+        point = (lat, lon)
+        future = self._pending.get(point)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[point] = loop.create_future()
+            if len(self._pending) >= self.provider.max_locations:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window_s, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            asyncio.ensure_future(self._resolve(batch))
+
+    async def _resolve(self, batch: dict[Point, asyncio.Future]) -> None:
+        try:
+            elevations = await self.provider.lookup(list(batch))
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for future, elevation in zip(batch.values(), elevations):
+            if not future.done():
+                future.set_result(elevation)
@@ -0,0 +1,56 @@
+"""Incremental parsing of a JSON array inside a streamed HTTP body.
+
+Overpass answers ``{"version": ..., "osm3s": {...}, "elements": [ ... ]}``.
+:func:`iter_array_items` yields the items of the named top-level array one by
+one while the body is still arriving, so only the unparsed tail of the stream
+(at most one element plus a network chunk) is held in memory.
+"""
+import codecs
+import json
+from typing import AsyncIterator
+
+_WHITESPACE = " \t\r\n"
+_decoder = json.JSONDecoder()
+
+
+async def iter_array_items(chunks: AsyncIterator[bytes], key: str) -> AsyncIterator:
+    """Yield the decoded items of the array stored under ``key``."""
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    marker = f'"{key}"'
+    buffer = ""
+    pos = 0
+    in_array = False
+    finished = False
+
+    async for chunk in chunks:
+        buffer = buffer[pos:] + utf8.decode(chunk)
+        pos = 0
+        if not in_array:
+            start = buffer.find(marker)
+            bracket = buffer.find("[", start + len(marker)) if start >= 0 else -1
+            if bracket < 0:
+                # Keep enough of the tail to match a marker split across chunks
+                pos = max(0, len(buffer) - len(marker) - 32)
+                continue
+            in_array = True
+            pos = bracket + 1
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE + ",":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                finished = True
+                break
+            try:
+                item, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # element continues in the next chunk
+            pos = end
+            yield item
+        if finished:
+            return
+
+    if not finished:
+        raise ValueError(f"Resposta JSON incompleta: lista '{key}' não foi encerrada.")
@@ -1,6 +1,6 @@
 """Mapping domain schemas."""
-from pydantic import BaseModel, Field
-from typing import Any
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Optional
 
 
 class OSMNode(BaseModel):
@@ -32,6 +32,25 @@ class ElevationResponse(BaseModel):
     dataset: str = "srtm90m"
 
 
+class ElevationPoint(BaseModel):
+    lat: float = Field(..., ge=-90, le=90, description="Latitude WGS84")
+    lon: float = Field(..., ge=-180, le=180, description="Longitude WGS84")
+
+
+class ElevationBatchRequest(BaseModel):
+    locations: list[ElevationPoint] = Field(..., min_length=1, max_length=10000)
+
+
+class ElevationBatchItem(ElevationPoint):
+    elevation: Optional[float] = Field(None, description="Altitude em metros (nulo sem cobertura)")
+
+
+class ElevationBatchResponse(BaseModel):
+    dataset: str
+    results: list[ElevationBatchItem]
+    total: int
+
+
 class UTMConversionResponse(BaseModel):
     easting: float
     northing: float
@@ -40,3 +59,75 @@ class UTMConversionResponse(BaseModel):
     lat: float = Field(..., description="Latitude WGS84")
     lon: float = Field(..., description="Longitude WGS84")
     epsg: int = Field(..., description="Código EPSG da projeção de entrada")
+
+
+_MAX_BATCH_POINTS = 200_000
+
+
+class UTMBatchRequest(BaseModel):
+    easting: list[float] = Field(..., min_length=1, max_length=_MAX_BATCH_POINTS, description="Coordenadas Leste (m)")
+    northing: list[float] = Field(..., min_length=1, max_length=_MAX_BATCH_POINTS, description="Coordenadas Norte (m)")
+    zone: int = Field(23, description="Fuso UTM")
+    hemisphere: str = Field("S", description="Hemisfério: N ou S")
+
+    @model_validator(mode="after")
+    def _same_length(self):
+        if len(self.easting) != len(self.northing):
+            raise ValueError("easting e northing devem ter o mesmo número de pontos.")
+        return self
+
+
+class UTMBatchResponse(BaseModel):
+    zone: int
+    hemisphere: str
+    epsg: int = Field(..., description="Código EPSG da projeção de entrada")
+    lat: list[Optional[float]] = Field(..., description="Latitudes WGS84 (nulo quando não convertido)")
+    lon: list[Optional[float]]
+    total: int
+
+
+class WGS84BatchRequest(BaseModel):
+    lat: list[float] = Field(..., min_length=1, max_length=_MAX_BATCH_POINTS, description="Latitudes WGS84")
+    lon: list[float] = Field(..., min_length=1, max_length=_MAX_BATCH_POINTS, description="Longitudes WGS84")
+    zone: int = Field(23, description="Fuso UTM de destino")
+    hemisphere: str = Field("S", description="Hemisfério: N ou S")
+
+    @model_validator(mode="after")
+    def _same_length(self):
+        if len(self.lat) != len(self.lon):
+            raise ValueError("lat e lon devem ter o mesmo número de pontos.")
+        return self
+
+
+class WGS84BatchResponse(BaseModel):
+    zone: int
+    hemisphere: str
+    epsg: int = Field(..., description="Código EPSG da projeção de saída")
+    easting: list[Optional[float]]
+    northing: list[Optional[float]]
+    total: int
+
+
+class AreaImportRequest(BaseModel):
+    project_id: Optional[int] = Field(None, description="Projeto cuja área (area_wkt) será importada")
+    area_wkt: Optional[str] = Field(None, description="Polígono WKT (lon lat); substitui a área do projeto")
+
+    @model_validator(mode="after")
+    def _has_area(self):
+        if self.project_id is None and not self.area_wkt:
+            raise ValueError("Informe project_id ou area_wkt.")
+        return self
+
+
+class AreaImportStatus(BaseModel):
+    job_id: str
+    project_id: Optional[int] = None
+    status: str = Field(..., description="pending, running, completed, partial ou failed")
+    tiles_total: int
+    tiles_done: int
+    tiles_failed: int
+    progress_pct: float
+    retries: int
+    elements_found: int
+    elapsed_s: float
+    errors: list[str] = []
@@ -1,9 +1,23 @@
 """Mapping service — orchestrates OSM fetching, elevation and coordinate conversion."""
-import httpx
+from functools import lru_cache
+from typing import AsyncIterator
+import numpy as np
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import get_cache
 from app.core.config import get_settings
-from app.domains.mapping.schemas import OSMResponse, ElevationResponse, UTMConversionResponse
-from app.domains.mapping.osm_service import fetch_osm_data
+from app.core.http import HTTPClientPool, get_http_pool
+from app.domains.mapping.area_import import AreaImportJob, start_area_import
+from app.domains.mapping.elevation import (
+    CachedElevationProvider, ElevationCoalescer, ElevationProvider, build_elevation_provider, lookup_unique,
+)
+from app.domains.mapping.schemas import (
+    OSMResponse, ElevationResponse, ElevationBatchRequest, ElevationBatchResponse, UTMConversionResponse,
+    UTMBatchRequest, UTMBatchResponse, WGS84BatchRequest, WGS84BatchResponse, AreaImportRequest,
+)
+from app.domains.mapping.osm_service import fetch_osm_data, stream_osm_data
+from app.domains.mapping.wkt import parse_polygon_wkt
+from app.domains.projects.repository import ProjectRepository
 from pyproj import Transformer
 
 settings = get_settings()
@@ -11,7 +25,36 @@ settings = get_settings()
 
 # EPSG:31983 = SIRGAS2000 / UTM zone 23S (covers most of Rio de Janeiro)
 _EPSG_SIRGAS_23S = 31983
-_TRANSFORMER_TO_WGS84 = Transformer.from_crs(f"EPSG:{_EPSG_SIRGAS_23S}", "EPSG:4326", always_xy=True)
+_EPSG_WGS84 = 4326
+
+
+@lru_cache(maxsize=64)
+def get_transformer(source_epsg: int, target_epsg: int) -> Transformer:
+    """Transformer between two EPSG codes, built once (parsing the PROJ database is slow)."""
+    return Transformer.from_crs(f"EPSG:{source_epsg}", f"EPSG:{target_epsg}", always_xy=True)
+
+
+def _sirgas_utm_epsg(zone: int, hemisphere: str) -> int:
+    # SIRGAS2000 UTM South: EPSG = 31960 + zone  (zone 23S → EPSG:31983)
+    # SIRGAS2000 UTM North: EPSG = 31954 + zone  (zone 18N → EPSG:31972)
+    return 31960 + zone if hemisphere.upper() == "S" else 31954 + zone
+
+
+def _utm_transformer(zone: int, hemisphere: str, to_wgs84: bool = True) -> tuple[Transformer, int]:
+    """Transformer for the SIRGAS2000 UTM zone, falling back to zone 23S when the code is invalid."""
+    epsg = _sirgas_utm_epsg(zone, hemisphere)
+    try:
+        pair = (epsg, _EPSG_WGS84) if to_wgs84 else (_EPSG_WGS84, epsg)
+        return get_transformer(*pair), epsg
+    except Exception:
+        pair = (_EPSG_SIRGAS_23S, _EPSG_WGS84) if to_wgs84 else (_EPSG_WGS84, _EPSG_SIRGAS_23S)
+        return get_transformer(*pair), _EPSG_SIRGAS_23S
+
+
+def _finite_or_none(values: np.ndarray) -> list[float | None]:
+    """PROJ reports points it cannot transform as inf; JSON needs null instead."""
+    return [v if np.isfinite(v) else None for v in values.tolist()]
+
 
 _LAT_MIN, _LAT_MAX = -90.0, 90.0
 _LON_MIN, _LON_MAX = -180.0, 180.0
@@ -36,35 +79,76 @@ def _validate_radius(radius: int) -> None:
 class MappingService:
     """Service for geospatial operations: OSM, elevation and coordinate conversion."""
 
+    def __init__(self, http: HTTPClientPool | None = None, elevation: ElevationProvider | None = None):
+        self._http = http
+        self._elevation = elevation
+        self._elevation_provider: ElevationProvider | None = None
+        self._coalescer: ElevationCoalescer | None = None
+
+    @property
+    def http(self) -> HTTPClientPool:
+        return self._http or get_http_pool()
+
+    @property
+    def elevation_provider(self) -> ElevationProvider:
+        if self._elevation_provider is None:
+            provider = self._elevation or build_elevation_provider(settings, self.http)
+            # Local rasters answer faster than the cache and interpolate between grid nodes
+            if provider.coalesce:
+                provider = CachedElevationProvider(
+                    provider,
+                    redis=get_cache(),
+                    ttl=settings.elevation_cache_ttl,
+                    max_entries=settings.elevation_cache_max_entries,
+                )
+            self._elevation_provider = provider
+        return self._elevation_provider
+
+    def _get_coalescer(self) -> ElevationCoalescer:
+        if self._coalescer is None:
+            self._coalescer = ElevationCoalescer(
+                self.elevation_provider, window_s=settings.elevation_coalesce_window_ms / 1000.0
+            )
+        return self._coalescer
+
     async def fetch_osm_data(self, lat: float, lon: float, radius: int) -> OSMResponse:
         _validate_lat_lon(lat, lon)
         _validate_radius(radius)
-        return await fetch_osm_data(lat, lon, radius)
+        return await fetch_osm_data(lat, lon, radius, self._http)
+
+    def stream_osm_data(self, lat: float, lon: float, radius: int) -> AsyncIterator[dict]:
+        _validate_lat_lon(lat, lon)
+        _validate_radius(radius)
+        return stream_osm_data(lat, lon, radius, self._http)
 
     async def fetch_elevation(self, lat: float, lon: float) -> ElevationResponse:
         _validate_lat_lon(lat, lon)
-        url = f"{settings.opentopodata_url}?locations={lat},{lon}"
-        async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-        result = data["results"][0]
-        return ElevationResponse(lat=lat, lon=lon, elevation=result["elevation"])
+        provider = self.elevation_provider
+        found, elevation = provider.peek(lat, lon)
+        if not found and provider.coalesce:
+            elevation = await self._get_coalescer().get(lat, lon)
+        elif not found:
+            elevation = (await provider.lookup([(lat, lon)]))[0]
+        if elevation is None:
+            raise ValueError(f"Sem dados de elevação para ({lat}, {lon}).")
+        return ElevationResponse(lat=lat, lon=lon, elevation=elevation, dataset=provider.dataset)
+
+    async def fetch_elevation_batch(self, payload: ElevationBatchRequest) -> ElevationBatchResponse:
+        points = [(p.lat, p.lon) for p in payload.locations]
+        elevations = await lookup_unique(self.elevation_provider, points)
+        return ElevationBatchResponse(
+            dataset=self.elevation_provider.dataset,
+            results=[
+                {"lat": lat, "lon": lon, "elevation": elevation}
+                for (lat, lon), elevation in zip(points, elevations)
+            ],
+            total=len(points),
+        )
 
     def convert_utm_to_wgs84(
         self, easting: float, northing: float, zone: int, hemisphere: str
     ) -> UTMConversionResponse:
-        # SIRGAS2000 UTM South: EPSG = 31960 + zone  (zone 23S → EPSG:31983)
-        # SIRGAS2000 UTM North: EPSG = 31954 + zone  (zone 18N → EPSG:31972)
-        if hemisphere.upper() == "S":
-            epsg = 31960 + zone
-        else:
-            epsg = 31954 + zone
-        try:
-            transformer = Transformer.from_crs(f"EPSG:{epsg}", "EPSG:4326", always_xy=True)
-        except Exception:
-            transformer = _TRANSFORMER_TO_WGS84
-            epsg = _EPSG_SIRGAS_23S
+        transformer, epsg = _utm_transformer(zone, hemisphere)
         lon, lat = transformer.transform(easting, northing)
         return UTMConversionResponse(
             easting=easting,
@@ -75,3 +159,53 @@ class MappingService:
             lon=lon,
             epsg=epsg,
         )
+
+    def convert_utm_to_wgs84_batch(self, payload: UTMBatchRequest) -> UTMBatchResponse:
+        """Convert many UTM SIRGAS2000 points with a single vectorized PROJ call."""
+        transformer, epsg = _utm_transformer(payload.zone, payload.hemisphere)
+        lon, lat = transformer.transform(
+            np.asarray(payload.easting, dtype=float), np.asarray(payload.northing, dtype=float)
+        )
+        return UTMBatchResponse(
+            zone=payload.zone,
+            hemisphere=payload.hemisphere,
+            epsg=epsg,
+            lat=_finite_or_none(lat),
+            lon=_finite_or_none(lon),
+            total=len(payload.easting),
+        )
+
+    def convert_wgs84_to_utm_batch(self, payload: WGS84BatchRequest) -> WGS84BatchResponse:
+        """Convert many WGS84 points to SIRGAS2000 UTM with a single vectorized PROJ call."""
+        transformer, epsg = _utm_transformer(payload.zone, payload.hemisphere, to_wgs84=False)
+        easting, northing = transformer.transform(
+            np.asarray(payload.lon, dtype=float), np.asarray(payload.lat, dtype=float)
+        )
+        return WGS84BatchResponse(
+            zone=payload.zone,
+            hemisphere=payload.hemisphere,
+            epsg=epsg,
+            easting=_finite_or_none(easting),
+            northing=_finite_or_none(northing),
+            total=len(payload.lat),
+        )
+
+
+class AreaImportService:
+    """Starts tiled OSM imports for a WKT area or a project's ``area_wkt``."""
+
+    def __init__(self, db: AsyncSession, http: HTTPClientPool | None = None):
+        self.projects = ProjectRepository(db)
+        self._http = http
+
+    async def start(self, payload: AreaImportRequest) -> AreaImportJob | None:
+        """Return the started job, or None when the project does not exist."""
+        area_wkt = payload.area_wkt
+        if payload.project_id is not None:
+            project = await self.projects.get(payload.project_id)
+            if project is None:
+                return None
+            area_wkt = area_wkt or project.area_wkt
+            if not area_wkt:
+                raise ValueError("Projeto sem área definida (area_wkt).")
+        return start_area_import(parse_polygon_wkt(area_wkt), payload.project_id, self._http)
@@ -0,0 +1,95 @@
+"""Minimal WKT polygon support for project areas (no GEOS dependency).
+
+Only ``POLYGON`` and ``MULTIPOLYGON`` in lon/lat order are handled, which is
+what ``Project.area_wkt`` stores. Holes are respected by the even-odd rule.
+"""
+import re
+import numpy as np
+
+_NUMBER_PAIR = re.compile(r"(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)\s+(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)")
+
+
+class Polygon:
+    """Rings as (n, 2) arrays of (lon, lat); the first ring of each part is the shell."""
+
+    def __init__(self, rings: list[np.ndarray]):
+        if not rings:
+            raise ValueError("Polígono vazio.")
+        self.rings = rings
+        points = np.vstack(rings)
+        self.west, self.south = points.min(axis=0)
+        self.east, self.north = points.max(axis=0)
+
+    @property
+    def bbox(self) -> tuple[float, float, float, float]:
+        """(south, west, north, east)."""
+        return float(self.south), float(self.west), float(self.north), float(self.east)
+
+    def contains(self, lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        """Vectorized even-odd point-in-polygon test."""
+        lon = np.asarray(lon, dtype=float)
+        lat = np.asarray(lat, dtype=float)
+        inside = np.zeros(lon.shape, dtype=bool)
+        for ring in self.rings:
+            x1, y1 = ring[:-1, 0], ring[:-1, 1]
+            x2, y2 = ring[1:, 0], ring[1:, 1]
+            for ax, ay, bx, by in zip(x1, y1, x2, y2):
+                if ay == by:
+                    continue
+                crosses = (ay > lat) != (by > lat)
+                x_at = ax + (lat - ay) * (bx - ax) / (by - ay)
+                inside ^= crosses & (lon < x_at)
+        return inside
+
+    def intersects_box(self, south: float, west: float, north: float, east: float) -> bool:
+        """True when the polygon and the box share any point."""
+        corners_lon = np.array([west, east, east, west])
+        corners_lat = np.array([south, south, north, north])
+        if self.contains(corners_lon, corners_lat).any():
+            return True
+        for ring in self.rings:
+            inside = (ring[:, 0] >= west) & (ring[:, 0] <= east) & (ring[:, 1] >= south) & (ring[:, 1] <= north)
+            if inside.any():
+                return True
+            for (ax, ay), (bx, by) in zip(ring[:-1], ring[1:]):
+                if _segment_hits_box(ax, ay, bx, by, south, west, north, east):
+                    return True
+        return False
+
+
+def _segment_hits_box(ax, ay, bx, by, south, west, north, east) -> bool:
+    """Liang–Barsky clipping of segment A→B against the box."""
+    t0, t1 = 0.0, 1.0
+    dx, dy = bx - ax, by - ay
+    for p, q in ((-dx, ax - west), (dx, east - ax), (-dy, ay - south), (dy, north - ay)):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 > t1:
+            return False
+    return True
+
+
+def _ring(text: str) -> np.ndarray:
+    coords = np.array([(float(x), float(y)) for x, y in _NUMBER_PAIR.findall(text)])
+    if len(coords) < 3:
+        raise ValueError("Anel do polígono precisa de pelo menos 3 vértices.")
+    if not np.array_equal(coords[0], coords[-1]):
+        coords = np.vstack([coords, coords[:1]])
+    return coords
+
+
+def parse_polygon_wkt(wkt: str) -> Polygon:
+    """Parse ``POLYGON((...))`` or ``MULTIPOLYGON(((...)))`` into a :class:`Polygon`."""
+    text = wkt.strip()
+    kind = text.split("(", 1)[0].strip().upper()
+    if kind not in ("POLYGON", "MULTIPOLYGON"):
+        raise ValueError(f"WKT não suportado: {kind or text[:20]}. Use POLYGON ou MULTIPOLYGON.")
+    rings = [_ring(body) for body in re.findall(r"\(([^()]+)\)", text)]
+    return Polygon(rings)
@@ -0,0 +1,53 @@
+"""Material codes per concessionaire for the project material list.
+
+Each aggregated group (pole model, cable, equipment type) maps to one line
+``{categoria, codigo, descricao, unidade, quantidade}``. Codes are built from
+the concessionaire prefix and the item's attributes, so a new pole height or
+cable section gets a stable code without a table edit.
+"""
+
+_PREFIX = {"Enel-RJ": "ENEL", "Light": "LIGHT"}
+_DEFAULT_PREFIX = "SISDIST"
+
+_POLE_TYPES = {"concreto": "CC", "madeira": "MD", "aço": "AC", "aco": "AC", "fibra": "FV"}
+
+
+def _prefix(concessionaire: str) -> str:
+    return _PREFIX.get(concessionaire, _DEFAULT_PREFIX)
+
+
+def _num(value: float | None) -> str:
+    return "ND" if value is None else f"{value:g}"
+
+
+def pole_item(concessionaire: str, pole_type: str, height: float | None, pole_class: str | None, count: int) -> dict:
+    kind = _POLE_TYPES.get((pole_type or "").lower(), "OT")
+    klass = pole_class or "ND"
+    return {
+        "categoria": "poste",
+        "codigo": f"{_prefix(concessionaire)}-PST-{kind}-{_num(height)}-{klass}",
+        "descricao": f"Poste de {pole_type} {_num(height)} m classe {klass}",
+        "unidade": "pç",
+        "quantidade": count,
+    }
+
+
+def conductor_item(concessionaire: str, conductor_type: str, section: float, cable_m: float) -> dict:
+    return {
+        "categoria": "condutor",
+        "codigo": f"{_prefix(concessionaire)}-CAB-{conductor_type.upper()}-{_num(section)}",
+        "descricao": f"Cabo {conductor_type.upper()} {_num(section)} mm² (fases × comprimento do vão)",
+        "unidade": "m",
+        "quantidade": round(cable_m, 2),
+    }
+
+
+def equipment_item(concessionaire: str, equipment_type: str, count: int) -> dict:
+    slug = "".join(ch for ch in equipment_type.upper() if ch.isalnum())[:12] or "ND"
+    return {
+        "categoria": "equipamento",
+        "codigo": f"{_prefix(concessionaire)}-EQP-{slug}",
+        "descricao": equipment_type,
+        "unidade": "pç",
+        "quantidade": count,
+    }
@@ -0,0 +1,83 @@
+"""CSV and XLSX renderings of a project material list.
+
+CSV uses ``;`` and decimal commas (what Excel expects in pt-BR) and is
+produced row by row. XLSX is a minimal SpreadsheetML package written with
+``zipfile`` (no spreadsheet dependency); the aggregated list has one row per
+material, so it is small enough to build in memory.
+"""
+import csv
+import io
+from typing import Iterator
+from xml.sax.saxutils import escape
+import zipfile
+
+COLUMNS = ("categoria", "codigo", "descricao", "unidade", "quantidade")
+_HEADER = ("Categoria", "Código", "Descrição", "Unidade", "Quantidade")
+
+
+def _decimal_comma(value: float) -> str:
+    # Fixed decimals: ``:g`` would cut long cable runs to 6 significant digits (or e-notation)
+    return f"{value:.2f}".replace(".", ",") if isinstance(value, float) else str(value)
+
+
+def iter_csv(items: list[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";")
+    yield "\ufeff"  # BOM so Excel detects UTF-8
+    rows = (
+        [item["categoria"], item["codigo"], item["descricao"], item["unidade"], _decimal_comma(item["quantidade"])]
+        for item in items
+    )
+    for row in (_HEADER, *rows):
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+</Types>"""
+
+_ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+_WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="Material" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+</Relationships>"""
+
+
+def _cell(value) -> str:
+    if isinstance(value, (int, float)):
+        return f"<c t=\"n\"><v>{value}</v></c>"
+    return f"<c t=\"inlineStr\"><is><t>{escape(str(value))}</t></is></c>"
+
+
+def build_xlsx(items: list[dict]) -> bytes:
+    rows = [_HEADER, *(tuple(item[c] for c in COLUMNS) for item in items)]
+    sheet = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+        + "".join(f"<row>{''.join(_cell(v) for v in row)}</row>" for row in rows)
+        + "</sheetData></worksheet>"
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        package.writestr("_rels/.rels", _ROOT_RELS)
+        package.writestr("xl/workbook.xml", _WORKBOOK)
+        package.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        package.writestr("xl/worksheets/sheet1.xml", sheet)
+    return out.getvalue()
@@ -1,6 +1,6 @@
 """Projects domain DB models."""
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Float, ForeignKey, Integer, String, DateTime, Text
 from app.core.database import Base
 
 
@@ -14,3 +14,19 @@ class Project(Base):
     area_wkt = Column(Text, nullable=True)  # WKT polygon string
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+
+class ProjectStat(Base):
+    """One aggregate of a project's network, kept current by the infrastructure writes.
+
+    ``metric`` is ``poles`` (count per ``pole_type``), ``conductors`` (count per
+    ``voltage_level``), ``conductor_m`` (metres per ``voltage_level``) or
+    ``equipment`` (count per ``equipment_type``).
+    """
+
+    __tablename__ = "project_stats"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    metric = Column(String(20), primary_key=True)
+    key = Column(String(50), primary_key=True, default="")
+    value = Column(Float, nullable=False, default=0.0)
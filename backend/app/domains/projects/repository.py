@@ -1,17 +1,15 @@
 """Projects domain repository."""
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.domains.projects.models import Project
+from sqlalchemy import delete, func, insert, select
+from app.core.database import upsert_insert
+from app.domains.infrastructure.models import Conductor, Equipment, Pole
+from app.domains.projects.models import Project, ProjectStat
 
 
 class ProjectRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def list(self) -> list[Project]:
-        result = await self.db.execute(select(Project).order_by(Project.created_at.desc()))
-        return list(result.scalars().all())
-
     async def get(self, project_id: int) -> Project | None:
         result = await self.db.execute(select(Project).where(Project.id == project_id))
         return result.scalar_one_or_none()
@@ -25,3 +23,70 @@ class ProjectRepository:
     async def delete(self, project: Project) -> None:
         await self.db.delete(project)
         await self.db.flush()
+
+
+class ProjectStatsRepository:
+    """Per-project aggregates updated by deltas instead of rescanning the network."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def apply(self, deltas: dict[tuple[int, str, str], float]) -> None:
+        """Add ``{(project_id, metric, key): delta}`` to the stored values in one upsert."""
+        rows = [
+            {"project_id": project_id, "metric": metric, "key": key or "", "value": value}
+            for (project_id, metric, key), value in deltas.items()
+            if project_id is not None and value
+        ]
+        if not rows:
+            return
+        # Fixed row order so concurrent writers lock stats rows in the same sequence
+        rows.sort(key=lambda row: (row["project_id"], row["metric"], row["key"]))
+        stmt = upsert_insert(self.db, ProjectStat).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProjectStat.project_id, ProjectStat.metric, ProjectStat.key],
+            set_={"value": ProjectStat.value + stmt.excluded.value},
+        )
+        await self.db.execute(stmt)
+
+    async def recompute(self, project_id: int) -> None:
+        """Rebuild a project's aggregates from the network tables (after imports, or to repair drift)."""
+        await self.delete(project_id)
+        queries = (
+            ("poles", select(Pole.pole_type, func.count()).where(Pole.project_id == project_id).group_by(Pole.pole_type)),
+            ("conductors", select(Conductor.voltage_level, func.count())
+                .where(Conductor.project_id == project_id).group_by(Conductor.voltage_level)),
+            ("conductor_m", select(Conductor.voltage_level, func.sum(func.coalesce(Conductor.length, 0.0)))
+                .where(Conductor.project_id == project_id).group_by(Conductor.voltage_level)),
+            ("equipment", select(Equipment.equipment_type, func.count())
+                .join(Pole, Pole.id == Equipment.pole_id)
+                .where(Pole.project_id == project_id).group_by(Equipment.equipment_type)),
+        )
+        rows = []
+        for metric, q in queries:
+            rows += [
+                {"project_id": project_id, "metric": metric, "key": key or "", "value": float(value)}
+                for key, value in (await self.db.execute(q)).all() if value
+            ]
+        if rows:
+            await self.db.execute(insert(ProjectStat), rows)
+
+    async def delete(self, project_id: int) -> None:
+        await self.db.execute(delete(ProjectStat).where(ProjectStat.project_id == project_id))
+
+    async def list_with_projects(self, project_id: int | None = None) -> list[tuple[Project, list[ProjectStat]]]:
+        """Projects (all, or one) with their aggregates via a single outer join, newest first."""
+        q = (
+            select(Project, ProjectStat)
+            .outerjoin(ProjectStat, ProjectStat.project_id == Project.id)
+            .order_by(Project.created_at.desc(), Project.id)
+            .execution_options(populate_existing=True)  # stats change through Core upserts
+        )
+        if project_id is not None:
+            q = q.where(Project.id == project_id)
+        grouped: dict[int, tuple[Project, list[ProjectStat]]] = {}
+        for project, stat in (await self.db.execute(q)).all():
+            entry = grouped.setdefault(project.id, (project, []))
+            if stat is not None:
+                entry[1].append(stat)
+        return list(grouped.values())
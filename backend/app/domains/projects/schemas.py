@@ -28,3 +28,56 @@ class ProjectResponse(ProjectBase):
     updated_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
+
+
+class ProjectStats(BaseModel):
+    poles_total: int = 0
+    poles_by_type: dict[str, int] = {}
+    conductors_total: int = 0
+    conductor_km_total: float = 0.0
+    conductor_km_by_voltage: dict[str, float] = Field({}, description="Quilômetros de rede por nível de tensão (BT/MT)")
+    equipment_total: int = 0
+    equipment_by_type: dict[str, int] = {}
+
+
+class ProjectSummary(ProjectResponse):
+    stats: ProjectStats = ProjectStats()
+
+
+class NetworkPoles(BaseModel):
+    id: list[int]
+    code: list[str]
+    latitude: list[Optional[float]]
+    longitude: list[Optional[float]]
+    elevation: list[Optional[float]]
+    pole_type: list[str]
+    pole_height: list[Optional[float]]
+    pole_class: list[Optional[str]]
+
+
+class NetworkConductors(BaseModel):
+    id: list[int]
+    from_index: list[int] = Field(..., description="Posição do poste de origem em poles (-1 se fora do projeto)")
+    to_index: list[int] = Field(..., description="Posição do poste de destino em poles (-1 se fora do projeto)")
+    conductor_type: list[str]
+    cross_section: list[float]
+    voltage_level: list[str]
+    phases: list[int]
+    length: list[Optional[float]]
+
+
+class NetworkEquipment(BaseModel):
+    id: list[int]
+    pole_index: list[int] = Field(..., description="Posição do poste em poles")
+    equipment_type: list[str]
+    manufacturer: list[Optional[str]]
+    model: list[Optional[str]]
+
+
+class NetworkSnapshot(BaseModel):
+    """Topologia do projeto em colunas: um array por atributo, arestas como índices de postes."""
+
+    project_id: int
+    poles: NetworkPoles
+    conductors: NetworkConductors
+    equipment: NetworkEquipment
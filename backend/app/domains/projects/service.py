@@ -1,18 +1,59 @@
 """Projects domain service."""
 from datetime import datetime, timezone
+from functools import partial
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.domains.projects.repository import ProjectRepository
-from app.domains.projects.models import Project
-from app.domains.projects.schemas import ProjectCreate, ProjectUpdate, ProjectResponse
+from app.core.database import on_commit, read_snapshot
+from app.domains.calculations.feeder_cache import FEEDER_CACHE
+from app.domains.infrastructure.repository import NetworkRepository
+from app.domains.projects.material_catalog import conductor_item, equipment_item, pole_item
+from app.domains.projects.repository import ProjectRepository, ProjectStatsRepository
+from app.domains.projects.models import Project, ProjectStat
+from app.domains.projects.schemas import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectStats, ProjectSummary
+
+
+def _columns(rows, names: tuple[str, ...]) -> dict[str, list]:
+    """Transpose result rows into one list per column."""
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    return {name: list(values) for name, values in zip(names, columns)}
+
+
+def _project_stats(stats: list[ProjectStat]) -> ProjectStats:
+    by_metric: dict[str, dict[str, float]] = {}
+    for stat in stats:
+        if stat.value > 1e-9:  # rows decremented back to zero stay in the table
+            by_metric.setdefault(stat.metric, {})[stat.key] = stat.value
+    poles = {k: round(v) for k, v in by_metric.get("poles", {}).items()}
+    km = {k: round(v / 1000.0, 3) for k, v in by_metric.get("conductor_m", {}).items()}
+    equipment = {k: round(v) for k, v in by_metric.get("equipment", {}).items()}
+    return ProjectStats(
+        poles_total=sum(poles.values()),
+        poles_by_type=poles,
+        conductors_total=round(sum(by_metric.get("conductors", {}).values())),
+        conductor_km_total=round(sum(km.values()), 3),
+        conductor_km_by_voltage=km,
+        equipment_total=sum(equipment.values()),
+        equipment_by_type=equipment,
+    )
 
 
 class ProjectService:
     def __init__(self, db: AsyncSession):
         self.repo = ProjectRepository(db)
+        self.network = NetworkRepository(db)
+        self.stats = ProjectStatsRepository(db)
+
+    async def list_projects(self) -> list[ProjectSummary]:
+        """Projects with their network aggregates, read from project_stats in one join."""
+        return [
+            ProjectSummary.model_validate(project).model_copy(update={"stats": _project_stats(stats)})
+            for project, stats in await self.stats.list_with_projects()
+        ]
 
-    async def list_projects(self) -> list[ProjectResponse]:
-        projects = await self.repo.list()
-        return [ProjectResponse.model_validate(p) for p in projects]
+    async def rebuild_stats(self, project_id: int) -> ProjectStats | None:
+        if await self.repo.get(project_id) is None:
+            return None
+        await self.stats.recompute(project_id)
+        return _project_stats((await self.stats.list_with_projects(project_id))[0][1])
 
     async def get_project(self, project_id: int) -> ProjectResponse | None:
         project = await self.repo.get(project_id)
@@ -40,18 +81,54 @@ class ProjectService:
         project = await self.repo.get(project_id)
         if project is None:
             return False
+        await self.stats.delete(project_id)
         await self.repo.delete(project)
+        on_commit(self.repo.db, partial(FEEDER_CACHE.invalidate, project_id))
         return True
 
+    async def network_snapshot(self, project_id: int) -> dict | None:
+        """Poles, conductors and equipment in three set-based queries (one snapshot), as columnar arrays."""
+        async with read_snapshot(self.repo.db):
+            if await self.repo.get(project_id) is None:
+                return None
+            pole_rows = await self.network.pole_rows(project_id)
+            conductor_rows = await self.network.conductor_rows(project_id)
+            equipment_rows = await self.network.equipment_rows(project_id)
+
+        poles = _columns(pole_rows, (
+            "id", "code", "latitude", "longitude", "elevation", "pole_type", "pole_height", "pole_class",
+        ))
+        index = {pole_id: i for i, pole_id in enumerate(poles["id"])}
+        conductors = _columns(conductor_rows, (
+            "id", "pole_from_id", "pole_to_id", "conductor_type", "cross_section", "voltage_level", "phases", "length",
+        ))
+        conductors = {
+            "id": conductors["id"],
+            "from_index": [index.get(pole_id, -1) for pole_id in conductors.pop("pole_from_id")],
+            "to_index": [index.get(pole_id, -1) for pole_id in conductors.pop("pole_to_id")],
+            **{name: values for name, values in conductors.items() if name != "id"},
+        }
+        equipment = _columns(equipment_rows, ("id", "pole_id", "equipment_type", "manufacturer", "model"))
+        equipment["pole_index"] = [index.get(pole_id, -1) for pole_id in equipment.pop("pole_id")]
+        return {"project_id": project_id, "poles": poles, "conductors": conductors, "equipment": equipment}
+
     async def generate_material_list(self, project_id: int) -> dict | None:
-        project = await self.repo.get(project_id)
-        if project is None:
-            return None
-        # Placeholder: in production, query poles/conductors/equipment for this project
+        """Material list from three GROUP BY queries (one snapshot), coded for the project's concessionaire."""
+        async with read_snapshot(self.repo.db):
+            project = await self.repo.get(project_id)
+            if project is None:
+                return None
+            concessionaire = project.concessionaire
+            items = [
+                *(pole_item(concessionaire, *row) for row in await self.network.pole_groups(project_id)),
+                *(conductor_item(concessionaire, *row) for row in await self.network.conductor_groups(project_id)),
+                *(equipment_item(concessionaire, *row) for row in await self.network.equipment_groups(project_id)),
+            ]
         return {
             "projeto_id": project_id,
             "projeto_nome": project.name,
-            "concessionaire": project.concessionaire,
-            "items": [],
+            "concessionaire": concessionaire,
+            "items": items,
+            "total_items": len(items),
             "observacao": "Lista de material gerada automaticamente pelo sisDIST",
         }
@@ -1,17 +1,36 @@
 """Main FastAPI application entry point."""
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.cache import get_cache
 from app.core.config import get_settings
+from app.core.database import database_pool_stats, dispose_engine, warm_pools
+from app.core.http import get_http_pool
 from app.api.router import api_router
+from app.domains.calculations.executor import CALCULATION_EXECUTOR
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    CALCULATION_EXECUTOR.start()
+    get_http_pool().client()
+    await warm_pools()
+    yield
+    await get_http_pool().aclose()
+    await dispose_engine()
+    await CALCULATION_EXECUTOR.aclose()
+    await get_cache().close()
+
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="Sistema de Distribuição Elétrica — Ferramenta para engenheiros elétricos brasileiros",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -20,6 +39,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Content-Disposition"],
 )
 
 app.include_router(api_router, prefix="/api")
@@ -29,3 +49,9 @@ app.include_router(api_router, prefix="/api")
 async def health_check():
     """Health check endpoint."""
     return {"status": "ok", "app": settings.app_name, "version": settings.app_version}
+
+
+@app.get("/health/db-pool", tags=["health"])
+async def db_pool_stats():
+    """Ocupação dos pools de conexões com o banco (principal e réplica de leitura, se houver)."""
+    return database_pool_stats()
@@ -2,6 +2,7 @@
 Test configuration — must mock geoalchemy2 BEFORE any app imports.
 Uses SQLite in-memory database so PostGIS is NOT required.
 """
+import os
 import sys
 from unittest.mock import MagicMock
 from sqlalchemy import String
@@ -17,6 +18,10 @@ sys.modules["geoalchemy2"] = mock_geo
 sys.modules["geoalchemy2.types"] = mock_geo.types
 sys.modules["geoalchemy2.shape"] = mock_geo.shape
 
+# Keep tests independent of any Redis running on the developer's machine
+os.environ.setdefault("OSM_CACHE_TTL", "0")
+os.environ.setdefault("ELEVATION_CACHE_TTL", "0")
+
 # ── Now safe to import app modules ──────────────────────────────────────────
 import pytest
 import pytest_asyncio
@@ -62,7 +67,11 @@ async def db_session(db_engine):
 @pytest_asyncio.fixture(scope="function")
 async def client(db_engine):
     """HTTP test client with overridden DB dependency."""
-    from app.core.database import get_db
+    from app.core.database import get_db, get_read_db, get_read_session_factory
+    from app.domains.calculations.feeder_cache import FEEDER_CACHE
+    from app.domains.infrastructure.spatial import POLE_GRIDS
+    FEEDER_CACHE.clear()  # ids restart with every in-memory database
+    POLE_GRIDS.clear()
     factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
 
     async def override_get_db():
@@ -74,7 +83,14 @@ async def client(db_engine):
                 await session.rollback()
                 raise
 
+    read_factory = get_read_session_factory(db_engine)
+
+    async def override_get_read_db():
+        async with read_factory() as session:
+            yield session
+
     fastapi_app.dependency_overrides[get_db] = override_get_db
+    fastapi_app.dependency_overrides[get_read_db] = override_get_read_db
     transport = ASGITransport(app=fastapi_app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
@@ -0,0 +1,135 @@
+"""Tests for WKT parsing and the tiled large-area OSM import (Overpass mocked)."""
+import json
+import re
+import httpx
+import pytest
+from unittest.mock import patch
+from urllib.parse import unquote_plus
+from app.core.http import HTTPClientPool
+from app.domains.mapping import area_import
+from app.domains.mapping.area_import import AreaImportJob, plan_tiles, run_area_import
+from app.domains.mapping.wkt import parse_polygon_wkt
+
+# ~4.4 km square around Niterói, with a triangular notch cut into the north side
+_AREA = "POLYGON((-43.10 -22.92, -43.06 -22.92, -43.06 -22.88, -43.08 -22.90, -43.10 -22.88, -43.10 -22.92))"
+
+
+def _overpass(elements_for_bbox, fail_first: int = 0):
+    """Pool whose transport answers each bbox query with ``elements_for_bbox(s, w, n, e)``."""
+    calls = {"n": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["n"] += 1
+        if calls["n"] <= fail_first:
+            return httpx.Response(429)
+        query = request.content.decode()
+        s, w, n, e = map(float, re.search(r"\(([-\d.]+),([-\d.]+),([-\d.]+),([-\d.]+)\)", unquote_plus(query)).groups())
+        return httpx.Response(200, content=json.dumps({"elements": elements_for_bbox(s, w, n, e)}).encode())
+
+    pool = HTTPClientPool()
+    pool.client()._transport = httpx.MockTransport(handler)
+    return pool, calls
+
+
+def _poles_in(s, w, n, e):
+    poles = [
+        {"type": "node", "id": 1, "lat": -22.91, "lon": -43.09, "tags": {"power": "pole"}},
+        {"type": "node", "id": 2, "lat": -22.885, "lon": -43.08, "tags": {"power": "pole"}},  # in the notch
+        {"type": "node", "id": 3, "lat": -22.905, "lon": -43.07, "tags": {"power": "tower"}},
+    ]
+    line = {"type": "way", "id": 50, "nodes": [1, 3], "tags": {"power": "line"},
+            "geometry": [{"lat": -22.91, "lon": -43.09}, {"lat": -22.905, "lon": -43.07}]}
+    found = [p for p in poles if s <= p["lat"] <= n and w <= p["lon"] <= e]
+    # Every tile reports the line, as Overpass does for ways crossing the bbox
+    return found + [line]
+
+
+@pytest.fixture(autouse=True)
+def _fast_backoff(monkeypatch):
+    monkeypatch.setattr(area_import, "_BACKOFF_BASE_S", 0.0)
+    area_import.AREA_IMPORT_JOBS.clear()
+
+
+class TestPolygon:
+    def test_contains_and_notch(self):
+        polygon = parse_polygon_wkt(_AREA)
+        inside = polygon.contains([-43.09, -43.08, -43.2], [-22.91, -22.885, -22.91])
+        assert inside.tolist() == [True, False, False]
+        assert polygon.bbox == pytest.approx((-22.92, -43.10, -22.88, -43.06))
+
+    def test_multipolygon_and_errors(self):
+        polygon = parse_polygon_wkt("MULTIPOLYGON(((0 0, 1 0, 1 1, 0 0)), ((5 5, 6 5, 6 6, 5 5)))")
+        assert polygon.contains([0.9, 5.9, 3], [0.1, 5.1, 3]).tolist() == [True, True, False]
+        with pytest.raises(ValueError):
+            parse_polygon_wkt("LINESTRING(0 0, 1 1)")
+
+    def test_plan_tiles_skips_tiles_outside(self):
+        polygon = parse_polygon_wkt("POLYGON((0 0, 0.1 0, 0 0.1, 0 0))")  # triangle: half the bbox
+        tiles = plan_tiles(polygon, 0.01)
+        assert 50 < len(tiles) < 100
+        assert all(polygon.intersects_box(*t) for t in tiles)
+
+
+class TestAreaImport:
+    @pytest.mark.asyncio(mode="auto")
+    async def test_merges_dedupes_and_clips(self):
+        polygon = parse_polygon_wkt(_AREA)
+        pool, calls = _overpass(_poles_in)
+        job = AreaImportJob(id="t", polygon=polygon, tiles=plan_tiles(polygon, 0.01))
+        await run_area_import(job, pool)
+        assert job.status == "completed"
+        assert job.tiles_done == len(job.tiles) == calls["n"]
+        assert [p.osm_id for p in job.result.poles] == [1]  # pole 2 is in the notch
+        assert [t.osm_id for t in job.result.towers] == [3]
+        assert [w.osm_id for w in job.result.power_lines] == [50]  # reported by every tile, kept once
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_retries_rate_limited_tiles(self):
+        polygon = parse_polygon_wkt(_AREA)
+        pool, _ = _overpass(_poles_in, fail_first=3)
+        job = AreaImportJob(id="t", polygon=polygon, tiles=plan_tiles(polygon, 0.02))
+        await run_area_import(job, pool)
+        assert job.status == "completed"
+        assert job.retries == 3
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_persistent_failure_marks_partial(self):
+        polygon = parse_polygon_wkt(_AREA)
+        pool, _ = _overpass(_poles_in, fail_first=area_import._MAX_ATTEMPTS)
+        job = AreaImportJob(id="t", polygon=polygon, tiles=plan_tiles(polygon, 0.02))
+        with patch.object(area_import.settings, "osm_import_concurrency", 1):
+            await run_area_import(job, pool)
+        assert job.status == "partial"
+        assert job.tiles_failed == 1
+        assert job.errors
+
+
+@pytest.mark.asyncio
+async def test_area_import_endpoints(client):
+    resp = await client.post("/api/v1/projects/", json={"name": "Niterói", "area_wkt": _AREA})
+    project_id = resp.json()["id"]
+    pool, _ = _overpass(_poles_in)
+    with patch("app.domains.mapping.area_import.get_http_pool", return_value=pool):
+        resp = await client.post("/api/v1/mapping/osm/area", json={"project_id": project_id})
+        assert resp.status_code == 202
+        job_id = resp.json()["job_id"]
+        assert resp.json()["tiles_total"] > 0
+        await area_import.AREA_IMPORT_JOBS.get(job_id).task
+
+    status = (await client.get(f"/api/v1/mapping/osm/area/{job_id}")).json()
+    assert status["status"] == "completed"
+    assert status["progress_pct"] == 100.0
+    result = (await client.get(f"/api/v1/mapping/osm/area/{job_id}/result")).json()
+    assert [p["osm_id"] for p in result["poles"]] == [1]
+
+
+@pytest.mark.asyncio
+async def test_area_import_validation(client):
+    resp = await client.post("/api/v1/mapping/osm/area", json={})
+    assert resp.status_code == 422
+    resp = await client.post("/api/v1/mapping/osm/area", json={"project_id": 99999})
+    assert resp.status_code == 404
+    resp = await client.post("/api/v1/projects/", json={"name": "Sem área"})
+    resp = await client.post("/api/v1/mapping/osm/area", json={"project_id": resp.json()["id"]})
+    assert resp.status_code == 422
+    assert (await client.get("/api/v1/mapping/osm/area/nope")).status_code == 404
@@ -1,9 +1,12 @@
 """Tests for calculation domain — pure Python, no database needed."""
 import math
 import pytest
-from app.domains.calculations.voltage_drop import calculate_voltage_drop, _get_conductor_properties
+from app.domains.calculations.voltage_drop import (
+    calculate_voltage_drop, calculate_voltage_drop_batch, _get_conductor_properties,
+)
 from app.domains.calculations.mechanical_stress import calculate_mechanical_stress
-from app.domains.calculations.schemas import VoltageDropRequest, MechanicalStressRequest
+from app.domains.calculations.conductor_catalog import CONDUCTOR_CATALOG, ConductorCatalog, _CONDUCTOR_TABLE
+from app.domains.calculations.schemas import VoltageDropRequest, VoltageDropBatchRequest, MechanicalStressRequest
 
 
 # ── Conductor property lookup ────────────────────────────────────────────────
@@ -47,6 +50,42 @@ class TestConductorProperties:
         assert r == pytest.approx(0.248)
 
 
+# ── Conductor catalog ───────────────────────────────────────────────────────
+
+class TestConductorCatalog:
+    def test_types(self):
+        assert set(CONDUCTOR_CATALOG.conductor_types) == {"CA", "CAA", "ACSR"}
+
+    def test_index_is_sorted_and_frozen(self):
+        index = CONDUCTOR_CATALOG.index("CA")
+        assert list(index.sections) == sorted(index.sections)
+        with pytest.raises(ValueError):
+            index.resistance_array[0] = 0.0
+
+    def test_mixed_case_type(self):
+        assert CONDUCTOR_CATALOG.properties("Caa", 70) == CONDUCTOR_CATALOG.properties("CAA", 70)
+
+    def test_interpolation_matches_linear_formula(self):
+        r, x = CONDUCTOR_CATALOG.properties("CA", 60)
+        assert r == pytest.approx(0.641 + 0.5 * (0.443 - 0.641))
+        assert x == pytest.approx(0.300 + 0.5 * (0.290 - 0.300))
+
+    def test_non_standard_section_is_memoized(self):
+        catalog = ConductorCatalog(_CONDUCTOR_TABLE)
+        first = catalog.properties("CA", 42.5)
+        assert catalog.properties("CA", 42.5) is first
+
+    def test_lookup_arrays_matches_scalar(self):
+        import numpy as np
+        types = ["CA", "caa", "ACSR", "CA"]
+        sections = np.array([50.0, 60.0, 16.0, 240.0])
+        r, x = CONDUCTOR_CATALOG.lookup_arrays(types, sections)
+        for i, (ctype, section) in enumerate(zip(types, sections)):
+            r_s, x_s = CONDUCTOR_CATALOG.properties(ctype, float(section))
+            assert r[i] == pytest.approx(r_s)
+            assert x[i] == pytest.approx(x_s)
+
+
 # ── Voltage drop 3-phase ────────────────────────────────────────────────────
 
 class TestVoltageDropThreePhase:
@@ -150,6 +189,64 @@ class TestVoltageDropOnePhase:
         assert resp1.voltage_drop_v > resp3.voltage_drop_v
 
 
+# ── Voltage drop batch ──────────────────────────────────────────────────────
+
+class TestVoltageDropBatch:
+    def _items(self):
+        return [
+            VoltageDropRequest(current=100, length=500, conductor_type="CA", cross_section=50),
+            VoltageDropRequest(current=50, length=200, conductor_type="ca", cross_section=25,
+                               power_factor=0.85, phases=1, nominal_voltage=127.0),
+            VoltageDropRequest(current=80, length=300, conductor_type="CAA", cross_section=60, voltage_level="MT",
+                               nominal_voltage=13800.0),
+            VoltageDropRequest(current=200, length=5000, conductor_type="ACSR", cross_section=16),
+        ]
+
+    def test_matches_single_calculation(self):
+        items = self._items()
+        batch = calculate_voltage_drop_batch(VoltageDropBatchRequest(items=items))
+        assert batch.total == len(items)
+        for item, result in zip(items, batch.results):
+            single = calculate_voltage_drop(item)
+            assert result.voltage_drop_v == pytest.approx(single.voltage_drop_v)
+            assert result.voltage_drop_pct == pytest.approx(single.voltage_drop_pct)
+            assert result.resistance == pytest.approx(single.resistance)
+            assert result.reactance == pytest.approx(single.reactance)
+            assert result.limit_pct == single.limit_pct
+            assert result.compliant == single.compliant
+
+    def test_non_compliant_count(self):
+        batch = calculate_voltage_drop_batch(VoltageDropBatchRequest(items=self._items()))
+        assert batch.non_compliant == sum(not r.compliant for r in batch.results)
+        assert batch.non_compliant >= 1
+
+    def test_unknown_type_reports_item_index(self):
+        items = self._items() + [VoltageDropRequest(current=10, length=10, conductor_type="XYZ", cross_section=50)]
+        with pytest.raises(ValueError, match="Item 4"):
+            calculate_voltage_drop_batch(VoltageDropBatchRequest(items=items))
+
+    def test_out_of_range_reports_item_index(self):
+        items = self._items()
+        items[2] = VoltageDropRequest(current=10, length=10, conductor_type="CAA", cross_section=1000)
+        with pytest.raises(ValueError, match="Item 2"):
+            calculate_voltage_drop_batch(VoltageDropBatchRequest(items=items))
+
+    @pytest.mark.asyncio
+    async def test_batch_endpoint(self, client):
+        payload = {"items": [item.model_dump() for item in self._items()]}
+        resp = await client.post("/api/v1/calculations/voltage-drop/batch", json=payload)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["total"] == 4
+        assert len(data["results"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_batch_endpoint_invalid_type(self, client):
+        payload = {"items": [{"current": 10, "length": 10, "conductor_type": "XYZ", "cross_section": 50}]}
+        resp = await client.post("/api/v1/calculations/voltage-drop/batch", json=payload)
+        assert resp.status_code == 422
+
+
 # ── Mechanical stress ────────────────────────────────────────────────────────
 
 class TestMechanicalStress:
@@ -225,3 +322,211 @@ class TestMechanicalStress:
         resp_low = calculate_mechanical_stress(req_low)
         resp_high = calculate_mechanical_stress(req_high)
         assert resp_high.wind_load_per_conductor_n > resp_low.wind_load_per_conductor_n
+
+
+# ── Mechanical stress — project mode ────────────────────────────────────────
+
+class TestProjectMechanicalStress:
+    def _run(self, lat, lon, edges, pole_class=None, **kwargs):
+        import numpy as np
+        from app.domains.calculations.mechanical_stress import calculate_project_mechanical_stress
+        from app.domains.calculations.schemas import ProjectMechanicalStressRequest
+        n, m = len(lat), len(edges)
+        request = ProjectMechanicalStressRequest(wind_speed=25.0, conductor_tension=1000.0, **kwargs)
+        return calculate_project_mechanical_stress(
+            1, request,
+            pole_ids=np.arange(1, n + 1),
+            latitude=np.array(lat, dtype=float),
+            longitude=np.array(lon, dtype=float),
+            pole_height=np.full(n, 11.0),
+            pole_class=pole_class or [None] * n,
+            edge_a=np.array([a for a, _ in edges]),
+            edge_b=np.array([b for _, b in edges]),
+            span=np.full(m, 40.0),
+            diameter_mm=np.full(m, 9.0),
+            weight_kg_km=np.full(m, 137.0),
+            num_conductors=np.full(m, 3.0),
+        )
+
+    def test_straight_line_tension_cancels_on_tangent(self):
+        resp = self._run([-22.150, -22.1504, -22.1508], [-42.92] * 3, [(0, 1), (1, 2)])
+        assert resp.structure == ["fim_de_linha", "tangente", "fim_de_linha"]
+        assert resp.tension_resultant_n[1] == pytest.approx(0.0, abs=1e-6)
+        assert resp.tension_resultant_n[0] == pytest.approx(3000.0)
+
+    def test_right_angle_pole(self):
+        resp = self._run([-22.1504, -22.150, -22.150], [-42.92, -42.92, -42.9196], [(0, 1), (1, 2)])
+        assert resp.structure[1] == "angulo"
+        assert resp.deflection_deg[1] == pytest.approx(90.0, abs=0.5)
+        assert resp.tension_resultant_n[1] == pytest.approx(3000.0 * math.sqrt(2), rel=1e-2)
+
+    def test_wind_and_weight_use_half_spans(self):
+        resp = self._run([-22.150, -22.1504, -22.1508], [-42.92] * 3, [(0, 1), (1, 2)])
+        single = calculate_mechanical_stress(MechanicalStressRequest(
+            wind_speed=25.0, conductor_diameter=9.0, span_length=40.0, conductor_weight=137.0,
+            conductor_tension=1000.0, num_conductors=3,
+        ))
+        # Middle pole carries two half spans = one full span per conductor
+        assert resp.wind_load_n[1] == pytest.approx(3 * single.wind_load_per_conductor_n, rel=1e-3)
+        assert resp.weight_load_n[1] == pytest.approx(3 * single.weight_load_per_conductor_n, rel=1e-3)
+
+    def test_utilization_from_pole_class(self):
+        resp = self._run([-22.150, -22.1504], [-42.92] * 2, [(0, 1)], pole_class=["150", "1000"])
+        assert resp.nominal_load_n == [1500.0, 10000.0]
+        assert resp.overloaded_pole_ids == [1]
+
+    def test_branch_and_isolated(self):
+        resp = self._run(
+            [-22.150, -22.1504, -22.1504, -22.1508, -22.2], [-42.92, -42.92, -42.9196, -42.92, -42.9],
+            [(0, 1), (1, 2), (1, 3)],
+        )
+        assert resp.structure[1] == "derivacao"
+        assert resp.structure[4] == "isolado"
+        assert resp.moment_nm[4] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_project_endpoint(self, client):
+        resp = await client.post("/api/v1/projects/", json={"name": "Mecânico", "concessionaire": "Enel-RJ"})
+        project_id = resp.json()["id"]
+        poles = []
+        for i in range(3):
+            resp = await client.post("/api/v1/infrastructure/poles", json={
+                "code": f"M-{i}", "project_id": project_id, "latitude": -22.15 - i * 0.0004,
+                "longitude": -42.92, "pole_height": 11.0, "pole_class": "300",
+            })
+            poles.append(resp.json()["id"])
+        for a, b in zip(poles, poles[1:]):
+            await client.post("/api/v1/infrastructure/conductors", json={
+                "project_id": project_id, "pole_from_id": a, "pole_to_id": b, "cross_section": 50,
+            })
+        resp = await client.post(
+            f"/api/v1/calculations/mechanical-stress/project/{project_id}",
+            json={"wind_speed": 30.0, "conductor_tension": 800.0},
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["pole_ids"] == poles
+        assert data["structure"] == ["fim_de_linha", "tangente", "fim_de_linha"]
+        assert data["moment_nm"][0] > 0
+
+    @pytest.mark.asyncio
+    async def test_project_endpoint_not_found(self, client):
+        resp = await client.post(
+            "/api/v1/calculations/mechanical-stress/project/99999",
+            json={"wind_speed": 30.0, "conductor_tension": 800.0},
+        )
+        assert resp.status_code == 404
+
+
+# ── Parametric sweeps ───────────────────────────────────────────────────────
+
+class TestSweeps:
+    def _vd_base(self, **kwargs):
+        defaults = dict(current=100.0, length=500.0, conductor_type="CA", cross_section=50)
+        defaults.update(kwargs)
+        return VoltageDropRequest(**defaults)
+
+    def test_voltage_drop_sweep_matches_single_calculation(self):
+        from app.domains.calculations.sweep import sweep_voltage_drop
+        from app.domains.calculations.schemas import VoltageDropSweepRequest, SweepAxis
+        req = VoltageDropSweepRequest(base=self._vd_base(), axes=[
+            SweepAxis(field="cross_section", values=[95, 16, 50, 240]),
+            SweepAxis(field="power_factor", values=[0.8, 0.92]),
+        ])
+        resp = sweep_voltage_drop(req)
+        assert resp.shape == [4, 2]
+        assert resp.axes[0].values == [16.0, 50.0, 95.0, 240.0]
+        # Row-major: index 3 = (cross_section=50, power_factor=0.92)
+        single = calculate_voltage_drop(self._vd_base(cross_section=50, power_factor=0.92))
+        assert resp.voltage_drop_pct[3] == pytest.approx(single.voltage_drop_pct, abs=1e-4)
+
+    def test_voltage_drop_sweep_finds_smallest_compliant_section(self):
+        from app.domains.calculations.sweep import sweep_voltage_drop
+        from app.domains.calculations.schemas import VoltageDropSweepRequest, SweepAxis
+        sections = [16, 25, 35, 50, 70, 95, 120, 150, 185, 240]
+        req = VoltageDropSweepRequest(base=self._vd_base(current=60.0, length=300.0), axes=[
+            SweepAxis(field="cross_section", values=sections),
+        ])
+        resp = sweep_voltage_drop(req)
+        expected = next(
+            s for s in sections
+            if calculate_voltage_drop(self._vd_base(current=60.0, length=300.0, cross_section=s)).compliant
+        )
+        assert resp.best == {"cross_section": float(expected)}
+
+    def test_voltage_drop_sweep_over_conductor_types(self):
+        from app.domains.calculations.sweep import sweep_voltage_drop
+        from app.domains.calculations.schemas import VoltageDropSweepRequest, SweepAxis
+        req = VoltageDropSweepRequest(base=self._vd_base(), axes=[
+            SweepAxis(field="conductor_type", values=["CA", "CAA"]),
+            SweepAxis(field="cross_section", values=[70]),
+        ])
+        resp = sweep_voltage_drop(req)
+        ca = calculate_voltage_drop(self._vd_base(conductor_type="CA", cross_section=70))
+        caa = calculate_voltage_drop(self._vd_base(conductor_type="CAA", cross_section=70))
+        assert resp.voltage_drop_pct == pytest.approx([ca.voltage_drop_pct, caa.voltage_drop_pct], abs=1e-4)
+
+    def test_voltage_drop_sweep_rejects_unknown_field(self):
+        from app.domains.calculations.sweep import sweep_voltage_drop
+        from app.domains.calculations.schemas import VoltageDropSweepRequest, SweepAxis
+        req = VoltageDropSweepRequest(base=self._vd_base(), axes=[SweepAxis(field="phases", values=[1, 3])])
+        with pytest.raises(ValueError, match="não suportado"):
+            sweep_voltage_drop(req)
+
+    def test_sweep_axes_respect_base_constraints(self):
+        from app.domains.calculations.sweep import sweep_mechanical_stress, sweep_voltage_drop
+        from app.domains.calculations.schemas import MechanicalStressSweepRequest, VoltageDropSweepRequest, SweepAxis
+        base = MechanicalStressRequest(
+            wind_speed=25.0, conductor_diameter=14.4, span_length=60.0, conductor_weight=407.0, conductor_tension=500.0,
+        )
+        for values in ([2.5], [3, 100], ["muitos"]):
+            req = MechanicalStressSweepRequest(
+                base=base, pole_nominal_load_n=2000.0, axes=[SweepAxis(field="num_conductors", values=values)],
+            )
+            with pytest.raises(ValueError, match="num_conductors"):
+                sweep_mechanical_stress(req)
+        req = VoltageDropSweepRequest(base=self._vd_base(), axes=[SweepAxis(field="power_factor", values=[0.9, 1.2])])
+        with pytest.raises(ValueError, match="power_factor"):
+            sweep_voltage_drop(req)
+
+    def test_mechanical_sweep_matches_single_and_finds_best(self):
+        from app.domains.calculations.sweep import sweep_mechanical_stress
+        from app.domains.calculations.schemas import MechanicalStressSweepRequest, SweepAxis
+        base = MechanicalStressRequest(
+            wind_speed=25.0, conductor_diameter=14.4, span_length=60.0, conductor_weight=407.0,
+            conductor_tension=500.0, num_conductors=3,
+        )
+        req = MechanicalStressSweepRequest(base=base, pole_nominal_load_n=2000.0, axes=[
+            SweepAxis(field="span_length", values=[80, 40, 60]),
+            SweepAxis(field="wind_speed", values=[40, 25]),
+        ])
+        resp = sweep_mechanical_stress(req)
+        single = calculate_mechanical_stress(base.model_copy(update={"span_length": 60.0, "wind_speed": 40.0}))
+        # index (1, 1) → span 60, wind 40
+        assert resp.total_resultant_n[3] == pytest.approx(single.total_resultant_n, abs=0.01)
+        assert resp.moment_nm[3] == pytest.approx(single.moment_nm, abs=0.01)
+        assert resp.best == {"span_length": 40.0, "wind_speed": 25.0}
+
+    @pytest.mark.asyncio
+    async def test_sweep_endpoints(self, client):
+        resp = await client.post("/api/v1/calculations/voltage-drop/sweep", json={
+            "base": {"current": 100, "length": 500, "cross_section": 50},
+            "axes": [{"field": "cross_section", "values": [16, 50, 240]}, {"field": "length", "values": [100, 900]}],
+        })
+        assert resp.status_code == 200
+        assert resp.json()["evaluated"] == 6
+
+        resp = await client.post("/api/v1/calculations/mechanical-stress/sweep", json={
+            "base": {"wind_speed": 25, "conductor_diameter": 9, "span_length": 40, "conductor_weight": 137,
+                     "conductor_tension": 800},
+            "axes": [{"field": "wind_speed", "values": [10, 20, 30]}],
+            "pole_nominal_load_n": 3000,
+        })
+        assert resp.status_code == 200
+        assert resp.json()["shape"] == [3]
+
+        resp = await client.post("/api/v1/calculations/voltage-drop/sweep", json={
+            "base": {"current": 100, "length": 500, "cross_section": 50},
+            "axes": [{"field": "cross_section", "values": [5000]}],
+        })
+        assert resp.status_code == 422
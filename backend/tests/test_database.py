@@ -0,0 +1,142 @@
+"""Tests for the database engine, connection pools and sessions."""
+import pytest
+
+
+def test_engine_pool_options():
+    from app.core.config import Settings
+    from app.core.database import engine_options, get_engine, pool_stats
+
+    settings = Settings(db_pool_size=4, db_max_overflow=6, db_statement_cache_size=50)
+    options = engine_options("postgresql+asyncpg://u:p@db/sisdist", settings)
+    assert options["pool_size"] == 4 and options["max_overflow"] == 6 and options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"statement_cache_size": 50, "prepared_statement_cache_size": 50}
+
+    pgbouncer = Settings(db_server_prepared_statements=False)
+    assert engine_options("postgresql+asyncpg://u:p@db/sisdist", pgbouncer)["connect_args"]["statement_cache_size"] == 0
+    assert engine_options("sqlite+aiosqlite:///:memory:", settings) == {"connect_args": {"check_same_thread": False}}
+
+    engine = get_engine("postgresql+asyncpg://u:p@db/sisdist")
+    stats = pool_stats(engine)
+    assert stats["pool"] == "AsyncAdaptedQueuePool"
+    assert stats["checked_out"] == 0 and stats["utilization"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_warm_pool(tmp_path):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+    from app.core.database import pool_stats, warm_pool
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}", poolclass=AsyncAdaptedQueuePool, pool_size=3, max_overflow=1
+    )
+    assert await warm_pool(engine, 3) == 3
+    stats = pool_stats(engine, max_overflow=1)
+    assert stats["checked_in"] == 3 and stats["checked_out"] == 0
+    assert stats["max_overflow"] == 1
+
+    async with engine.connect():
+        assert pool_stats(engine, max_overflow=1)["utilization"] == 0.25
+        assert pool_stats(engine, max_overflow=-1)["utilization"] is None
+    await engine.dispose()
+
+    unreachable = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'x.db'}")
+    assert await warm_pool(unreachable, 2) == 0  # logged, startup goes on
+    await unreachable.dispose()
+
+
+@pytest.mark.asyncio
+async def test_replica_pool_is_warmed_and_reported(tmp_path, monkeypatch):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+    from app.core import database
+
+    engines = {
+        name: create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db", poolclass=AsyncAdaptedQueuePool)
+        for name in ("primary", "replica")
+    }
+    monkeypatch.setattr(database, "_engine", engines["primary"])
+    monkeypatch.setattr(database, "_replica_engine", engines["replica"])
+    try:
+        opened = await database.warm_pools()
+        assert set(opened) == {"primary", "replica"} and opened["replica"] > 0
+        stats = database.database_pool_stats()
+        assert stats["replica"]["checked_in"] == opened["replica"]
+    finally:
+        for engine in engines.values():
+            await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_db_pool_endpoint(client):
+    resp = await client.get("/health/db-pool")
+    assert resp.status_code == 200
+    assert "pool" in resp.json()["primary"]
+
+
+@pytest.mark.asyncio(mode="auto")
+async def test_read_session_is_read_only(db_engine):
+    from sqlalchemy import func, select
+    from app.core.database import get_read_session_factory
+    from app.domains.projects.models import Project
+
+    async with get_read_session_factory(db_engine)() as session:
+        assert await session.scalar(select(func.count(Project.id))) == 0
+        session.add(Project(name="Somente leitura", concessionaire="Light"))
+        with pytest.raises(RuntimeError):
+            await session.flush()
+
+
+@pytest.mark.asyncio
+async def test_read_snapshot_opens_one_read_only_transaction():
+    from unittest.mock import AsyncMock, MagicMock
+    from app.core.database import read_snapshot
+
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+    session.in_transaction.return_value = False
+    session.connection = AsyncMock()
+    session.rollback = AsyncMock()
+    async with read_snapshot(session):
+        session.rollback.assert_not_awaited()
+    session.connection.assert_awaited_once_with(
+        execution_options={"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+    )
+    session.rollback.assert_awaited_once()
+
+    session.get_bind.return_value.dialect.name = "sqlite"
+    session.connection.reset_mock()
+    async with read_snapshot(session):
+        pass
+    session.connection.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_read_snapshot_applies_options_to_the_session_transaction(db_engine, monkeypatch, caplog):
+    from sqlalchemy import event, func, select
+    from app.core import database
+    from app.domains.projects.models import Project
+
+    # SQLite has no REPEATABLE READ; SERIALIZABLE stands in to exercise the same path
+    monkeypatch.setitem(database._SNAPSHOT_OPTIONS, "sqlite", {"isolation_level": "SERIALIZABLE"})
+    applied = []
+    listener = lambda conn, opts: applied.append(dict(opts))  # noqa: E731
+    event.listen(db_engine.sync_engine, "set_connection_execution_options", listener)
+    try:
+        async with database.get_read_session_factory(db_engine)() as session:
+            async with database.read_snapshot(session):
+                assert session.in_transaction()
+                assert await session.scalar(select(func.count(Project.id))) == 0
+                conn = await session.connection()
+                assert conn.sync_connection.get_execution_options()["isolation_level"] == "SERIALIZABLE"
+            assert not session.in_transaction()
+            assert {"isolation_level": "SERIALIZABLE"} in applied
+
+            await session.scalar(select(func.count(Project.id)))
+            applied.clear()
+            async with database.read_snapshot(session):
+                pass
+            assert applied == []
+            assert "já em transação" in caplog.text
+    finally:
+        event.remove(db_engine.sync_engine, "set_connection_execution_options", listener)
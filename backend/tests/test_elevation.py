@@ -0,0 +1,310 @@
+"""Tests for elevation providers, coalescing and the batch endpoint (no external APIs)."""
+import asyncio
+from urllib.parse import urlsplit, parse_qs
+import pytest
+from unittest.mock import MagicMock
+from app.domains.mapping.elevation import (
+    ElevationCoalescer, ElevationProvider, ElevationRateLimitedError, OpenTopoDataProvider, lookup_unique,
+)
+
+
+class FakeOpenTopoData:
+    """Stands in for the HTTP pool: elevation = lat + lon for each requested location."""
+
+    def __init__(self, status=200, headers=None):
+        self.calls = 0
+        self.in_flight = self.max_in_flight = 0
+        self.status = status
+        self.headers = headers or {}
+
+    async def get(self, url, timeout=None):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        locations = parse_qs(urlsplit(url).query)["locations"][0].split("|")
+        results = []
+        for loc in locations:
+            lat, lon = map(float, loc.split(","))
+            results.append({"elevation": lat + lon, "location": {"lat": lat, "lng": lon}})
+        resp = MagicMock()
+        resp.status_code = self.status
+        resp.headers = self.headers
+        resp.raise_for_status = MagicMock()
+        resp.json.return_value = {"results": results}
+        return resp
+
+
+class CountingProvider(ElevationProvider):
+    dataset = "fake"
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    async def lookup(self, points):
+        self.batches.append(list(points))
+        if self.fail:
+            raise RuntimeError("upstream indisponível")
+        return [lat * 10 for lat, _ in points]
+
+
+def _points(n):
+    return [(-22.0 - i * 1e-3, -43.0) for i in range(n)]
+
+
+class TestOpenTopoDataProvider:
+    @pytest.mark.asyncio(mode="auto")
+    async def test_chunks_to_100_locations_in_order(self):
+        http = FakeOpenTopoData()
+        provider = OpenTopoDataProvider("https://api.opentopodata.org/v1/srtm90m", http)
+        points = _points(250)
+        elevations = await provider.lookup(points)
+        assert http.calls == 3
+        assert provider.dataset == "srtm90m"
+        assert elevations == pytest.approx([lat + lon for lat, lon in points])
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_10k_points_need_100_calls(self):
+        http = FakeOpenTopoData()
+        provider = OpenTopoDataProvider("https://api.opentopodata.org/v1/srtm90m", http)
+        points = _points(10_000)
+        await lookup_unique(provider, points + points[:500])
+        assert http.calls == 100
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_chunks_are_sequential_and_paced(self):
+        import time
+        http = FakeOpenTopoData()
+        provider = OpenTopoDataProvider("https://api.opentopodata.org/v1/srtm90m", http, min_interval_s=0.02)
+        start = time.monotonic()
+        await asyncio.gather(provider.lookup(_points(250)), provider.lookup(_points(50)))
+        assert http.calls == 4
+        assert http.max_in_flight == 1
+        assert time.monotonic() - start >= 0.06
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_rate_limit_is_retryable(self):
+        provider = OpenTopoDataProvider("https://x/v1/srtm90m", FakeOpenTopoData(429, {"Retry-After": "30"}))
+        with pytest.raises(ElevationRateLimitedError) as info:
+            await provider.lookup(_points(3))
+        assert info.value.retry_after == 30.0
+
+    def test_provider_interface_is_abstract(self):
+        with pytest.raises(TypeError):
+            ElevationProvider()
+
+
+class TestElevationCoalescer:
+    @pytest.mark.asyncio(mode="auto")
+    async def test_concurrent_requests_share_one_call(self):
+        provider = CountingProvider()
+        coalescer = ElevationCoalescer(provider, window_s=0.005)
+        points = _points(50) * 4
+        results = await asyncio.gather(*(coalescer.get(lat, lon) for lat, lon in points))
+        assert len(provider.batches) == 1
+        assert len(provider.batches[0]) == 50
+        assert results == [lat * 10 for lat, _ in points]
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_full_batch_flushes_without_waiting(self):
+        provider = CountingProvider()
+        coalescer = ElevationCoalescer(provider, window_s=60.0)
+        await asyncio.wait_for(
+            asyncio.gather(*(coalescer.get(lat, lon) for lat, lon in _points(100))), timeout=1.0
+        )
+        assert [len(b) for b in provider.batches] == [100]
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_errors_reach_every_waiter(self):
+        coalescer = ElevationCoalescer(CountingProvider(fail=True), window_s=0.001)
+        results = await asyncio.gather(
+            *(coalescer.get(lat, lon) for lat, lon in _points(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_elevation_batch_endpoint(client, monkeypatch):
+    from app.api.v1 import mapping
+    from app.domains.mapping.service import MappingService
+    provider = CountingProvider()
+    monkeypatch.setattr(mapping, "_service", MappingService(elevation=provider))
+    locations = [{"lat": -22.15, "lon": -42.92}, {"lat": -22.16, "lon": -42.93}, {"lat": -22.15, "lon": -42.92}]
+    resp = await client.post("/api/v1/mapping/elevation/batch", json={"locations": locations})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["dataset"] == "fake"
+    assert data["total"] == 3
+    assert [r["elevation"] for r in data["results"]] == pytest.approx([-221.5, -221.6, -221.5])
+    assert len(provider.batches[0]) == 2
+
+
+@pytest.mark.asyncio
+async def test_elevation_rate_limit_is_503(client, monkeypatch):
+    from app.api.v1 import mapping
+    from app.domains.mapping.service import MappingService
+
+    class RateLimited(CountingProvider):
+        async def lookup(self, points):
+            raise ElevationRateLimitedError(2.5)
+
+    monkeypatch.setattr(mapping, "_service", MappingService(elevation=RateLimited()))
+    resp = await client.post("/api/v1/mapping/elevation/batch", json={"locations": [{"lat": -22.15, "lon": -42.92}]})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "3"
+
+
+@pytest.mark.asyncio
+async def test_elevation_batch_rejects_invalid_latitude(client):
+    resp = await client.post("/api/v1/mapping/elevation/batch", json={"locations": [{"lat": 95, "lon": 0}]})
+    assert resp.status_code == 422
+
+
+class TestSRTMProvider:
+    """Synthetic 1201×1201 tile: elevation = 100 + row + 2·col, one void sample."""
+
+    @pytest.fixture
+    def srtm_dir(self, tmp_path):
+        import numpy as np
+        size = 1201
+        rows, cols = np.mgrid[0:size, 0:size]
+        grid = (100 + rows + 2 * cols).astype(">i2")
+        grid[600, 600] = -32768
+        grid.tofile(tmp_path / "S23W043.hgt")
+        return tmp_path
+
+    def test_tile_name(self):
+        from app.domains.mapping.elevation import SRTMProvider
+        assert SRTMProvider.tile_name(-23, -43) == "S23W043.hgt"
+        assert SRTMProvider.tile_name(5, 12) == "N05E012.hgt"
+
+    def test_bilinear_sampling(self, srtm_dir):
+        from app.domains.mapping.elevation import SRTMProvider
+        provider = SRTMProvider(str(srtm_dir))
+        # Row 0 is the north edge; half a cell south-east of (row 1, col 0) interpolates
+        step = 1 / 1200
+        lat = [-22.0 - step, -22.0 - step * 1.5, -23.0, -22.5 + step * 10]
+        lon = [-43.0, -43.0 + step / 2, -42.0 - step, -42.5 + step * 10]
+        values = provider.sample(lat, lon)
+        assert values[0] == pytest.approx(101)
+        assert values[1] == pytest.approx(101 + 0.5 + 1.0)
+        assert values[2] == pytest.approx(100 + 1200 + 2 * 1199)
+        assert values[3] == pytest.approx(100 + 590 + 2 * 610)
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_void_and_missing_tile_are_none(self, srtm_dir):
+        from app.domains.mapping.elevation import SRTMProvider
+        provider = SRTMProvider(str(srtm_dir))
+        result = await provider.lookup([(-22.5, -42.5), (-10.0, -40.0), (-22.25, -42.75)])
+        assert result[0] is None and result[1] is None
+        assert result[2] == pytest.approx(100 + 300 + 2 * 300)
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_selected_from_settings(self, srtm_dir):
+        from app.core.config import Settings
+        from app.domains.mapping.service import MappingService
+        from app.domains.mapping.elevation import build_elevation_provider, SRTMProvider
+        settings = Settings(elevation_provider="srtm", srtm_directory=str(srtm_dir))
+        provider = build_elevation_provider(settings)
+        assert isinstance(provider, SRTMProvider)
+        result = await MappingService(elevation=provider).fetch_elevation(-22.25, -42.75)
+        assert result.elevation == pytest.approx(1000)
+        assert result.dataset == "srtm-local"
+        with pytest.raises(ValueError):
+            build_elevation_provider(Settings(elevation_provider="gdal"))
+
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_service_interpolates_between_grid_nodes(self, srtm_dir):
+        from app.domains.mapping.elevation import SRTMProvider
+        from app.domains.mapping.schemas import ElevationBatchRequest
+        from app.domains.mapping.service import MappingService
+        service = MappingService(elevation=SRTMProvider(str(srtm_dir)))
+        step = 1 / 1200
+        # A third of a cell east and a quarter south of node (row 300, col 300)
+        lat, lon = -22.25 - step / 4, -42.75 + step / 3
+        expected = 100 + 300.25 + 2 * (300 + 1 / 3)
+        assert (await service.fetch_elevation(lat, lon)).elevation == pytest.approx(expected)
+        batch = await service.fetch_elevation_batch(ElevationBatchRequest(locations=[{"lat": lat, "lon": lon}]))
+        assert batch.results[0].elevation == pytest.approx(expected)
+        assert service.elevation_provider.stats() == {"dataset": "srtm-local", "cached": False}
+
+
+class TestElevationCache:
+    @pytest.mark.asyncio(mode="auto")
+    async def test_nearby_points_share_grid_node(self):
+        from app.domains.mapping.elevation import CachedElevationProvider
+        inner = CountingProvider()
+        cache = CachedElevationProvider(inner)
+        # Both within half a 3" cell of the same grid node
+        first = await cache.lookup([(-22.15, -42.92)])
+        second = await cache.lookup([(-22.15 + 1e-4, -42.92 - 1e-4)])
+        assert first == second
+        assert len(inner.batches) == 1
+        assert inner.batches[0] == [(-22.15, -42.92)]
+        assert cache.stats()["memory_hits"] == 1 and cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_lru_evicts_oldest(self):
+        from app.domains.mapping.elevation import CachedElevationProvider
+        cache = CachedElevationProvider(CountingProvider(), max_entries=10)
+        await cache.lookup(_points(25))
+        stats = cache.stats()
+        assert stats["entries"] == 10
+        assert stats["evictions"] == 15
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_redis_tier_serves_other_processes(self):
+        from app.domains.mapping.elevation import CachedElevationProvider
+
+        class MemoryRedis:
+            def __init__(self):
+                self.store = {}
+
+            async def get_many_json(self, keys):
+                return [self.store.get(k) for k in keys]
+
+            async def set_many_json(self, items, ttl):
+                self.store.update(items)
+
+        redis = MemoryRedis()
+        points = _points(5) + [(-10.0, -40.0)]
+        warm = CachedElevationProvider(CountingProvider(), redis=redis, ttl=60)
+        expected = await warm.lookup(points)
+
+        inner = CountingProvider()
+        cold = CachedElevationProvider(inner, redis=redis, ttl=60)
+        assert await cold.lookup(points) == expected
+        assert inner.batches == []
+        assert cold.stats()["redis_hits"] == 6
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_null_elevations_are_cached(self):
+        from app.domains.mapping.elevation import CachedElevationProvider
+
+        class NoData(CountingProvider):
+            async def lookup(self, points):
+                self.batches.append(points)
+                return [None] * len(points)
+
+        inner = NoData()
+        cache = CachedElevationProvider(inner)
+        await cache.lookup([(0.0, 0.0)])
+        assert await cache.lookup([(0.0, 0.0)]) == [None]
+        assert len(inner.batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_elevation_cache_stats_endpoint(client, monkeypatch):
+    from app.api.v1 import mapping
+    from app.domains.mapping.service import MappingService
+    service = MappingService(elevation=CountingProvider())
+    monkeypatch.setattr(mapping, "_service", service)
+    await client.get("/api/v1/mapping/elevation", params={"lat": -22.15, "lon": -42.92})
+    await client.get("/api/v1/mapping/elevation", params={"lat": -22.15, "lon": -42.92})
+    stats = (await client.get("/api/v1/mapping/elevation/cache-stats")).json()
+    assert stats["misses"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["entries"] == 1
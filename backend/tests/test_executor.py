@@ -0,0 +1,100 @@
+"""Tests for the calculation process-pool executor."""
+import os
+import pytest
+from app.core.executor import CalculationExecutor, ExecutorBusyError, WorkerCrashedError
+
+
+def _pid(_: int = 0) -> int:
+    return os.getpid()
+
+
+def _fail() -> None:
+    raise ValueError("Seção inválida")
+
+
+def _die() -> None:
+    os._exit(1)  # what an OOM kill looks like to the pool
+
+
+@pytest.fixture
+def executor():
+    ex = CalculationExecutor(max_workers=1, max_queue=1)
+    yield ex
+    ex.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_runs_in_worker_process(executor):
+    assert await executor.run(_pid, 1) != os.getpid()
+    assert executor.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_inline_when_not_offloaded(executor):
+    assert await executor.run(_pid, offload=False) == os.getpid()
+    assert await CalculationExecutor(max_workers=0, max_queue=0).run(_pid) == os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_worker_errors_propagate(executor):
+    with pytest.raises(ValueError, match="Seção"):
+        await executor.run(_fail)
+    assert executor.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_dead_worker_restarts_pool(executor):
+    with pytest.raises(WorkerCrashedError):
+        await executor.run(_die)
+    assert executor.in_flight == 0
+    assert await executor.run(_pid, 1) != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_raises_busy(executor):
+    executor._in_flight = executor.max_workers + executor.max_queue
+    with pytest.raises(ExecutorBusyError):
+        await executor.run(_pid)
+
+
+@pytest.mark.asyncio
+async def test_busy_executor_returns_503(client, monkeypatch):
+    from app.api.v1 import calculations
+    monkeypatch.setattr(calculations, "should_offload", lambda items: True)
+    monkeypatch.setattr(calculations.CALCULATION_EXECUTOR, "_in_flight", 10_000)
+    resp = await client.post("/api/v1/calculations/voltage-drop/batch", json={
+        "items": [{"current": 50, "length": 100, "cross_section": 50}],
+    })
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_offloaded_batch_matches_inline(client, monkeypatch):
+    from app.api.v1 import calculations
+    payload = {"items": [{"current": 50 + i, "length": 100, "cross_section": 50} for i in range(20)]}
+    inline = (await client.post("/api/v1/calculations/voltage-drop/batch", json=payload)).json()
+    monkeypatch.setattr(calculations, "should_offload", lambda items: True)
+    offloaded = (await client.post("/api/v1/calculations/voltage-drop/batch", json=payload)).json()
+    assert offloaded == inline
+
+
+def test_warm_worker_sizes_a_feeder(monkeypatch):
+    from app.domains.calculations import conductor_sizing
+    from app.domains.calculations.executor import _warm_worker
+    calls = []
+    optimize = conductor_sizing.optimize_conductor_sizes
+    monkeypatch.setattr(
+        "app.domains.calculations.service.optimize_conductor_sizes", lambda p: calls.append(p) or optimize(p)
+    )
+    _warm_worker()
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_aclose_stops_workers():
+    ex = CalculationExecutor(max_workers=1, max_queue=1)
+    assert await ex.run(_pid, 1) != os.getpid()
+    await ex.aclose()
+    assert ex._pool is None
+    await ex.aclose()  # idempotent
@@ -105,3 +105,308 @@ async def test_delete_conductor(client):
     conductor_id = resp.json()["id"]
     resp2 = await client.delete(f"/api/v1/infrastructure/conductors/{conductor_id}")
     assert resp2.status_code == 204
+
+
+# ── OSM import ──────────────────────────────────────────────────────────────
+
+def _osm_payload(project_id: int, pole_2_lat: float = -22.9010) -> dict:
+    """Three poles on one line plus a dangling stretch past the last pole (~111 m per 0.001° lat)."""
+    return {
+        "project_id": project_id,
+        "osm": {
+            "poles": [
+                {"osm_id": 1, "lat": -22.9000, "lon": -43.1, "tags": {"power": "pole", "ref": "P-10"}},
+                {"osm_id": 2, "lat": pole_2_lat, "lon": -43.1, "tags": {"power": "pole", "material": "wood"}},
+            ],
+            "towers": [{"osm_id": 3, "lat": -22.9030, "lon": -43.1, "tags": {"power": "tower"}}],
+            "power_lines": [{
+                "osm_id": 70,
+                "nodes": [1, 2, 99, 3, 100],
+                "tags": {"power": "minor_line", "voltage": "13800"},
+                "geometry": [
+                    {"lat": -22.9000, "lon": -43.1}, {"lat": pole_2_lat, "lon": -43.1},
+                    {"lat": -22.9020, "lon": -43.1}, {"lat": -22.9030, "lon": -43.1},
+                    {"lat": -22.9040, "lon": -43.1},
+                ],
+            }],
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_import_osm_splits_lines_at_poles(client):
+    project_id = (await client.post("/api/v1/projects/", json={"name": "Import OSM"})).json()["id"]
+    resp = await client.post("/api/v1/infrastructure/import/osm", json=_osm_payload(project_id))
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "project_id": project_id, "poles_created": 3, "poles_updated": 0,
+        "conductors_created": 2, "conductors_updated": 0, "skipped_stretches": 1,
+    }
+    poles = {p["osm_id"]: p for p in (await client.get(f"/api/v1/infrastructure/poles?project_id={project_id}")).json()}
+    assert poles[1]["code"] == "P-10"
+    assert poles[2]["pole_type"] == "madeira"
+    assert poles[3]["code"] == "OSM-3" and poles[3]["pole_type"] == "aço"
+
+    conductors = (await client.get(f"/api/v1/infrastructure/conductors?project_id={project_id}")).json()
+    spans = sorted(conductors, key=lambda c: c["osm_segment"])
+    assert [(c["pole_from_id"], c["pole_to_id"]) for c in spans] == [
+        (poles[1]["id"], poles[2]["id"]), (poles[2]["id"], poles[3]["id"]),
+    ]
+    assert spans[0]["length"] == pytest.approx(110.7, abs=0.5)
+    assert spans[1]["length"] == pytest.approx(221.4, abs=1.0)  # through the intermediate vertex
+    assert {c["voltage_level"] for c in spans} == {"MT"}
+
+
+@pytest.mark.asyncio
+async def test_import_osm_is_an_upsert(client):
+    project_id = (await client.post("/api/v1/projects/", json={"name": "Reimport"})).json()["id"]
+    await client.post("/api/v1/infrastructure/import/osm", json=_osm_payload(project_id))
+    conductor = (await client.get(f"/api/v1/infrastructure/conductors?project_id={project_id}")).json()[0]
+    await client.put(f"/api/v1/infrastructure/conductors/{conductor['id']}", json={"cross_section": 70.0})
+
+    resp = await client.post("/api/v1/infrastructure/import/osm", json=_osm_payload(project_id, pole_2_lat=-22.9015))
+    assert resp.json()["poles_created"] == 0 and resp.json()["poles_updated"] == 3
+    assert resp.json()["conductors_updated"] == 2
+
+    poles = (await client.get(f"/api/v1/infrastructure/poles?project_id={project_id}")).json()
+    assert len(poles) == 3
+    assert {p["osm_id"]: p["latitude"] for p in poles}[2] == -22.9015
+    conductors = (await client.get(f"/api/v1/infrastructure/conductors?project_id={project_id}")).json()
+    assert len(conductors) == 2
+    edited = next(c for c in conductors if c["id"] == conductor["id"])
+    assert edited["cross_section"] == 70.0  # user edits survive the re-import
+
+
+@pytest.mark.asyncio
+async def test_import_osm_unknown_project(client):
+    resp = await client.post("/api/v1/infrastructure/import/osm", json=_osm_payload(99999))
+    assert resp.status_code == 404
+
+
+# ── Bulk ────────────────────────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_bulk_create_update_delete_poles(client):
+    items = [{"code": f"P-{i:04d}", "latitude": -22.9 + i * 1e-4, "longitude": -43.1} for i in range(1500)]
+    resp = await client.post("/api/v1/infrastructure/poles/bulk", json={"items": items})
+    assert resp.status_code == 201
+    ids = resp.json()["ids"]
+    assert resp.json()["count"] == 1500 and len(set(ids)) == 1500
+    assert (await client.get(f"/api/v1/infrastructure/poles/{ids[42]}")).json()["code"] == "P-0042"
+
+    update = {"items": [{"id": ids[0], "pole_height": 12.0}, {"id": ids[1], "owner": "Enel-RJ"}]}
+    resp = await client.put("/api/v1/infrastructure/poles/bulk", json=update)
+    assert resp.status_code == 200
+    first = (await client.get(f"/api/v1/infrastructure/poles/{ids[0]}")).json()
+    assert first["pole_height"] == 12.0 and first["code"] == "P-0000"
+
+    resp = await client.request("DELETE", "/api/v1/infrastructure/poles/bulk", json={"ids": ids[:1000]})
+    assert resp.json()["count"] == 1000
+    assert len((await client.get("/api/v1/infrastructure/poles")).json()) == 500
+
+
+@pytest.mark.asyncio
+async def test_bulk_is_all_or_nothing(client):
+    ids = (await client.post("/api/v1/infrastructure/poles/bulk", json={"items": [{"code": "A"}, {"code": "B"}]})).json()["ids"]
+    resp = await client.put(
+        "/api/v1/infrastructure/poles/bulk",
+        json={"items": [{"id": ids[0], "code": "A2"}, {"id": 99999, "code": "X"}]},
+    )
+    assert resp.status_code == 404
+    assert "99999" in resp.json()["detail"]
+    assert (await client.get(f"/api/v1/infrastructure/poles/{ids[0]}")).json()["code"] == "A"
+
+    resp = await client.post("/api/v1/infrastructure/poles/bulk", json={"items": [{"code": "C"}, {"pole_type": "aço"}]})
+    assert resp.status_code == 422  # second item has no code; nothing is written
+    assert len((await client.get("/api/v1/infrastructure/poles")).json()) == 2
+    resp = await client.request("DELETE", "/api/v1/infrastructure/poles/bulk", json={"ids": [ids[0], ids[0]]})
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_conductors(client):
+    ids = (await client.post("/api/v1/infrastructure/poles/bulk", json={"items": [{"code": "A"}, {"code": "B"}]})).json()["ids"]
+    spans = [{"pole_from_id": ids[0], "pole_to_id": ids[1], "cross_section": 35.0, "length": 40.0}] * 3
+    resp = await client.post("/api/v1/infrastructure/conductors/bulk", json={"items": spans})
+    assert resp.status_code == 201
+    conductor_ids = resp.json()["ids"]
+
+    bad = [{"pole_from_id": ids[0], "pole_to_id": 99999, "cross_section": 35.0}]
+    resp = await client.post("/api/v1/infrastructure/conductors/bulk", json={"items": bad})
+    assert resp.status_code == 422
+
+    resp = await client.put(
+        "/api/v1/infrastructure/conductors/bulk",
+        json={"items": [{"id": cid, "cross_section": 70.0} for cid in conductor_ids]},
+    )
+    assert resp.status_code == 200
+    conductors = (await client.get("/api/v1/infrastructure/conductors")).json()
+    assert {c["cross_section"] for c in conductors} == {70.0}
+
+    # Removing a pole detaches its conductors instead of leaving dangling references
+    await client.request("DELETE", "/api/v1/infrastructure/poles/bulk", json={"ids": [ids[1]]})
+    conductors = (await client.get("/api/v1/infrastructure/conductors")).json()
+    assert {c["pole_to_id"] for c in conductors} == {None}
+    resp = await client.request("DELETE", "/api/v1/infrastructure/conductors/bulk", json={"ids": conductor_ids})
+    assert resp.json()["count"] == 3
+    assert (await client.get("/api/v1/infrastructure/conductors")).json() == []
+
+
+# ── Pagination ──────────────────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_list_poles_keyset_pages(client):
+    items = [{"code": f"P-{i}", "latitude": -22.9, "longitude": -43.1} for i in range(25)]
+    ids = (await client.post("/api/v1/infrastructure/poles/bulk", json={"items": items})).json()["ids"]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10, **({"after_id": cursor} if cursor else {})}
+        resp = await client.get("/api/v1/infrastructure/poles", params=params)
+        assert resp.status_code == 200
+        seen += [p["id"] for p in resp.json()]
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == sorted(ids)
+
+    # Rows inserted behind the cursor don't shift later pages
+    first = await client.get("/api/v1/infrastructure/poles", params={"limit": 10})
+    await client.post("/api/v1/infrastructure/poles/bulk", json={"items": [{"code": "NEW"}]})
+    second = await client.get("/api/v1/infrastructure/poles", params={"limit": 10, "after_id": first.headers["X-Next-Cursor"]})
+    assert second.json()[0]["id"] == ids[10]
+
+
+@pytest.mark.asyncio
+async def test_list_fields_projection(client):
+    await client.post("/api/v1/infrastructure/poles", json={"code": "P-1", "latitude": -22.9, "longitude": -43.1})
+    resp = await client.get("/api/v1/infrastructure/poles", params={"fields": "latitude,longitude"})
+    assert resp.status_code == 200
+    assert list(resp.json()[0]) == ["id", "latitude", "longitude"]
+    assert resp.json()[0]["latitude"] == -22.9
+    full = (await client.get("/api/v1/infrastructure/poles")).json()[0]
+    assert full["code"] == "P-1" and full["created_at"]
+
+    resp = await client.get("/api/v1/infrastructure/conductors", params={"fields": "length,voltage"})
+    assert resp.status_code == 422
+    assert "voltage" in resp.json()["detail"]
+
+    schema = (await client.get("/openapi.json")).json()
+    listing = schema["paths"]["/api/v1/infrastructure/poles"]["get"]["responses"]["200"]["content"]["application/json"]
+    assert listing["schema"]["items"]["$ref"].endswith("/PoleListItem")
+    assert schema["components"]["schemas"]["PoleListItem"]["required"] == ["id"]
+
+
+@pytest.mark.asyncio
+async def test_list_limit_is_capped(client, monkeypatch):
+    from app.domains.infrastructure import service
+    monkeypatch.setattr(service.settings, "list_max_page_size", 3)
+    await client.post("/api/v1/infrastructure/poles/bulk", json={"items": [{"code": str(i)} for i in range(5)]})
+    resp = await client.get("/api/v1/infrastructure/poles", params={"limit": 1000})
+    assert len(resp.json()) == 3
+    assert resp.headers["X-Next-Cursor"] == str(resp.json()[-1]["id"])
+
+
+# ── Spatial filters ─────────────────────────────────────────────────────────
+
+async def _grid_of_poles(client, project_id=None) -> list[int]:
+    """10 x 10 poles spaced 0.001° (~110 m) from (-22.900, -43.100)."""
+    items = [
+        {"code": f"G-{r}-{c}", "project_id": project_id, "latitude": -22.9 + r * 1e-3, "longitude": -43.1 + c * 1e-3}
+        for r in range(10) for c in range(10)
+    ]
+    return (await client.post("/api/v1/infrastructure/poles/bulk", json={"items": items})).json()["ids"]
+
+
+@pytest.mark.asyncio
+async def test_poles_bbox_filter(client):
+    await _grid_of_poles(client)
+    await client.post("/api/v1/infrastructure/poles", json={"code": "SEM-COORD"})
+    resp = await client.get("/api/v1/infrastructure/poles", params={"bbox": "-43.0975,-22.8975,-43.0945,-22.8955"})
+    assert resp.status_code == 200
+    assert sorted(p["code"] for p in resp.json()) == ["G-3-3", "G-3-4", "G-3-5", "G-4-3", "G-4-4", "G-4-5"]
+
+    page = await client.get(
+        "/api/v1/infrastructure/poles", params={"bbox": "-43.2,-23,-43.0,-22.8", "limit": 60, "fields": "code"}
+    )
+    assert len(page.json()) == 60
+    rest = await client.get(
+        "/api/v1/infrastructure/poles",
+        params={"bbox": "-43.2,-23,-43.0,-22.8", "after_id": page.headers["X-Next-Cursor"]},
+    )
+    assert len(rest.json()) == 40 and "X-Next-Cursor" not in rest.headers
+
+
+@pytest.mark.asyncio
+async def test_poles_radius_filter_tracks_moves(client):
+    ids = await _grid_of_poles(client)
+    params = {"near": "-22.9,-43.1", "radius": 160}  # diagonal neighbour is ~151 m away
+    resp = await client.get("/api/v1/infrastructure/poles", params=params)
+    assert sorted(p["code"] for p in resp.json()) == ["G-0-0", "G-0-1", "G-1-0", "G-1-1"]
+
+    # The grid index is refreshed after writes
+    await client.put(f"/api/v1/infrastructure/poles/{ids[99]}", json={"latitude": -22.9001, "longitude": -43.1001})
+    resp = await client.get("/api/v1/infrastructure/poles", params=params)
+    assert "G-9-9" in {p["code"] for p in resp.json()}
+
+
+@pytest.mark.asyncio
+async def test_poles_spatial_filter_validation(client):
+    for params in ({"bbox": "1,2,3"}, {"near": "-22.9,-43.1"}, {"bbox": "0,0,1,1", "near": "0,0", "radius": 10}):
+        resp = await client.get("/api/v1/infrastructure/poles", params=params)
+        assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_pole_location_kept_in_sync(db_session):
+    from app.domains.infrastructure.models import Pole
+    from app.domains.infrastructure.service import InfrastructureService
+    from app.domains.infrastructure.schemas import PoleCreate, PoleUpdate
+
+    svc = InfrastructureService(db_session)
+    pole = await svc.create_pole(PoleCreate(code="L-1", latitude=-22.9, longitude=-43.1))
+    stored = await db_session.get(Pole, pole.id)
+    assert stored.location.startswith("SRID=31983;POINT(694883.")  # UTM 23S easting/northing in metres
+    await svc.update_pole(pole.id, PoleUpdate(longitude=-43.2))
+    assert stored.location.startswith("SRID=31983;POINT(684")  # ~10 km west
+
+
+def test_spatial_filters_compile_to_postgis():
+    from sqlalchemy.dialects import postgresql
+    from app.domains.infrastructure.models import Pole
+    from app.domains.infrastructure.spatial import BoundingBox, Radius
+
+    bbox_sql = str(BoundingBox(-43.2, -23.0, -43.0, -22.8).sql(Pole).compile(dialect=postgresql.dialect()))
+    assert "poles.location && ST_Expand(ST_Transform(ST_MakeEnvelope(" in bbox_sql
+    radius_sql = str(Radius(-22.9, -43.1, 100).sql(Pole).compile(dialect=postgresql.dialect()))
+    assert radius_sql.startswith("ST_DWithin(poles.location, ST_Transform(ST_SetSRID(ST_MakePoint(")
+
+
+@pytest.mark.asyncio
+async def test_backfill_pole_locations(client, db_engine):
+    from sqlalchemy import text
+    from sqlalchemy.dialects import postgresql
+    from app.domains.infrastructure.models import Pole
+    from app.domains.infrastructure.spatial import location_ewkt, location_sql
+
+    project_id = (await client.post("/api/v1/projects/", json={"name": "Legado", "concessionaire": "Light"})).json()["id"]
+    poles = [
+        {"code": "A", "project_id": project_id, "latitude": -22.9, "longitude": -43.1},
+        {"code": "B", "project_id": project_id, "latitude": -22.91, "longitude": -43.11},
+        {"code": "C", "project_id": project_id},
+    ]
+    ids = (await client.post("/api/v1/infrastructure/poles/bulk", json={"items": poles})).json()["ids"]
+    async with db_engine.begin() as conn:  # rows written before location existed
+        await conn.execute(text("UPDATE poles SET location = NULL"))
+
+    resp = await client.post("/api/v1/infrastructure/poles/location/backfill", params={"project_id": project_id})
+    assert resp.status_code == 200
+    assert resp.json() == {"updated": 2}
+    async with db_engine.connect() as conn:
+        stored = (await conn.execute(text("SELECT id, location FROM poles ORDER BY id"))).all()
+    assert [pole_id for pole_id, _ in stored] == ids
+    assert [loc for _, loc in stored] == location_ewkt([-22.9, -22.91, None], [-43.1, -43.11, None])
+    assert (await client.post("/api/v1/infrastructure/poles/location/backfill")).json() == {"updated": 0}
+
+    sql = str(location_sql(Pole).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("ST_Transform(ST_SetSRID(ST_MakePoint(poles.longitude, poles.latitude), ")
@@ -46,3 +46,57 @@ class TestCoordinateConversion:
         """Rio de Janeiro longitudes should be in range -45 to -40."""
         result = self.service.convert_utm_to_wgs84(714316.0, 7549084.0, 23, "S")
         assert -45.0 < result.lon < -40.0
+
+
+class TestBatchCoordinateConversion:
+    """Vectorized UTM ↔ WGS84 conversion with cached transformers."""
+
+    def setup_method(self):
+        self.service = MappingService()
+
+    def test_batch_matches_single_point(self):
+        from app.domains.mapping.schemas import UTMBatchRequest
+        easting = [714316.0, 700000.0, 690000.5]
+        northing = [7549084.0, 7500000.0, 7460000.0]
+        result = self.service.convert_utm_to_wgs84_batch(UTMBatchRequest(easting=easting, northing=northing))
+        assert result.epsg == 31983
+        assert result.total == 3
+        for i, (e, n) in enumerate(zip(easting, northing)):
+            single = self.service.convert_utm_to_wgs84(e, n, 23, "S")
+            assert result.lat[i] == pytest.approx(single.lat)
+            assert result.lon[i] == pytest.approx(single.lon)
+
+    def test_round_trip(self):
+        import numpy as np
+        from app.domains.mapping.schemas import UTMBatchRequest, WGS84BatchRequest
+        rng = np.random.default_rng(0)
+        easting = rng.uniform(650_000, 750_000, 50_000).tolist()
+        northing = rng.uniform(7_450_000, 7_550_000, 50_000).tolist()
+        wgs = self.service.convert_utm_to_wgs84_batch(UTMBatchRequest(easting=easting, northing=northing))
+        back = self.service.convert_wgs84_to_utm_batch(WGS84BatchRequest(lat=wgs.lat, lon=wgs.lon))
+        assert back.epsg == 31983
+        assert np.allclose(back.easting, easting, atol=1e-3)
+        assert np.allclose(back.northing, northing, atol=1e-3)
+
+    def test_transformers_are_cached(self):
+        from app.domains.mapping.service import get_transformer
+        assert get_transformer(31983, 4326) is get_transformer(31983, 4326)
+
+    def test_mismatched_lengths_rejected(self):
+        from pydantic import ValidationError
+        from app.domains.mapping.schemas import UTMBatchRequest
+        with pytest.raises(ValidationError):
+            UTMBatchRequest(easting=[1.0, 2.0], northing=[1.0])
+
+
+@pytest.mark.asyncio
+async def test_convert_batch_endpoints(client):
+    resp = await client.post("/api/v1/mapping/convert-utm/batch", json={
+        "easting": [714316.0, 700000.0], "northing": [7549084.0, 7500000.0],
+    })
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["lat"][0] == pytest.approx(-22.15018, abs=0.02)
+    resp = await client.post("/api/v1/mapping/convert-wgs84/batch", json={"lat": data["lat"], "lon": data["lon"]})
+    assert resp.status_code == 200
+    assert resp.json()["easting"] == pytest.approx([714316.0, 700000.0], abs=1e-3)
@@ -0,0 +1,70 @@
+"""Tests for the Alembic migrations (SQLite file database, PostgreSQL as offline SQL)."""
+import sqlite3
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+
+_SCRIPTS = Path(__file__).resolve().parents[1] / "alembic"
+
+
+def _config(url: str) -> Config:
+    config = Config()  # no ini file: leaves the test run's logging alone
+    config.set_main_option("script_location", str(_SCRIPTS))
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def test_upgrade_seeds_project_stats_from_existing_rows(tmp_path):
+    path = tmp_path / "legacy.db"
+    config = _config(f"sqlite+aiosqlite:///{path}")
+    command.upgrade(config, "0001_initial_schema")
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO projects (id, name, concessionaire) VALUES (1, 'Legado', 'Light')")
+        conn.executemany(
+            "INSERT INTO poles (id, project_id, code, pole_type) VALUES (?, 1, ?, ?)",
+            [(1, "P1", "concreto"), (2, "P2", "concreto"), (3, "P3", "madeira")],
+        )
+        conn.executemany(
+            "INSERT INTO conductors (project_id, pole_from_id, pole_to_id, conductor_type, cross_section,"
+            " voltage_level, phases, length) VALUES (1, ?, ?, 'CA', 35, 'BT', 3, ?)",
+            [(1, 2, 40.5), (2, 3, None)],
+        )
+        conn.execute("INSERT INTO equipments (pole_id, equipment_type) VALUES (3, 'chave')")
+
+    command.upgrade(config, "head")
+    with sqlite3.connect(path) as conn:
+        stats = conn.execute("SELECT metric, key, value FROM project_stats ORDER BY metric, key").fetchall()
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(conductors)")]
+    assert stats == [
+        ("conductor_m", "BT", 40.5), ("conductors", "BT", 2.0), ("equipment", "chave", 1.0),
+        ("poles", "concreto", 2.0), ("poles", "madeira", 1.0),
+    ]
+    assert {"osm_id", "osm_segment"} <= set(columns)
+
+    command.downgrade(config, "0001_initial_schema")
+    command.upgrade(config, "head")
+
+
+def test_postgresql_upgrade_sql(capsys):
+    command.upgrade(_config("postgresql+asyncpg://u:p@db/sisdist"), "head", sql=True)
+    sql = capsys.readouterr().out
+    assert "ADD CONSTRAINT uq_poles_project_osm UNIQUE (project_id, osm_id)" in sql
+    assert "ADD CONSTRAINT uq_conductors_project_osm UNIQUE (project_id, osm_id, osm_segment)" in sql
+    assert "CREATE INDEX ix_poles_location ON poles USING gist (location)" in sql
+    assert "INSERT INTO project_stats" in sql
+    assert "UPDATE poles SET location = ST_Transform(" in sql
+
+
+def test_head_matches_models(tmp_path):
+    from sqlalchemy import create_engine
+    from alembic.autogenerate import compare_metadata
+    from alembic.migration import MigrationContext
+    from app.core.database import Base
+
+    path = tmp_path / "head.db"
+    command.upgrade(_config(f"sqlite+aiosqlite:///{path}"), "head")
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as conn:
+        diff = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+    engine.dispose()
+    assert diff == []
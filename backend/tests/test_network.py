@@ -0,0 +1,389 @@
+"""Tests for the radial network engine and project load flow."""
+import math
+import numpy as np
+import pytest
+from unittest.mock import patch
+from app.domains.calculations.network import build_radial_network, geodesic_distance_m
+from app.domains.calculations.load_flow import FeederEdges, solve_feeder, build_load_flow_response
+from app.domains.calculations.schemas import LoadFlowRequest, VoltageDropRequest
+from app.domains.calculations.voltage_drop import calculate_voltage_drop
+
+
+def _random_tree(n: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    parents = np.array([rng.integers(0, i) for i in range(1, n)])
+    pole_ids = np.arange(1, n + 1) * 10
+    conductor_ids = np.arange(1, n)
+    return pole_ids, conductor_ids, pole_ids[parents], pole_ids[1:]
+
+
+def _edges(m: int, length: float = 100.0, phases: int = 3) -> FeederEdges:
+    return FeederEdges(
+        length=np.full(m, length),
+        resistance=np.full(m, 0.641),
+        reactance=np.full(m, 0.300),
+        phases=np.full(m, phases),
+        limit_pct=np.full(m, 7.0),
+    )
+
+
+class TestRadialNetwork:
+    def test_chain_preorder_and_subtrees(self):
+        net = build_radial_network([1, 2, 3], [10, 11], [1, 2], [2, 3])
+        assert net.pole_ids[net.source] == 1
+        assert net.pole_ids[net.order].tolist() == [1, 2, 3]
+        assert net.subtree_end.tolist() == [3, 3, 3]
+        assert net.parent.tolist() == [-1, 0, 1]
+
+    def test_source_detected_regardless_of_edge_direction_listing(self):
+        net = build_radial_network([1, 2, 3], [10, 11], [2, 1], [3, 2])
+        assert net.pole_ids[net.source] == 1
+
+    def test_explicit_source(self):
+        net = build_radial_network([1, 2, 3], [10, 11], [1, 2], [2, 3], source_pole_id=3)
+        assert net.pole_ids[net.order].tolist() == [3, 2, 1]
+
+    def test_unknown_source_raises(self):
+        with pytest.raises(ValueError, match="origem"):
+            build_radial_network([1, 2], [10], [1], [2], source_pole_id=99)
+
+    def test_loop_and_island(self):
+        # 1-2-3-1 loop plus isolated pole 4
+        net = build_radial_network([1, 2, 3, 4], [10, 11, 12], [1, 2, 3], [2, 3, 1], source_pole_id=1)
+        assert len(net.loop_edges) == 1
+        assert net.position[net.node_of(4)] == -1
+
+    def test_subtree_and_path_sums_match_naive(self):
+        pole_ids, conductor_ids, frm, to = _random_tree(2000)
+        net = build_radial_network(pole_ids, conductor_ids, frm, to)
+        values = np.random.default_rng(1).random(len(pole_ids))
+        subtree = net.subtree_sum(values)
+        path = net.path_sum(values)
+        naive_subtree = values.copy()
+        naive_path = np.zeros(len(values))
+        for v in net.order[::-1]:
+            if net.parent[v] >= 0:
+                naive_subtree[net.parent[v]] += naive_subtree[v]
+        for v in net.order:
+            naive_path[v] = values[v] + (naive_path[net.parent[v]] if net.parent[v] >= 0 else 0.0)
+        assert np.allclose(subtree, naive_subtree)
+        assert np.allclose(path, naive_path)
+
+    def test_geodesic_distance(self):
+        # 0.001° of latitude ≈ 111.2 m
+        d = geodesic_distance_m(-22.150, -42.92, -22.151, -42.92)
+        assert float(d) == pytest.approx(111.2, rel=1e-2)
+
+
+class TestLoadFlow:
+    def test_chain_matches_segment_formula(self):
+        net = build_radial_network([1, 2, 3], [10, 11], [1, 2], [2, 3])
+        params = LoadFlowRequest(load_kva_per_pole=5.0, nominal_voltage=220.0, power_factor=0.92)
+        state = solve_feeder(net, _edges(2), params)
+        i_load = 5000.0 / (math.sqrt(3) * 220.0)
+
+        def seg(current):
+            return calculate_voltage_drop(VoltageDropRequest(
+                current=current, length=100, cross_section=50, power_factor=0.92, nominal_voltage=220.0,
+            )).voltage_drop_pct
+
+        resp = build_load_flow_response(state, project_id=1)
+        assert resp.pole_ids == [1, 2, 3]
+        assert resp.voltage_drop_pct[0] == 0.0
+        assert resp.voltage_drop_pct[1] == pytest.approx(seg(2 * i_load), abs=1e-3)
+        assert resp.voltage_drop_pct[2] == pytest.approx(seg(2 * i_load) + seg(i_load), abs=1e-3)
+        assert resp.worst_pole_id == 3
+        assert resp.source_current_a == pytest.approx(2 * i_load, abs=0.01)
+
+    def test_non_compliant_long_feeder(self):
+        pole_ids, conductor_ids, frm, to = _random_tree(500)
+        net = build_radial_network(pole_ids, conductor_ids, frm, to)
+        state = solve_feeder(net, _edges(len(conductor_ids), length=200.0), LoadFlowRequest())
+        resp = build_load_flow_response(state, project_id=1)
+        assert resp.all_compliant is False
+        assert resp.worst_voltage_drop_pct == max(resp.voltage_drop_pct)
+
+    def test_empty_network(self):
+        net = build_radial_network([], [], [], [])
+        resp = build_load_flow_response(solve_feeder(net, _edges(0), LoadFlowRequest()), project_id=1)
+        assert resp.pole_ids == []
+        assert resp.worst_pole_id is None
+
+
+async def _create_feeder(client, n: int = 4):
+    resp = await client.post("/api/v1/projects/", json={"name": "Alimentador", "concessionaire": "Light"})
+    project_id = resp.json()["id"]
+    pole_ids = []
+    for i in range(n):
+        resp = await client.post("/api/v1/infrastructure/poles", json={
+            "code": f"P-{i}", "project_id": project_id, "latitude": -22.15 - i * 0.0005, "longitude": -42.92,
+        })
+        pole_ids.append(resp.json()["id"])
+    conductor_ids = []
+    for a, b in zip(pole_ids, pole_ids[1:]):
+        resp = await client.post("/api/v1/infrastructure/conductors", json={
+            "project_id": project_id, "pole_from_id": a, "pole_to_id": b, "cross_section": 50, "phases": 3,
+        })
+        conductor_ids.append(resp.json()["id"])
+    return project_id, pole_ids, conductor_ids
+
+
+@pytest.mark.asyncio
+async def test_project_load_flow_endpoint(client):
+    project_id, pole_ids, _ = await _create_feeder(client)
+    resp = await client.get(f"/api/v1/projects/{project_id}/load-flow", params={"load_kva_per_pole": 10})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["source_pole_id"] == pole_ids[0]
+    assert data["pole_ids"] == pole_ids
+    assert data["worst_pole_id"] == pole_ids[-1]
+    drops = data["voltage_drop_pct"]
+    assert drops == sorted(drops) and drops[-1] > 0
+
+
+@pytest.mark.asyncio
+async def test_project_load_flow_not_found(client):
+    resp = await client.get("/api/v1/projects/99999/load-flow")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_project_load_flow_invalid_source(client):
+    project_id, _, _ = await _create_feeder(client, n=2)
+    resp = await client.get(f"/api/v1/projects/{project_id}/load-flow", params={"source_pole_id": 99999})
+    assert resp.status_code == 422
+
+
+class TestIncrementalLoadFlow:
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        from app.domains.calculations.feeder_cache import FEEDER_CACHE
+        FEEDER_CACHE.clear()
+        yield
+        FEEDER_CACHE.clear()
+
+    def _solve(self, n=300):
+        pole_ids, conductor_ids, frm, to = _random_tree(n)
+        net = build_radial_network(pole_ids, conductor_ids, frm, to)
+        return net, _edges(len(conductor_ids)), LoadFlowRequest()
+
+    def test_section_change_matches_full_solve(self):
+        from app.domains.calculations.feeder_cache import FeederStateCache
+        from app.domains.calculations.conductor_catalog import CONDUCTOR_CATALOG
+        net, edges, params = self._solve()
+        cache = FeederStateCache()
+        cache.put(1, solve_feeder(net, edges, params))
+        conductor_id = int(net.conductor_ids[5])
+        assert cache.apply_conductor_update(1, conductor_id, {"conductor_type": "CA", "cross_section": 16.0})
+
+        expected_edges = _edges(len(net.conductor_ids))
+        expected_edges.resistance[5], expected_edges.reactance[5] = CONDUCTOR_CATALOG.properties("CA", 16.0)
+        expected = solve_feeder(net, expected_edges, params)
+        assert np.allclose(cache.get(1, params).drop_pct, expected.drop_pct)
+
+    def test_length_and_phase_changes_match_full_solve(self):
+        from app.domains.calculations.feeder_cache import FeederStateCache
+        net, edges, params = self._solve()
+        cache = FeederStateCache()
+        cache.put(1, solve_feeder(net, edges, params))
+        cache.apply_conductor_update(1, int(net.conductor_ids[3]), {"length": 450.0})
+        cache.apply_conductor_update(1, int(net.conductor_ids[8]), {"phases": 1})
+
+        expected_edges = _edges(len(net.conductor_ids))
+        expected_edges.length[3] = 450.0
+        expected_edges.phases[8] = 1
+        expected = solve_feeder(net, expected_edges, params)
+        assert np.allclose(cache.get(1, params).drop_pct, expected.drop_pct)
+
+    def test_different_params_miss(self):
+        from app.domains.calculations.feeder_cache import FeederStateCache
+        net, edges, params = self._solve(10)
+        cache = FeederStateCache()
+        cache.put(1, solve_feeder(net, edges, params))
+        assert cache.get(1, LoadFlowRequest(load_kva_per_pole=1.0)) is None
+
+    @pytest.mark.asyncio
+    async def test_conductor_edit_updates_cached_load_flow(self, client):
+        from app.domains.calculations.feeder_cache import FEEDER_CACHE
+        project_id, pole_ids, conductor_ids = await _create_feeder(client)
+        url = f"/api/v1/projects/{project_id}/load-flow"
+        before = (await client.get(url)).json()
+        assert FEEDER_CACHE.get(project_id, LoadFlowRequest()) is not None
+
+        resp = await client.put(f"/api/v1/infrastructure/conductors/{conductor_ids[0]}", json={"cross_section": 16})
+        assert resp.status_code == 200
+        assert FEEDER_CACHE.get(project_id, LoadFlowRequest()) is not None
+        after = (await client.get(url)).json()
+        assert after["worst_voltage_drop_pct"] > before["worst_voltage_drop_pct"]
+
+        # Incremental result matches a full rebuild
+        FEEDER_CACHE.clear()
+        rebuilt = (await client.get(url)).json()
+        assert rebuilt["voltage_drop_pct"] == pytest.approx(after["voltage_drop_pct"], abs=1e-4)
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_edit_leaves_cache_untouched(self, client, db_engine):
+        from sqlalchemy.ext.asyncio import AsyncSession
+        from app.domains.calculations.feeder_cache import FEEDER_CACHE
+        from app.domains.infrastructure.schemas import ConductorUpdate
+        from app.domains.infrastructure.service import InfrastructureService
+        project_id, _, conductor_ids = await _create_feeder(client)
+        url = f"/api/v1/projects/{project_id}/load-flow"
+        before = (await client.get(url)).json()
+
+        async with AsyncSession(db_engine) as session:
+            service = InfrastructureService(session)
+            await service.update_conductor(conductor_ids[0], ConductorUpdate(cross_section=16))
+            await service.delete_conductor(conductor_ids[-1])
+            assert FEEDER_CACHE.get(project_id, LoadFlowRequest()) is not None  # nothing applied before commit
+            await session.rollback()
+
+        assert FEEDER_CACHE.get(project_id, LoadFlowRequest()) is not None
+        assert (await client.get(url)).json() == before
+
+    def test_stale_solve_is_not_cached(self):
+        from app.domains.calculations.feeder_cache import FeederStateCache
+        net, edges, params = self._solve(10)
+        cache = FeederStateCache()
+        generation = cache.generation(1)
+        cache.invalidate(1)  # a write commits while the rows are being read
+        cache.put(1, solve_feeder(net, edges, params), generation)
+        assert cache.get(1, params) is None
+
+    def test_uncached_conductor_update_blocks_stale_solve(self):
+        from app.domains.calculations.feeder_cache import FeederStateCache
+        net, edges, params = self._solve(10)
+        cache = FeederStateCache()
+        generation = cache.generation(1)
+        assert not cache.apply_conductor_update(1, int(net.conductor_ids[0]), {"length": 99.0})
+        cache.put(1, solve_feeder(net, edges, params), generation)
+        assert cache.get(1, params) is None
+
+    @pytest.mark.asyncio
+    async def test_conductor_edit_during_load_flow(self, client):
+        from app.domains.calculations.feeder_cache import FEEDER_CACHE
+        from app.domains.calculations.service import NetworkCalculationService
+        project_id, _, conductor_ids = await _create_feeder(client)
+        url = f"/api/v1/projects/{project_id}/load-flow"
+        load_network_data = NetworkCalculationService.load_network_data
+
+        async def edited_after_read(self, pid):
+            data = await load_network_data(self, pid)
+            resp = await client.put(f"/api/v1/infrastructure/conductors/{conductor_ids[0]}", json={"cross_section": 16})
+            assert resp.status_code == 200
+            return data
+
+        with patch.object(NetworkCalculationService, "load_network_data", edited_after_read):
+            stale = (await client.get(url)).json()
+        assert FEEDER_CACHE.get(project_id, LoadFlowRequest()) is None
+
+        fresh = (await client.get(url)).json()
+        assert fresh["worst_voltage_drop_pct"] > stale["worst_voltage_drop_pct"]
+
+    @pytest.mark.asyncio
+    async def test_conductor_create_invalidates(self, client):
+        from app.domains.calculations.feeder_cache import FEEDER_CACHE
+        project_id, pole_ids, _ = await _create_feeder(client)
+        await client.get(f"/api/v1/projects/{project_id}/load-flow")
+        await client.post("/api/v1/infrastructure/conductors", json={
+            "project_id": project_id, "pole_from_id": pole_ids[0], "pole_to_id": pole_ids[2], "cross_section": 50,
+        })
+        assert FEEDER_CACHE.get(project_id, LoadFlowRequest()) is None
+
+
+class TestConductorSizing:
+    def _problem(self, n=6, allowed=(16, 35, 70, 120), limit_pct=4.0, steps=2000, length=150.0, voltage=220.0):
+        from app.domains.calculations.conductor_catalog import CONDUCTOR_CATALOG
+        from app.domains.calculations.conductor_sizing import SizingProblem
+        pole_ids, conductor_ids, frm, to = _random_tree(n, seed=3)
+        net = build_radial_network(pole_ids, conductor_ids, frm, to)
+        m = len(conductor_ids)
+        params = LoadFlowRequest(load_kva_per_pole=8.0, nominal_voltage=voltage)
+        state = solve_feeder(net, _edges(m, length=length), params)
+        sections, r, x, cost = CONDUCTOR_CATALOG.candidate_columns(["CA"] * m, allowed and list(allowed))
+        problem = SizingProblem(
+            network=net, branch_current=state.branch_current, length=np.full(m, length),
+            phases=np.full(m, 3), candidate_resistance=r, candidate_reactance=x, candidate_cost=cost,
+            power_factor=params.power_factor, nominal_voltage=params.nominal_voltage,
+            limit_pct=limit_pct, budget_steps=steps,
+        )
+        return net, params, problem, sections
+
+    def _evaluate(self, net, params, problem, choice):
+        m = len(choice)
+        rows = np.arange(m)
+        edges = FeederEdges(
+            length=problem.length, resistance=problem.candidate_resistance[rows, choice],
+            reactance=problem.candidate_reactance[rows, choice], phases=problem.phases, limit_pct=np.full(m, 7.0),
+        )
+        drop = solve_feeder(net, edges, params).drop_pct.max()
+        return float((problem.candidate_cost[rows, choice] * problem.length).sum()), float(drop)
+
+    def test_matches_brute_force(self):
+        import itertools
+        from app.domains.calculations.conductor_sizing import optimize_conductor_sizes
+        net, params, problem, sections = self._problem()
+        candidates = np.flatnonzero(~np.isnan(problem.candidate_cost[0]))
+        best = math.inf
+        for combo in itertools.product(candidates, repeat=len(net.conductor_ids)):
+            cost, drop = self._evaluate(net, params, problem, np.array(combo))
+            if drop <= problem.limit_pct:
+                best = min(best, cost)
+
+        result = optimize_conductor_sizes(problem)
+        cost, drop = self._evaluate(net, params, problem, result.choice)
+        assert result.feasible
+        assert drop <= problem.limit_pct
+        assert cost == pytest.approx(best)
+        assert result.evaluated_candidates > 0
+
+    def test_infeasible_limit(self):
+        from app.domains.calculations.conductor_sizing import optimize_conductor_sizes
+        net, params, problem, sections = self._problem(limit_pct=0.01, steps=100)
+        result = optimize_conductor_sizes(problem)
+        assert result.feasible is False
+        # Falls back to the largest allowed section everywhere
+        assert set(sections[0, result.choice]) == {120.0}
+
+    def test_large_feeder_stays_within_limit(self):
+        from app.domains.calculations.conductor_sizing import optimize_conductor_sizes
+        net, params, problem, _ = self._problem(
+            n=3000, allowed=None, limit_pct=5.0, steps=200, length=400.0, voltage=13800.0
+        )
+        result = optimize_conductor_sizes(problem)
+        assert result.feasible
+        cost, drop = self._evaluate(net, params, problem, result.choice)
+        assert drop <= 5.0
+        assert len(set(result.choice.tolist())) > 1
+        largest = np.full(len(result.choice), 9)
+        assert cost < self._evaluate(net, params, problem, largest)[0]
+
+    def test_budget_steps_capped_by_segment_count(self, monkeypatch):
+        from app.domains.calculations import conductor_sizing
+        net, params, problem, _ = self._problem(
+            n=3000, allowed=None, limit_pct=5.0, steps=2000, length=400.0, voltage=13800.0
+        )
+        monkeypatch.setattr(conductor_sizing, "_MAX_CHOICE_CELLS", 300_000)
+        result = conductor_sizing.optimize_conductor_sizes(problem)
+        assert result.budget_steps == 300_000 // 2999 - 1
+        assert result.feasible
+        assert self._evaluate(net, params, problem, result.choice)[1] <= 5.0
+
+
+@pytest.mark.asyncio
+async def test_project_conductor_sizing_endpoint(client):
+    project_id, _, conductor_ids = await _create_feeder(client, n=5)
+    url = f"/api/v1/calculations/conductor-sizing/project/{project_id}"
+    resp = await client.post(url, json={"load_kva_per_pole": 15, "budget_steps": 100})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["feasible"] is True
+    assert data["conductor_ids"] == conductor_ids
+    assert data["worst_voltage_drop_pct"] <= data["limit_pct"]
+    # Sections never grow downstream of a more lightly loaded branch
+    assert data["sections"] == sorted(data["sections"], reverse=True)
+    assert data["evaluated_candidates"] > 0
+    assert data["budget_steps"] == 100
+
+    resp = await client.post("/api/v1/calculations/conductor-sizing/project/99999", json={})
+    assert resp.status_code == 404
@@ -1,5 +1,6 @@
 """Tests for projects domain."""
 import pytest
+from unittest.mock import patch
 
 
 @pytest.mark.asyncio
@@ -78,3 +79,201 @@ async def test_material_list(client):
 async def test_material_list_not_found(client):
     resp = await client.get("/api/v1/projects/99999/material-list")
     assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_project_network_snapshot(client, db_engine):
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from app.domains.infrastructure.models import Equipment
+
+    project_id = (await client.post("/api/v1/projects/", json={"name": "Topologia"})).json()["id"]
+    poles = [{"code": f"P{i}", "project_id": project_id, "latitude": -22.9 - i * 1e-3, "longitude": -43.1} for i in range(3)]
+    pole_ids = (await client.post("/api/v1/infrastructure/poles/bulk", json={"items": poles})).json()["ids"]
+    spans = [
+        {"project_id": project_id, "pole_from_id": pole_ids[0], "pole_to_id": pole_ids[1], "cross_section": 35.0},
+        {"project_id": project_id, "pole_from_id": pole_ids[1], "pole_to_id": pole_ids[2], "cross_section": 16.0},
+    ]
+    await client.post("/api/v1/infrastructure/conductors/bulk", json={"items": spans})
+    async with AsyncSession(db_engine) as session:
+        session.add(Equipment(pole_id=pole_ids[2], equipment_type="transformador"))
+        await session.commit()
+
+    resp = await client.get(f"/api/v1/projects/{project_id}/network")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["poles"]["id"] == pole_ids
+    assert data["poles"]["code"] == ["P0", "P1", "P2"]
+    assert data["conductors"]["from_index"] == [0, 1]
+    assert data["conductors"]["to_index"] == [1, 2]
+    assert data["conductors"]["cross_section"] == [35.0, 16.0]
+    assert data["equipment"]["pole_index"] == [2]
+    assert data["equipment"]["equipment_type"] == ["transformador"]
+
+    etag = resp.headers["ETag"]
+    cached = await client.get(f"/api/v1/projects/{project_id}/network", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    await client.put(f"/api/v1/infrastructure/poles/{pole_ids[0]}", json={"pole_height": 12.0})
+    changed = await client.get(f"/api/v1/projects/{project_id}/network", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_project_network_empty_and_not_found(client):
+    project_id = (await client.post("/api/v1/projects/", json={"name": "Vazio"})).json()["id"]
+    data = (await client.get(f"/api/v1/projects/{project_id}/network")).json()
+    assert data["poles"]["id"] == [] and data["conductors"]["from_index"] == [] and data["equipment"]["id"] == []
+    assert (await client.get("/api/v1/projects/99999/network")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_project_network_equipment_on_unlisted_pole(client, db_engine):
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from app.domains.infrastructure.models import Equipment
+    from app.domains.infrastructure.repository import NetworkRepository
+
+    project_id = (await client.post("/api/v1/projects/", json={"name": "Concorrente"})).json()["id"]
+    poles = [{"code": f"P{i}", "project_id": project_id, "latitude": -22.9, "longitude": -43.1 - i * 1e-3} for i in range(2)]
+    pole_ids = (await client.post("/api/v1/infrastructure/poles/bulk", json={"items": poles})).json()["ids"]
+    async with AsyncSession(db_engine) as session:
+        session.add(Equipment(pole_id=pole_ids[1], equipment_type="chave"))
+        await session.commit()
+
+    pole_rows = NetworkRepository.pole_rows
+
+    async def first_pole_only(self, pid):
+        return (await pole_rows(self, pid))[:1]
+
+    with patch.object(NetworkRepository, "pole_rows", first_pole_only):
+        resp = await client.get(f"/api/v1/projects/{project_id}/network")
+    assert resp.status_code == 200
+    assert resp.json()["equipment"]["pole_index"] == [-1]
+
+
+async def _material_project(client, db_engine, concessionaire="Light") -> int:
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from app.domains.infrastructure.models import Equipment
+
+    project_id = (await client.post("/api/v1/projects/", json={"name": "Material", "concessionaire": concessionaire})).json()["id"]
+    poles = [{"code": f"P{i}", "project_id": project_id, "pole_type": "concreto", "pole_height": 11.0, "pole_class": "300"} for i in range(3)]
+    poles.append({"code": "P9", "project_id": project_id, "pole_type": "madeira", "pole_height": 9.0})
+    pole_ids = (await client.post("/api/v1/infrastructure/poles/bulk", json={"items": poles})).json()["ids"]
+    spans = [
+        {"project_id": project_id, "conductor_type": "CAA", "cross_section": 35.0, "phases": 3, "length": 40.0},
+        {"project_id": project_id, "conductor_type": "CAA", "cross_section": 35.0, "phases": 3, "length": 35.5},
+        {"project_id": project_id, "conductor_type": "CA", "cross_section": 16.0, "phases": 1, "length": 20.0},
+        {"project_id": project_id, "conductor_type": "CA", "cross_section": 16.0, "phases": 1},
+    ]
+    await client.post("/api/v1/infrastructure/conductors/bulk", json={"items": spans})
+    async with AsyncSession(db_engine) as session:
+        session.add_all([Equipment(pole_id=pole_ids[0], equipment_type="Transformador 75 kVA") for _ in range(2)])
+        await session.commit()
+    return project_id
+
+
+@pytest.mark.asyncio
+async def test_material_list_aggregates(client, db_engine):
+    project_id = await _material_project(client, db_engine)
+    data = (await client.get(f"/api/v1/projects/{project_id}/material-list")).json()
+    assert data["concessionaire"] == "Light"
+    items = {item["codigo"]: item for item in data["items"]}
+    assert items["LIGHT-PST-CC-11-300"]["quantidade"] == 3
+    assert items["LIGHT-PST-MD-9-ND"]["quantidade"] == 1
+    assert items["LIGHT-CAB-CAA-35"]["quantidade"] == pytest.approx(3 * 75.5)
+    assert items["LIGHT-CAB-CA-16"]["quantidade"] == pytest.approx(20.0)  # span without length adds nothing
+    assert items["LIGHT-EQP-TRANSFORMADO"]["quantidade"] == 2
+    assert data["total_items"] == len(data["items"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_material_list_csv_and_xlsx(client, db_engine):
+    import io
+    import zipfile
+
+    project_id = await _material_project(client, db_engine, concessionaire="Enel-RJ")
+    resp = await client.get(f"/api/v1/projects/{project_id}/material-list", params={"format": "csv"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    lines = resp.content.decode("utf-8-sig").splitlines()
+    assert lines[0] == "Categoria;Código;Descrição;Unidade;Quantidade"
+    assert "condutor;ENEL-CAB-CAA-35;Cabo CAA 35 mm² (fases × comprimento do vão);m;226,50" in lines
+
+    resp = await client.get(f"/api/v1/projects/{project_id}/material-list", params={"format": "xlsx"})
+    assert resp.status_code == 200
+    assert "attachment" in resp.headers["content-disposition"]
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as package:
+        sheet = package.read("xl/worksheets/sheet1.xml").decode()
+    assert "ENEL-PST-CC-11-300" in sheet and "<v>226.5</v>" in sheet
+
+    assert (await client.get(f"/api/v1/projects/{project_id}/material-list", params={"format": "pdf"})).status_code == 422
+
+
+async def _stats(client, project_id) -> dict:
+    projects = (await client.get("/api/v1/projects/")).json()
+    return next(p["stats"] for p in projects if p["id"] == project_id)
+
+
+@pytest.mark.asyncio
+async def test_project_stats_follow_writes(client):
+    project_id = (await client.post("/api/v1/projects/", json={"name": "Stats", "concessionaire": "Light"})).json()["id"]
+    assert (await _stats(client, project_id))["poles_total"] == 0
+
+    poles = [{"code": f"P{i}", "project_id": project_id} for i in range(3)]
+    pole_ids = (await client.post("/api/v1/infrastructure/poles/bulk", json={"items": poles})).json()["ids"]
+    single = (await client.post("/api/v1/infrastructure/poles", json={"code": "M1", "project_id": project_id, "pole_type": "madeira"})).json()
+    spans = [
+        {"project_id": project_id, "conductor_type": "CAA", "cross_section": 35.0, "length": 400.0},
+        {"project_id": project_id, "conductor_type": "CAA", "cross_section": 35.0, "voltage_level": "MT", "length": 1500.0},
+    ]
+    conductor_ids = (await client.post("/api/v1/infrastructure/conductors/bulk", json={"items": spans})).json()["ids"]
+
+    stats = await _stats(client, project_id)
+    assert stats["poles_total"] == 4 and stats["poles_by_type"] == {"concreto": 3, "madeira": 1}
+    assert stats["conductors_total"] == 2
+    assert stats["conductor_km_by_voltage"] == {"BT": 0.4, "MT": 1.5}
+    assert stats["conductor_km_total"] == pytest.approx(1.9)
+
+    await client.put(f"/api/v1/infrastructure/poles/{single['id']}", json={"pole_type": "concreto"})
+    await client.put("/api/v1/infrastructure/poles/bulk", json={"items": [{"id": pole_ids[0], "pole_type": "aço"}]})
+    await client.put(f"/api/v1/infrastructure/conductors/{conductor_ids[0]}", json={"voltage_level": "MT"})
+    await client.put("/api/v1/infrastructure/conductors/bulk", json={"items": [{"id": conductor_ids[1], "length": 600.0}]})
+    stats = await _stats(client, project_id)
+    assert stats["poles_by_type"] == {"concreto": 3, "aço": 1}
+    assert stats["conductor_km_by_voltage"] == {"MT": 1.0}
+
+    await client.delete(f"/api/v1/infrastructure/poles/{single['id']}")
+    await client.request("DELETE", "/api/v1/infrastructure/poles/bulk", json={"ids": pole_ids[:2]})
+    await client.request("DELETE", "/api/v1/infrastructure/conductors/bulk", json={"ids": conductor_ids[:1]})
+    stats = await _stats(client, project_id)
+    assert stats["poles_by_type"] == {"concreto": 1} and stats["conductors_total"] == 1
+    assert stats["conductor_km_total"] == pytest.approx(0.6)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_project_stats(client, db_engine):
+    project_id = await _material_project(client, db_engine)
+    stats = await _stats(client, project_id)
+    assert stats["equipment_total"] == 0  # equipment rows were written outside the service
+
+    resp = await client.post(f"/api/v1/projects/{project_id}/stats/rebuild")
+    assert resp.status_code == 200
+    rebuilt = resp.json()
+    assert rebuilt["equipment_by_type"] == {"Transformador 75 kVA": 2}
+    assert rebuilt["poles_by_type"] == stats["poles_by_type"] == {"concreto": 3, "madeira": 1}
+    assert rebuilt["conductors_total"] == stats["conductors_total"] == 4
+    assert rebuilt["conductor_km_total"] == pytest.approx(stats["conductor_km_total"])
+    assert await _stats(client, project_id) == rebuilt
+
+    assert (await client.post("/api/v1/projects/99999/stats/rebuild")).status_code == 404
+
+
+def test_material_csv_keeps_large_quantities_exact():
+    from app.domains.projects.material_catalog import conductor_item, pole_item
+    from app.domains.projects.material_export import iter_csv
+
+    items = [conductor_item("Light", "CAA", 35.0, 4512345.67), conductor_item("Light", "CA", 16.0, 123456.78)]
+    items.append(pole_item("Light", "concreto", 11.0, "300", 52000))
+    rows = "".join(iter_csv(items)).lstrip("\ufeff").splitlines()
+    assert [row.rsplit(";", 1)[1] for row in rows[1:]] == ["4512345,67", "123456,78", "52000"]
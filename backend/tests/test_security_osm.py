@@ -67,11 +67,8 @@ class TestOSMService:
         mock_client = AsyncMock()
         mock_client.post = AsyncMock(return_value=mock_resp)
 
-        with patch("app.domains.mapping.osm_service.httpx.AsyncClient") as mock_cls:
-            mock_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
-
-            result = await fetch_osm_data(-22.15018, -42.92185, 500)
+        with patch("app.domains.mapping.osm_service.get_http_pool", return_value=mock_client):
+            result = await fetch_osm_data(-22.15018, -42.92185, 2000)
 
         assert len(result.poles) == 1
         assert result.poles[0].osm_id == 1
@@ -104,11 +101,8 @@ class TestOSMService:
         mock_client = AsyncMock()
         mock_client.post = AsyncMock(return_value=mock_resp)
 
-        with patch("app.domains.mapping.osm_service.httpx.AsyncClient") as mock_cls:
-            mock_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
-
-            result = await fetch_osm_data(-22.15018, -42.92185, 100)
+        with patch("app.domains.mapping.osm_service.get_http_pool", return_value=mock_client):
+            result = await fetch_osm_data(-22.15018, -42.92185, 250)
 
         assert len(result.power_lines) == 1
         assert result.power_lines[0].osm_id == 100
@@ -131,11 +125,8 @@ class TestOSMService:
         mock_client = AsyncMock()
         mock_client.post = AsyncMock(return_value=mock_resp)
 
-        with patch("app.domains.mapping.osm_service.httpx.AsyncClient") as mock_cls:
-            mock_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
-
-            result = await fetch_osm_data(-22.15018, -42.92185, 1000)
+        with patch("app.domains.mapping.osm_service.get_http_pool", return_value=mock_client):
+            result = await fetch_osm_data(-22.15018, -42.92185, 2000)
 
         assert len(result.substations) == 2
 
@@ -151,13 +142,298 @@ class TestOSMService:
         mock_client = AsyncMock()
         mock_client.post = AsyncMock(return_value=mock_resp)
 
-        with patch("app.domains.mapping.osm_service.httpx.AsyncClient") as mock_cls:
-            mock_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
-
+        with patch("app.domains.mapping.osm_service.get_http_pool", return_value=mock_client):
             result = await fetch_osm_data(-22.15018, -42.92185, 500)
 
         assert result.total_elements == 0
         assert result.poles == []
         assert result.power_lines == []
         assert result.substations == []
+
+
+class _MemoryCache:
+    def __init__(self):
+        self.store = {}
+
+    async def get_json(self, key):
+        return self.store.get(key)
+
+    async def set_json(self, key, value, ttl):
+        self.store[key] = value
+
+
+class TestOSMCache:
+    """Tile-aligned OSM cache (Redis replaced by an in-memory store)."""
+
+    def test_nearby_requests_share_a_tile(self):
+        from app.domains.mapping.osm_service import osm_tile
+        a = osm_tile(-22.15018, -42.92185, 500)
+        b = osm_tile(-22.15030, -42.92170, 400)
+        assert a.key == b.key
+        assert osm_tile(-22.15018, -42.92185, 1500).key != a.key
+        assert osm_tile(-22.20, -42.92185, 500).key != a.key
+
+    def test_tile_query_covers_request(self):
+        from app.domains.mapping.osm_service import osm_tile, _METERS_PER_DEGREE
+        import math
+        lat, lon, radius = -22.15018, -42.92185, 500
+        tile = osm_tile(lat, lon, radius)
+        dy = (lat - tile.lat) * _METERS_PER_DEGREE
+        dx = (lon - tile.lon) * _METERS_PER_DEGREE * math.cos(math.radians(tile.lat))
+        assert math.hypot(dx, dy) + radius <= tile.radius
+
+    def test_tile_queries_stay_within_limit(self):
+        from app.domains.mapping.osm_service import osm_tile
+        for radius in (50, 250, 900, 2000, 3500, 3501, 5000):
+            assert osm_tile(-22.15018, -42.92185, radius).radius <= 5000
+        exact = osm_tile(-22.15018, -42.92185, 5000)
+        assert (exact.lat, exact.lon, exact.radius) == (-22.15018, -42.92185, 5000)
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_response_is_cut_to_requested_circle(self):
+        from app.domains.mapping.osm_service import fetch_osm_data
+        lat, lon = -22.15018, -42.92185
+        dlat = 1 / 111_320.0  # one metre north
+        mock_resp = MagicMock()
+        mock_resp.raise_for_status = MagicMock()
+        mock_resp.json.return_value = {"elements": [
+            {"type": "node", "id": 1, "lat": lat + 80 * dlat, "lon": lon, "tags": {"power": "pole"}},
+            {"type": "node", "id": 2, "lat": lat + 300 * dlat, "lon": lon, "tags": {"power": "pole"}},
+            # Span crossing the circle with both ends outside it
+            {"type": "way", "id": 10, "nodes": [3, 4], "tags": {"power": "line"},
+             "geometry": [{"lat": lat - 200 * dlat, "lon": lon}, {"lat": lat + 200 * dlat, "lon": lon}]},
+            {"type": "way", "id": 11, "nodes": [2, 5], "tags": {"power": "line"},
+             "geometry": [{"lat": lat + 300 * dlat, "lon": lon}, {"lat": lat + 400 * dlat, "lon": lon}]},
+        ]}
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(return_value=mock_resp)
+
+        with patch("app.domains.mapping.osm_service.get_http_pool", return_value=mock_client):
+            result = await fetch_osm_data(lat, lon, 100)
+
+        assert [p.osm_id for p in result.poles] == [1]
+        assert [w.osm_id for w in result.power_lines] == [10]
+        assert result.total_elements == 2
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_cache_hit_skips_overpass(self, monkeypatch):
+        from app.domains.mapping import osm_service
+        cache = _MemoryCache()
+        monkeypatch.setattr(osm_service, "get_cache", lambda: cache)
+        monkeypatch.setattr(osm_service.settings, "osm_cache_ttl", 3600)
+
+        mock_resp = MagicMock()
+        mock_resp.raise_for_status = MagicMock()
+        mock_resp.json.return_value = {"elements": [
+            {"type": "node", "id": 1, "lat": -22.15, "lon": -42.92, "tags": {"power": "pole"}},
+            {"type": "way", "id": 9, "nodes": [1, 2], "tags": {"power": "line"},
+             "geometry": [{"lat": -22.15, "lon": -42.92}, {"lat": -22.151, "lon": -42.921}]},
+        ]}
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(return_value=mock_resp)
+
+        with patch("app.domains.mapping.osm_service.get_http_pool", return_value=mock_client):
+            first = await osm_service.fetch_osm_data(-22.15018, -42.92185, 500)
+            second = await osm_service.fetch_osm_data(-22.15025, -42.92180, 450)
+
+        assert mock_client.post.await_count == 1
+        assert second == first
+        assert second.power_lines[0].geometry[1] == {"lat": -22.151, "lon": -42.921}
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_redis_outage_is_a_miss(self):
+        from app.core.cache import RedisCache
+        cache = RedisCache("redis://127.0.0.1:1/0")
+        assert await cache.get_json("x") is None
+        await cache.set_json("x", [1], ttl=60)  # no exception
+        assert cache._get_client() is None  # skipped until the retry window passes
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_large_payloads_are_compressed(self):
+        from app.core.cache import RedisCache
+        stored = {}
+
+        class FakeRedis:
+            async def get(self, key):
+                return stored.get(key)
+
+            async def set(self, key, value, ex=None):
+                stored[key] = value
+
+        cache = RedisCache("redis://unused")
+        cache._client = FakeRedis()
+        value = [["n", i, -22.15, -42.92, {"power": "pole"}] for i in range(200)]
+        await cache.set_json("tile", value, ttl=60)
+        assert stored["sisdist:tile"][:1] == b"z"
+        assert await cache.get_json("tile") == value
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_unreadable_entries_are_dropped_misses(self):
+        from app.core.cache import RedisCache
+        stored = {
+            "sisdist:zip": b"z" + b"not zlib",
+            "sisdist:json": b"j{broken",
+            "sisdist:foreign": b"plain text",
+            "sisdist:ok": b"j[1]",
+        }
+
+        class FakeRedis:
+            async def get(self, key):
+                return stored.get(key)
+
+            async def mget(self, keys):
+                return [stored.get(key) for key in keys]
+
+            async def delete(self, *keys):
+                for key in keys:
+                    stored.pop(key, None)
+
+        cache = RedisCache("redis://unused")
+        cache._client = FakeRedis()
+        assert await cache.get_json("zip") is None
+        assert await cache.get_many_json(["json", "ok", "foreign"]) == [None, [1], None]
+        assert list(stored) == ["sisdist:ok"]
+        assert cache._get_client() is not None  # not an outage
+
+
+class TestHTTPClientPool:
+    """Shared outbound client: reuse metrics and per-host caps (local mock transport)."""
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_requests_share_one_client_and_count(self):
+        import httpx
+        from app.core.http import HTTPClientPool
+        pool = HTTPClientPool(per_host_limit=2)
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True}))
+        client = pool.client()
+        assert pool.client() is client
+        client._transport = transport
+        for _ in range(3):
+            resp = await pool.get("https://api.opentopodata.org/v1/srtm90m?locations=0,0")
+            assert resp.json() == {"ok": True}
+        stats = pool.stats()
+        assert stats["requests"] == 3
+        assert stats["connections_reused"] == 3 - stats["connections_opened"]
+        await pool.aclose()
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_per_host_concurrency_cap(self):
+        import asyncio
+        import httpx
+        from app.core.http import HTTPClientPool
+        pool = HTTPClientPool(per_host_limit=2)
+        active = peak = 0
+
+        async def handler(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200)
+
+        pool.client()._transport = httpx.MockTransport(handler)
+        await asyncio.gather(*(pool.get("https://overpass-api.de/api/interpreter") for _ in range(6)))
+        assert peak == 2
+        await pool.aclose()
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_relayed_streams_do_not_block_requests(self):
+        import asyncio
+        import httpx
+        from app.core.http import HTTPClientPool
+        url = "https://overpass-api.de/api/interpreter"
+        pool = HTTPClientPool(per_host_limit=1, stream_per_host_limit=1)
+        pool.client()._transport = httpx.MockTransport(lambda request: httpx.Response(200, content=b"{}"))
+
+        async with pool.stream("POST", url, relayed=True):  # a slow client still reading
+            assert (await asyncio.wait_for(pool.get(url), timeout=1)).status_code == 200
+            waiting = pool.stream("POST", url, relayed=True)
+            second = asyncio.ensure_future(waiting.__aenter__())
+            await asyncio.sleep(0.05)
+            assert not second.done()  # the streaming cap is still enforced
+        assert (await asyncio.wait_for(second, timeout=1)).status_code == 200
+        await waiting.__aexit__(None, None, None)
+        await pool.aclose()
+
+
+@pytest.mark.asyncio(mode="auto")
+async def test_http_stats_endpoint(client):
+    resp = await client.get("/api/v1/mapping/http-stats")
+    assert resp.status_code == 200
+    assert {"requests", "connections_opened", "connections_reused", "reuse_ratio"} <= resp.json().keys()
+
+
+_OVERPASS_BODY = {
+    "version": 0.6,
+    "osm3s": {"copyright": "The data included in this document is from www.openstreetmap.org."},
+    "elements": [
+        {"type": "node", "id": 1, "lat": -22.15, "lon": -42.92, "tags": {"power": "pole", "operator": "Enel — São Gonçalo"}},
+        {"type": "node", "id": 2, "lat": -22.16, "lon": -42.93, "tags": {"power": "tower"}},
+        {"type": "node", "id": 3, "lat": -22.17, "lon": -42.94, "tags": {"power": "transformer"}},
+        {"type": "node", "id": 4, "lat": -22.18, "lon": -42.95, "tags": {"power": "portal"}},
+        {"type": "way", "id": 100, "nodes": [1, 2], "tags": {"power": "line"},
+         "geometry": [{"lat": -22.15, "lon": -42.92}, {"lat": -22.16, "lon": -42.93}]},
+    ],
+}
+
+
+async def _chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+class TestStreamingParser:
+    @pytest.mark.asyncio(mode="auto")
+    @pytest.mark.parametrize("size", [1, 7, 64, 100_000])
+    async def test_items_survive_any_chunking(self, size):
+        import json
+        from app.domains.mapping.json_stream import iter_array_items
+        body = json.dumps(_OVERPASS_BODY, ensure_ascii=False).encode()
+        items = [item async for item in iter_array_items(_chunked(body, size), "elements")]
+        assert items == _OVERPASS_BODY["elements"]
+
+    @pytest.mark.asyncio(mode="auto")
+    async def test_truncated_body_raises(self):
+        import json
+        from app.domains.mapping.json_stream import iter_array_items
+        body = json.dumps(_OVERPASS_BODY).encode()[:-40]
+        with pytest.raises(ValueError, match="incompleta"):
+            [item async for item in iter_array_items(_chunked(body, 50), "elements")]
+
+
+def _streaming_pool(status: int = 200):
+    import json
+    import httpx
+    from app.core.http import HTTPClientPool
+    pool = HTTPClientPool()
+    body = json.dumps(_OVERPASS_BODY, ensure_ascii=False).encode()
+    pool.client()._transport = httpx.MockTransport(lambda request: httpx.Response(status, content=body))
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_osm_stream_endpoint(client):
+    import json
+    with patch("app.domains.mapping.osm_service.get_http_pool", return_value=_streaming_pool()):
+        resp = await client.get("/api/v1/mapping/osm/stream", params={"lat": -22.15, "lon": -42.92, "radius": 5000})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["kind"] for r in records] == ["pole", "tower", "substation", "power_line", "summary"]
+    assert records[0]["tags"]["operator"] == "Enel — São Gonçalo"
+    assert records[3]["geometry"][1] == {"lat": -22.16, "lon": -42.93}
+    assert records[-1]["total_elements"] == 5
+    assert records[-1]["substations"] == 1
+
+    with patch("app.domains.mapping.osm_service.get_http_pool", return_value=_streaming_pool()):
+        resp = await client.get("/api/v1/mapping/osm/stream", params={"lat": -22.15, "lon": -42.92, "radius": 500})
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["kind"] for r in records] == ["pole", "power_line", "summary"]
+
+
+@pytest.mark.asyncio
+async def test_osm_stream_upstream_error_is_502(client):
+    with patch("app.domains.mapping.osm_service.get_http_pool", return_value=_streaming_pool(status=429)):
+        resp = await client.get("/api/v1/mapping/osm/stream", params={"lat": -22.15, "lon": -42.92})
+    assert resp.status_code == 502
@@ -42,9 +42,7 @@ class TestMappingServiceElevation:
         mock_client = AsyncMock()
         mock_client.get = AsyncMock(return_value=mock_resp)
 
-        with patch("app.domains.mapping.service.httpx.AsyncClient") as mock_cls:
-            mock_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+        with patch("app.domains.mapping.service.get_http_pool", return_value=mock_client):
             result = await svc.fetch_elevation(-22.15018, -42.92185)
 
         assert result.elevation == pytest.approx(850.5)
@@ -62,9 +60,7 @@ class TestMappingServiceElevation:
         mock_client = AsyncMock()
         mock_client.get = AsyncMock(return_value=mock_resp)
 
-        with patch("app.domains.mapping.service.httpx.AsyncClient") as mock_cls:
-            mock_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+        with patch("app.domains.mapping.service.get_http_pool", return_value=mock_client):
             result = await svc.fetch_elevation(0.0, 0.0)
 
         assert result.elevation == 0.0
@@ -143,7 +139,7 @@ class TestInfrastructureServiceDirect:
     """Test InfrastructureService methods directly with a db session."""
 
     @pytest.mark.asyncio(mode="auto")
-    async def test_list_poles_with_items(self, db_session):
+    async def test_page_poles_with_items(self, db_session):
         from app.domains.infrastructure.service import InfrastructureService
         from app.domains.infrastructure.schemas import PoleCreate
 
@@ -151,9 +147,9 @@ class TestInfrastructureServiceDirect:
         payload = PoleCreate(code="P-SVC-01", pole_type="concreto")
         await svc.create_pole(payload)
 
-        poles = await svc.list_poles()
-        assert len(poles) == 1
-        assert poles[0].code == "P-SVC-01"
+        poles, next_cursor = await svc.page_poles(fields="code")
+        assert next_cursor is None
+        assert [pole["code"] for pole in poles] == ["P-SVC-01"]
 
     @pytest.mark.asyncio(mode="auto")
     async def test_get_pole_returns_none_for_missing(self, db_session):
@@ -214,7 +210,7 @@ class TestInfrastructureServiceDirect:
         assert await svc.get_pole(created.id) is None
 
     @pytest.mark.asyncio(mode="auto")
-    async def test_list_conductors_with_items(self, db_session):
+    async def test_page_conductors_with_items(self, db_session):
         from app.domains.infrastructure.service import InfrastructureService
         from app.domains.infrastructure.schemas import ConductorCreate
 
@@ -222,9 +218,9 @@ class TestInfrastructureServiceDirect:
         await svc.create_conductor(
             ConductorCreate(conductor_type="CA", cross_section=50.0, voltage_level="BT", phases=3)
         )
-        conductors = await svc.list_conductors()
-        assert len(conductors) == 1
-        assert conductors[0].conductor_type == "CA"
+        conductors, next_cursor = await svc.page_conductors()
+        assert next_cursor is None
+        assert [conductor["conductor_type"] for conductor in conductors] == ["CA"]
 
     @pytest.mark.asyncio(mode="auto")
     async def test_get_conductor_returns_none_for_missing(self, db_session):
@@ -92,9 +92,22 @@ export interface MechanicalStressResponse {
 
 // ── API calls ────────────────────────────────────────────────────────────────
 
+// Listings are paginated by id; follow X-Next-Cursor until the last page
+async function listAllPages<T>(url: string, params: Record<string, unknown>): Promise<T[]> {
+  const items: T[] = []
+  let afterId: string | undefined
+  do {
+    const r = await apiClient.get<T[]>(url, { params: { ...params, after_id: afterId } })
+    items.push(...r.data)
+    afterId = r.headers['x-next-cursor']
+  } while (afterId)
+  return items
+}
+
 export const polesApi = {
-  list: (projectId?: number) =>
-    apiClient.get<Pole[]>('/infrastructure/poles', { params: { project_id: projectId } }).then(r => r.data),
+  // bbox: "west,south,east,north" — only poles inside the map viewport
+  list: (projectId?: number, bbox?: string) =>
+    listAllPages<Pole>('/infrastructure/poles', { project_id: projectId, bbox }),
   create: (data: Omit<Pole, 'id'>) =>
     apiClient.post<Pole>('/infrastructure/poles', data).then(r => r.data),
   update: (id: number, data: Partial<Pole>) =>
@@ -105,7 +118,7 @@ export const polesApi = {
 
 export const conductorsApi = {
   list: (projectId?: number) =>
-    apiClient.get<Conductor[]>('/infrastructure/conductors', { params: { project_id: projectId } }).then(r => r.data),
+    listAllPages<Conductor>('/infrastructure/conductors', { project_id: projectId }),
   create: (data: Omit<Conductor, 'id'>) =>
     apiClient.post<Conductor>('/infrastructure/conductors', data).then(r => r.data),
   update: (id: number, data: Partial<Conductor>) =>